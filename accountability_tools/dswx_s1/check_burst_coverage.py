@@ -1,9 +1,13 @@
+import argparse
+import heapq
 import json
 import requests
 import backoff
 import logging
 import re
 import sqlite3
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 from datetime import datetime, timedelta
@@ -29,6 +33,16 @@ MGRS_TILE_DB = 'MGRS_tile_collection_v0.3.sqlite'
 
 COVERAGE_THRESHOLD = 4
 
+# Window around a tile set's acquisition time in which covering RTCs are counted
+COVERAGE_WINDOW = timedelta(hours=1)
+
+# Cap on concurrent CMR requests. CMR starts throttling (429) well before the default
+# ThreadPoolExecutor worker count on larger machines
+CMR_MAX_WORKERS = 8
+
+# Batch mode: merged query windows are split so no single query spans longer than this
+BATCH_MAX_WINDOW = timedelta(hours=6)
+
 QUERY = """
     SELECT bursts
     FROM mgrs_burst_db
@@ -56,9 +70,11 @@ def _backoff_logger(details):
                       giveup=_fatal_code,
                       on_backoff=_backoff_logger,
                       interval=15)
-def _do_cmr_query(url, params):
-    logger.debug(f'Querying {url} with params {params}')
-    response = requests.get(url, params=params)
+def _do_cmr_query(url, params, headers=None):
+    if headers is None:
+        headers = {}
+    logger.debug(f'Querying {url} with params {params} and headers {headers}')
+    response = requests.get(url, params=params, headers=headers)
     response.raise_for_status()
     response_json = response.json()
 
@@ -67,7 +83,7 @@ def _do_cmr_query(url, params):
     if len(response_items) > 0:
         logger.debug(f'Most recent granule retrieved: {response_items[-1]["umm"]["GranuleUR"]}')
 
-    return [i['umm']['GranuleUR'] for i in response_items]
+    return [i['umm']['GranuleUR'] for i in response_items], response.headers.get('CMR-Search-After', None)
 
 
 def _db_init(thread_local):
@@ -75,6 +91,29 @@ def _db_init(thread_local):
     logger.debug(f'Connected to DB @ {MGRS_TILE_DB}')
 
 
+def _tile_set_burst_ids(tile_set_id, conn):
+    cursor = conn.cursor()
+    cursor.execute(QUERY, (tile_set_id,))
+
+    row = cursor.fetchone()
+
+    logger.debug(f'Result for DB query for {tile_set_id}: {row}')
+
+    burst_ids = json.loads(row[0].replace("'", '"'))
+    return [bid.replace('_', '-').upper() for bid in burst_ids]
+
+
+def _coverage_window(native_id):
+    match = RTC_PATTERN.fullmatch(native_id)
+
+    if not match:
+        raise ValueError(f'Invalid native ID: {native_id}')
+
+    acquisition_ts = match.group('acquisition_ts')
+    acquisition_dt = datetime.strptime(acquisition_ts, '%Y%m%dT%H%M%SZ')
+    return acquisition_dt - COVERAGE_WINDOW, acquisition_dt + COVERAGE_WINDOW
+
+
 def _query_for_rtcs_from_native_id(native_id, burst_ids):
     # 1. Build list of native IDs
     # 2. Build temporal range
@@ -92,20 +131,12 @@ def _query_for_rtcs_from_native_id(native_id, burst_ids):
 
     params['native-id'] = native_id_list
 
-    match = RTC_PATTERN.fullmatch(native_id)
-
-    if not match:
-        raise ValueError(f'Invalid native ID: {native_id}')
-
-    acquisition_ts = match.group('acquisition_ts')
-    acquisition_dt = datetime.strptime(acquisition_ts, '%Y%m%dT%H%M%SZ')
-    temporal_start_dt = acquisition_dt - timedelta(hours=1)
-    temporal_end_dt = acquisition_dt + timedelta(hours=1)
+    temporal_start_dt, temporal_end_dt = _coverage_window(native_id)
     temporal_start = temporal_start_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
     temporal_end = temporal_end_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
     params['temporal[]'] = f'{temporal_start},{temporal_end}'
 
-    matching_rtcs = _do_cmr_query(CMR_URL, params)
+    matching_rtcs, _ = _do_cmr_query(CMR_URL, params)
 
     logger.info(f'Found {len(matching_rtcs)} matching RTCs in CMR, deduping...')
 
@@ -132,15 +163,7 @@ def _tile_set_has_sufficient_coverage(tile_set_id_cyc_sensor, identified_rtcs, t
     tile_set_id = tile_set_id_cyc_sensor.split('$')[0]
 
     conn: sqlite3.Connection = thread_local.conn
-    cursor = conn.cursor()
-    cursor.execute(QUERY, (tile_set_id,))
-
-    row = cursor.fetchone()
-
-    logger.debug(f'Result for DB query for {tile_set_id}: {row}')
-
-    burst_ids = json.loads(row[0].replace("'", '"'))
-    burst_ids = [bid.replace('_', '-').upper() for bid in burst_ids]
+    burst_ids = _tile_set_burst_ids(tile_set_id, conn)
 
     if len(identified_rtcs) >= COVERAGE_THRESHOLD:
         logger.info(f'Tile set {tile_set_id_cyc_sensor} already has sufficient coverage from missing RTCs')
@@ -153,42 +176,199 @@ def _tile_set_has_sufficient_coverage(tile_set_id_cyc_sensor, identified_rtcs, t
     return coverage >= COVERAGE_THRESHOLD, tile_set_id_cyc_sensor, coverage, len(burst_ids)
 
 
+def _merge_windows(windows):
+    """Merges overlapping (start, end) windows, capping each merged window at BATCH_MAX_WINDOW"""
+    merged = []
+
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1] and end - merged[-1][0] <= BATCH_MAX_WINDOW:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    return [(start, end) for start, end in merged]
+
+
+def _query_for_rtcs_in_window(start, end):
+    params = {
+        'collection_concept_id': CCID_RTC,
+        'page_size': 2000,
+        'temporal[]': f'{start.strftime("%Y-%m-%dT%H:%M:%SZ")},{end.strftime("%Y-%m-%dT%H:%M:%SZ")}'
+    }
+
+    rtcs, search_after = _do_cmr_query(CMR_URL, params)
+
+    while search_after is not None:
+        page, search_after = _do_cmr_query(CMR_URL, params, headers={'CMR-Search-After': search_after})
+        rtcs.extend(page)
+
+    return rtcs
+
+
+def _index_rtcs(rtc_index, rtc_ids, burst_filter):
+    """Adds unique (acquisition time, sensor) pairs of the given RTCs to rtc_index, keyed by burst ID"""
+    for rtc_id in rtc_ids:
+        match = RTC_PATTERN.fullmatch(rtc_id)
+
+        if not match:
+            raise ValueError(f'Invalid RTC ID: {rtc_id}')
+
+        burst_id = match.group('burst_id')
+
+        if burst_id not in burst_filter:
+            continue
+
+        acquisition_dt = datetime.strptime(match.group('acquisition_ts'), '%Y%m%dT%H%M%SZ')
+        rtc_index[burst_id].add((acquisition_dt, match.group('sensor')))
+
+
+def _indexed_coverage(rtc_index, burst_ids, start, end):
+    coverage = 0
+
+    for burst_id in set(burst_ids):
+        acquisitions = rtc_index.get(burst_id)
+
+        if acquisitions:
+            coverage += bisect_right(acquisitions, end) - bisect_left(acquisitions, start)
+
+    return coverage
+
+
+def _check_coverage_batched(missing, workers):
+    """Checks coverage of all tile set buckets with a few large temporal CMR queries instead of one per bucket.
+
+    Buckets' coverage windows are merged where they overlap, all RTCs in each merged window are fetched, and coverage
+    is counted locally from an index of burst ID -> sorted acquisition times.
+    """
+    conn = sqlite3.connect(MGRS_TILE_DB)
+    tile_set_bursts = {}
+
+    results = []
+    pending = []
+
+    for tile_set_id_cyc_sensor, identified_rtcs in missing.items():
+        tile_set_id = tile_set_id_cyc_sensor.split('$')[0]
+
+        if tile_set_id not in tile_set_bursts:
+            tile_set_bursts[tile_set_id] = _tile_set_burst_ids(tile_set_id, conn)
+
+        burst_ids = tile_set_bursts[tile_set_id]
+
+        if len(identified_rtcs) >= COVERAGE_THRESHOLD:
+            results.append((True, tile_set_id_cyc_sensor, len(identified_rtcs), len(burst_ids)))
+        else:
+            pending.append((tile_set_id_cyc_sensor, burst_ids, _coverage_window(identified_rtcs[0])))
+
+    conn.close()
+
+    logger.info(f'{len(results):,} tile sets have sufficient coverage from missing RTCs, '
+                f'{len(pending):,} need to be checked against CMR')
+
+    burst_filter = {burst_id for _, burst_ids, _ in pending for burst_id in burst_ids}
+    windows = _merge_windows([window for _, _, window in pending])
+
+    logger.info(f'Querying CMR for {len(pending):,} tile sets in {len(windows):,} merged temporal windows')
+
+    rtc_index = defaultdict(set)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_query_for_rtcs_in_window, start, end) for start, end in windows]
+
+        for future in tqdm(as_completed(futures), total=len(futures), leave=False):
+            _index_rtcs(rtc_index, future.result(), burst_filter)
+
+    rtc_index = {burst_id: sorted(dt for dt, _ in acquisitions) for burst_id, acquisitions in rtc_index.items()}
+
+    for tile_set_id_cyc_sensor, burst_ids, (start, end) in pending:
+        coverage = _indexed_coverage(rtc_index, burst_ids, start, end)
+        results.append((coverage >= COVERAGE_THRESHOLD, tile_set_id_cyc_sensor, coverage, len(burst_ids)))
+
+    return results
+
+
+def _check_coverage(missing, workers):
+    thread_local = threading.local()
+    results = []
+
+    with ThreadPoolExecutor(max_workers=workers, initializer=_db_init, initargs=(thread_local,)) as executor:
+        futures = []
+
+        with tqdm(total=len(missing), leave=False) as pbar:
+            for k, v in missing.items():
+                futures.append(executor.submit(_tile_set_has_sufficient_coverage, k, v, thread_local))
+
+            for future in as_completed(futures):
+                results.append(future.result())
+                pbar.update()
+
+    return results
+
+
 def _reduce_to_common(tile_set_mapping):
-    rtc_mapping = {}
-    reduced_mapping = {}
+    """Greedy set cover of the given tile sets by their RTCs.
+
+    Repeatedly takes the RTC mapped to the most not-yet-covered tile sets (ties go to the RTC seen first) until every
+    tile set is covered. Candidates are kept in a max-heap with lazy invalidation: counts only ever decrease, so a
+    popped entry with an outdated count is pushed back with its current count instead of re-sorting everything.
+
+    RTC lists are expected to be unique per tile set, as produced by add_cycle_indices.py.
+    """
+    tile_set_ids = []
+    rtc_ids = []
+    rtc_to_idx = {}
+
+    # RTC index -> tile set indices containing that RTC, and the inverse
+    rtc_tile_sets = []
+    tile_set_rtcs = []
 
-    # Map RTCs to tile sets containing those RTCs
     for tile_set in tile_set_mapping:
+        tile_set_idx = len(tile_set_ids)
+        tile_set_ids.append(tile_set)
+        tile_set_rtcs.append([])
+
         for rtc in tile_set_mapping[tile_set]:
-            if rtc not in rtc_mapping:
-                rtc_mapping[rtc] = []
-            rtc_mapping[rtc].append(tile_set)
-
-    # Loop until all RTC mappings have been reduced
-    while len(rtc_mapping) > 0:
-        # Take the RTC mapped to the most tile sets from the initial mapping and add it to the reduced mapping
-        top_key = sorted(rtc_mapping.items(), key=lambda x: len(x[1]), reverse=True)[0][0]
-        top_tile_sets = rtc_mapping.pop(top_key)
-        reduced_mapping[top_key] = top_tile_sets
-
-        # For all remaining RTC mappings, remove all tile sets that were matched above,
-        # deleting the mapping if none remain
-        for rtc in list(rtc_mapping.keys()):
-            for tile_set in top_tile_sets:
-                try:
-                    rtc_mapping[rtc].remove(tile_set)
-                except ValueError:
-                    ...
-
-            if len(rtc_mapping[rtc]) == 0:
-                del rtc_mapping[rtc]
+            if rtc not in rtc_to_idx:
+                rtc_to_idx[rtc] = len(rtc_ids)
+                rtc_ids.append(rtc)
+                rtc_tile_sets.append([])
 
-    return reduced_mapping
+            rtc_idx = rtc_to_idx[rtc]
+            rtc_tile_sets[rtc_idx].append(tile_set_idx)
+            tile_set_rtcs[tile_set_idx].append(rtc_idx)
 
+    # Number of uncovered tile sets per RTC, and a flag per tile set for whether it's been covered
+    counts = [len(tile_sets) for tile_sets in rtc_tile_sets]
+    covered = bytearray(len(tile_set_ids))
 
-def main():
-    thread_local = threading.local()
+    heap = [(-count, rtc_idx) for rtc_idx, count in enumerate(counts)]
+    heapq.heapify(heap)
+
+    reduced_mapping = {}
+
+    while heap:
+        neg_count, rtc_idx = heapq.heappop(heap)
+        count = counts[rtc_idx]
+
+        if count == 0:
+            continue
+
+        if -neg_count != count:
+            heapq.heappush(heap, (-count, rtc_idx))
+            continue
 
+        top_tile_sets = [tile_set_idx for tile_set_idx in rtc_tile_sets[rtc_idx] if not covered[tile_set_idx]]
+        reduced_mapping[rtc_ids[rtc_idx]] = [tile_set_ids[tile_set_idx] for tile_set_idx in top_tile_sets]
+
+        for tile_set_idx in top_tile_sets:
+            covered[tile_set_idx] = 1
+
+            for other_rtc_idx in tile_set_rtcs[tile_set_idx]:
+                counts[other_rtc_idx] -= 1
+
+    return reduced_mapping
+
+
+def main(args):
     with open('missing_mgrs_set_cycle_indices.json') as fp:
         missing = json.load(fp)
 
@@ -197,21 +377,16 @@ def main():
     dropped = []
     valid = []
 
-    with ThreadPoolExecutor(initializer=_db_init, initargs=(thread_local,)) as executor:
-        futures = []
-
-        with tqdm(total=len(missing), leave=False) as pbar:
-            for k, v in missing.items():
-                futures.append(executor.submit(_tile_set_has_sufficient_coverage, k, v, thread_local))
+    if args.batch:
+        results = _check_coverage_batched(missing, args.workers)
+    else:
+        results = _check_coverage(missing, args.workers)
 
-            for future in as_completed(futures):
-                is_valid, tile_set_id, coverage, expected_burst_ids = future.result()
-
-                if is_valid:
-                    valid.append((tile_set_id, coverage, expected_burst_ids))
-                else:
-                    dropped.append((tile_set_id, coverage, expected_burst_ids))
-                pbar.update()
+    for is_valid, tile_set_id, coverage, expected_burst_ids in results:
+        if is_valid:
+            valid.append((tile_set_id, coverage, expected_burst_ids))
+        else:
+            dropped.append((tile_set_id, coverage, expected_burst_ids))
 
     logger.info(f'Dropped {len(dropped):,} missing mgrs set cycles ({len(valid):,} valid sets remaining)')
 
@@ -257,5 +432,20 @@ def main():
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Check coverage with a few large temporal CMR queries instead of one query per tile set'
+    )
+
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=CMR_MAX_WORKERS,
+        help=f'Maximum number of concurrent CMR queries (default: {CMR_MAX_WORKERS})'
+    )
+
     with logging_redirect_tqdm():
-        main()
+        main(parser.parse_args())
@@ -152,6 +152,14 @@ def get_parser():
         help='Include 1-to-1 HLS to OPERA mappings in the report'
     )
 
+    parser.add_argument(
+        '--engine',
+        choices=['single-pass', 'legacy'],
+        default='single-pass',
+        help='single-pass: running counters and creation times parsed once while mapping; legacy: original '
+             'implementation that regroups and sorts the full map'
+    )
+
     parser.add_argument(
         '--plot-days',
         action='store_true',
@@ -212,6 +220,7 @@ def _plot_and_save_counts(counts, directory, filename, title):
     ], fontsize=12)
 
     plt.savefig(join(directory, filename))
+    plt.close(fig)
     logger.info(f'Wrote plot {filename}')
 
 
@@ -245,35 +254,49 @@ def plot_and_save(date_counts, directory, skip_agg=False):
         _plot_and_save_counts(date_counts, directory, filename, title)
 
 
-def main(args):
-    start = datetime.now()
+COUNT_KEYS = ('hls_granules', 'matched_dswx_hls_granules', 'hls_to_many_dswx', 'hls_to_no_dswx')
 
-    logger.info('Listing DSWx-HLS granules over configured time range')
-    dswx_granules = query_cmr(
-        CMR_URL,
-        CCID,
-        args.start_date,
-        args.end_date,
-        lambda x: [
-            (
-                i['umm']['GranuleUR'],
-                _format_facet_date(datetime.strptime(i['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime'],
-                                   CMR_TIME_FMT)),
-                i['umm']['InputGranules']
-            ) for i in x
-        ]  # list[cmr] -> list[(gUR, cmr temporal time, inputs)]
-    )
 
-    logger.info(f'Found {len(dswx_granules):,} granules')
+def map_inputs_single_pass(dswx_granules, hls_granules, full_report=False):
+    """Same results as map_inputs_legacy, computed while mapping.
 
+    Per-date counts are running counters updated as each HLS input and DSWx-HLS product is added, and month counts are
+    rolled up from them, with no regrouped copy of the map. Input file names are matched once per distinct HLS granule
+    rather than once per band file, and each product's creation time is parsed once when it is mapped. Only the rare
+    HLS inputs with more than one product are ordered by it to pick the latest; single-product inputs, nearly all of
+    them, need no ordering at all.
+    """
+    # (HLS granule, date) -> [(creation_ts, DSWx-HLS granule), ...]
     hls_to_dswx = {}
+    date_counts = {}
+
+    def _add_input(key):
+        products = hls_to_dswx.get(key)
+
+        if products is None:
+            products = hls_to_dswx[key] = []
+            counts = date_counts.get(key[1])
+            if counts is None:
+                counts = date_counts[key[1]] = dict.fromkeys(COUNT_KEYS, 0)
+            counts['hls_granules'] += 1
+            counts['hls_to_no_dswx'] += 1
+
+        return products
 
     for granule, date, inputs in dswx_granules:
         filtered_inputs = set()
+        matches = {}
 
         for i in inputs:
-            stripped = re.sub(HLS_SUFFIX, '', basename(i))
-            if HLS_PATTERN.match(stripped) is not None:
+            # Slicing after the last '/' is what posixpath.basename does
+            stripped = HLS_SUFFIX.sub('', i[i.rfind('/') + 1:])
+
+            # Inputs are ~10 band files of the same HLS granule, so each distinct name is only matched once
+            matched = matches.get(stripped)
+            if matched is None:
+                matched = matches[stripped] = HLS_PATTERN.match(stripped) is not None
+
+            if matched:
                 filtered_inputs.add((stripped, date))
 
         filtered_inputs = list(filtered_inputs)
@@ -283,58 +306,91 @@ def main(args):
         elif len(filtered_inputs) > 1:
             logger.warning(f'Found {len(filtered_inputs)} inputs for granule {granule}: {filtered_inputs}')
 
+        creation_ts = DSWX_PATTERN.match(granule).group('creation_ts')
+
         for i in filtered_inputs:
-            hls_to_dswx.setdefault(i, []).append(granule)
+            products = _add_input(i)
+            products.append((creation_ts, granule))
+
+            counts = date_counts[i[1]]
+            counts['matched_dswx_hls_granules'] += 1
+            if len(products) == 1:
+                counts['hls_to_no_dswx'] -= 1
+            elif len(products) == 2:
+                counts['hls_to_many_dswx'] += 1
 
     n_dswx_hls_inputs = len(hls_to_dswx)
 
     logger.info(f'Mapped OPERA DSWx-HLS products to {n_dswx_hls_inputs:,} HLS inputs')
 
-    logger.info(f'Listing HLS-S granules over configured time range')
-    hls_s_granules = query_cmr(
-        CMR_URL,
-        CCID_HLSS,
-        args.start_date,
-        args.end_date,
-        lambda x: [
-            (
-                i['umm']['GranuleUR'],
-                _format_facet_date(datetime.strptime(i['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime'],
-                                   CMR_TIME_FMT)),
-            ) for i in x
-        ]
-    )
-    logger.info(f'Found {len(hls_s_granules):,} HLS-S granules')
+    for i in hls_granules:
+        _add_input(i)
 
-    logger.info(f'Listing HLS-L granules over configured time range')
-    hls_l_granules = query_cmr(
-        CMR_URL,
-        CCID_HLSL,
-        args.start_date,
-        args.end_date,
-        lambda x: [
-            (
-                i['umm']['GranuleUR'],
-                datetime.strptime(i['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime'], CMR_TIME_FMT),
-                [p['ShortName'] for p in i['umm']['Platforms']]
-            ) for i in x
-        ]
-    )
-    n_hls_l_inputs = len(hls_l_granules)
-    logger.info(f'Found {n_hls_l_inputs:,} HLS-L granules')
+    logger.info(f'Found {len(hls_to_dswx) - n_dswx_hls_inputs:,} HLS granules not mapped to an OPERA DSWx-HLS product')
 
-    # Filter out HLS granules from Landsat-9 acquired before OPERA began producing DSWx-HLS with L9 data
+    month_counts = {}
 
-    hls_l_granules = [
-        (g[0], _format_facet_date(g[1]))
-        for g in hls_l_granules
-        if ('LANDSAT-9' not in g[2] or g[1] >= L9_EARLIEST_DSWX_ACQUISITION_DATE)
-    ]
+    for date, counts in date_counts.items():
+        month = datetime.strptime(date.split('/')[0].strip(), '%Y-%m-%d').replace(day=1).strftime('%Y-%m')
+        month_total = month_counts.get(month)
+        if month_total is None:
+            month_total = month_counts[month] = dict.fromkeys(COUNT_KEYS, 0)
+        for k in COUNT_KEYS:
+            month_total[k] += counts[k]
 
-    logger.info(f'Filtered HLS-L granules from {n_hls_l_inputs:,} to {len(hls_l_granules):,} for a combined '
-                f'{len(hls_s_granules) + len(hls_l_granules):,} HLS granules')
+    overall_counts = {k: sum([v[k] for v in date_counts.values()]) for k in COUNT_KEYS}
+
+    # An HLS granule listed under more than one date is reported with the products of the last one, as before
+    latest_by_hls = {}
+    for (hls_granule, date), products in hls_to_dswx.items():
+        latest_by_hls[hls_granule] = products
+
+    missing_dswx = []
+    duplicates = []
+
+    for hls_granule, products in latest_by_hls.items():
+        if len(products) == 0:
+            missing_dswx.append(hls_granule)
+        elif len(products) > 1:
+            products.sort(key=lambda p: p[0], reverse=True)
+            duplicates.extend(p[1] for p in products[1:])
 
-    for hls_granule, date in hls_s_granules + hls_l_granules:
+    date_map = {date: {} for date in date_counts}
+
+    for (hls_granule, date), products in hls_to_dswx.items():
+        if full_report or len(products) != 1:
+            date_map[date][hls_granule] = [p[1] for p in products]
+
+    return date_counts, month_counts, overall_counts, missing_dswx, duplicates, date_map
+
+
+def map_inputs_legacy(dswx_granules, hls_granules, full_report=False):
+    """Original implementation: builds the full HLS to DSWx-HLS map, regroups it by date and sorts every product list"""
+    hls_to_dswx = {}
+
+    for granule, date, inputs in dswx_granules:
+        filtered_inputs = set()
+
+        for i in inputs:
+            stripped = re.sub(HLS_SUFFIX, '', basename(i))
+            if HLS_PATTERN.match(stripped) is not None:
+                filtered_inputs.add((stripped, date))
+
+        filtered_inputs = list(filtered_inputs)
+
+        if len(filtered_inputs) == 0:
+            raise ValueError(f'Could not get inputs for granule {granule}')
+        elif len(filtered_inputs) > 1:
+            logger.warning(f'Found {len(filtered_inputs)} inputs for granule {granule}: {filtered_inputs}')
+
+        for i in filtered_inputs:
+            hls_to_dswx.setdefault(i, []).append(granule)
+
+    n_dswx_hls_inputs = len(hls_to_dswx)
+
+    logger.info(f'Mapped OPERA DSWx-HLS products to {n_dswx_hls_inputs:,} HLS inputs')
+
+    for hls_granule, date in hls_granules:
         if (hls_granule, date) not in hls_to_dswx:
             hls_to_dswx[(hls_granule, date)] = []
 
@@ -389,10 +445,87 @@ def main(args):
         product_list.sort(key=lambda x: DSWX_PATTERN.match(x).groupdict()['creation_ts'], reverse=True)
         duplicates.extend(product_list[1:])
 
-    if not args.full_report:
+    if not full_report:
         for date in date_map:
             date_map[date] = {k: v for k, v in date_map[date].items() if len(v) != 1}
 
+    return date_counts, month_counts, overall_counts, missing_dswx, duplicates, date_map
+
+
+def main(args):
+    start = datetime.now()
+
+    logger.info('Listing DSWx-HLS granules over configured time range')
+    dswx_granules = query_cmr(
+        CMR_URL,
+        CCID,
+        args.start_date,
+        args.end_date,
+        lambda x: [
+            (
+                i['umm']['GranuleUR'],
+                _format_facet_date(datetime.strptime(i['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime'],
+                                   CMR_TIME_FMT)),
+                i['umm']['InputGranules']
+            ) for i in x
+        ]  # list[cmr] -> list[(gUR, cmr temporal time, inputs)]
+    )
+
+    logger.info(f'Found {len(dswx_granules):,} granules')
+
+    logger.info(f'Listing HLS-S granules over configured time range')
+    hls_s_granules = query_cmr(
+        CMR_URL,
+        CCID_HLSS,
+        args.start_date,
+        args.end_date,
+        lambda x: [
+            (
+                i['umm']['GranuleUR'],
+                _format_facet_date(datetime.strptime(i['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime'],
+                                   CMR_TIME_FMT)),
+            ) for i in x
+        ]
+    )
+    logger.info(f'Found {len(hls_s_granules):,} HLS-S granules')
+
+    logger.info(f'Listing HLS-L granules over configured time range')
+    hls_l_granules = query_cmr(
+        CMR_URL,
+        CCID_HLSL,
+        args.start_date,
+        args.end_date,
+        lambda x: [
+            (
+                i['umm']['GranuleUR'],
+                datetime.strptime(i['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime'], CMR_TIME_FMT),
+                [p['ShortName'] for p in i['umm']['Platforms']]
+            ) for i in x
+        ]
+    )
+    n_hls_l_inputs = len(hls_l_granules)
+    logger.info(f'Found {n_hls_l_inputs:,} HLS-L granules')
+
+    # Filter out HLS granules from Landsat-9 acquired before OPERA began producing DSWx-HLS with L9 data
+
+    hls_l_granules = [
+        (g[0], _format_facet_date(g[1]))
+        for g in hls_l_granules
+        if ('LANDSAT-9' not in g[2] or g[1] >= L9_EARLIEST_DSWX_ACQUISITION_DATE)
+    ]
+
+    logger.info(f'Filtered HLS-L granules from {n_hls_l_inputs:,} to {len(hls_l_granules):,} for a combined '
+                f'{len(hls_s_granules) + len(hls_l_granules):,} HLS granules')
+
+    hls_granules = hls_s_granules + hls_l_granules
+
+    if args.engine == 'legacy':
+        mapped = map_inputs_legacy(dswx_granules, hls_granules, args.full_report)
+    else:
+        mapped = map_inputs_single_pass(dswx_granules, hls_granules, args.full_report)
+
+    date_counts, month_counts, overall_counts, missing_dswx, duplicates, date_map = mapped
+
     report = {
         'summary': {
             'query_start_date': args.start_date.strftime(REPORT_TIME_FMT),
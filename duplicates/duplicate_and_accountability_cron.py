@@ -4,17 +4,20 @@ import logging
 import os.path
 import subprocess
 import sys
-import warnings
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from math import ceil
+from itertools import chain
 from pathlib import Path
-from tempfile import TemporaryDirectory
 from urllib.parse import urlparse
 
 import boto3
-import matplotlib.pyplot as plt
-import numpy as np
-import requests
+
+import duplicate_check
+import plot_data_store
+import plot_rendering
+from opensearch_bulk import bulk_index, opensearch_session
+from s3_uploads import UPLOAD_WORKERS, S3UploadManager
 
 logging.basicConfig(
     level=logging.INFO,
@@ -142,6 +145,18 @@ def get_parser():
         help='Opensearch index name to send accountability data to'
     )
 
+    parser.add_argument(
+        '--duplicate-date-index',
+        default=None,
+        help='Optional Opensearch index name to send per acquisition date duplicate counts to'
+    )
+
+    parser.add_argument(
+        '--duplicate-granule-index',
+        default=None,
+        help='Optional Opensearch index name to send one doc per duplicate granule to'
+    )
+
     parser.add_argument(
         '--duplicate-plot-length',
         default=10,
@@ -150,16 +165,43 @@ def get_parser():
         help='The maximum number of dates in the duplicate plots produced'
     )
 
-    return parser
+    parser.add_argument(
+        '--plot-workers',
+        default=plot_rendering.PLOT_WORKERS,
+        type=_pos_int,
+        help='The number of processes to render plots with'
+    )
 
+    parser.add_argument(
+        '--upload-workers',
+        default=UPLOAD_WORKERS,
+        type=_pos_int,
+        help='The number of concurrent S3 uploads'
+    )
 
-def plot_data_and_save(data, plot_dir, s3_dir):
-    plot_dir.mkdir(exist_ok=True, parents=True)
+    return parser
 
+
+def _upload_charts(jobs, rendered, s3_dir, uploads):
     s3_url = urlparse(s3_dir)
     s3_bucket = s3_url.netloc
     s3_path = Path(s3_url.path.lstrip('/'))
 
+    for job, was_rendered in zip(jobs, rendered):
+        plot_path = Path(job['path'])
+        s3_key = str(s3_path / plot_path.name).lstrip('/')
+
+        if was_rendered:
+            logger.info(f'Wrote duplicate product counts plot to {str(plot_path)}')
+        else:
+            logger.info(f'Duplicate product counts plot {str(plot_path)} is unchanged, skipped rendering')
+
+        uploads.upload_file(plot_path, s3_bucket, s3_key, f'total products plot {plot_path.name}')
+
+
+def plot_data_and_save(data, plot_dir, s3_dir, uploads, workers=plot_rendering.PLOT_WORKERS):
+    plot_dir.mkdir(exist_ok=True, parents=True)
+
     start_date = datetime.strptime(data['start_date'], '%Y-%m-%dT%H:%M:%SZ').replace(hour=0, minute=0,
                                                                                      second=0, microsecond=0)
     end_date = datetime.strptime(data['end_date'], '%Y-%m-%dT%H:%M:%SZ')
@@ -179,152 +221,77 @@ def plot_data_and_save(data, plot_dir, s3_dir):
         date += timedelta(days=1)
 
     report_acquisition_dates = set(report_acquisition_dates)
-    product_set = list(data['date_maps'].keys())
-
-    for product in product_set:
-        product_dates = set(data['date_maps'][product].keys())
-        days = list(product_dates | report_acquisition_dates)
-        days.sort()
-
-        x = np.arange(len(days))
-
-        product_data = {
-            'total_products': tuple([data['date_maps'][product].get(date, {}).get('products', 0) for date in days]),
-            'duplicate_products': tuple(
-                [data['date_maps'][product].get(date, {}).get('duplicates', 0) for date in days]
-            ),
-            'duplicate_percent': tuple(
-                [data['date_maps'][product].get(date, {}).get('percent_duplicates', 0) for date in days]
-            )
-        }
-
-        width = 1 / 3
-        multiplier = 0
-
-        fig, ax = plt.subplots(layout='constrained', figsize=(5 + 1 * len(days), 8))
-
-        for measure, color in zip(['total_products', 'duplicate_products'],
-                                  ['tab:blue', 'tab:orange']):
-            count = product_data[measure]
-            offset = width * multiplier
-            rects = ax.bar(x + offset, count, width, label=measure, color=color)
+    frame = plot_rendering.daily_counts_frame(data['date_maps'])
 
-            if measure == 'total_products':
-                ax.bar_label(rects, padding=3, fmt='{:,.0f}', fontsize=12, rotation=90)
-            else:
-                labels = [f'{c:,}\n({perc:0.2f}%)' for c, perc in zip(count, product_data['duplicate_percent'])]
-                ax.bar_label(rects, labels, padding=3, fontsize=12, rotation=90)
+    jobs = []
 
-            multiplier += 1
-
-        ax.set_xlabel('Acquisition date (at 00:00:00Z)', fontsize=12)
-        ax.set_ylabel('Granule Count', fontsize=12)
-
-        ax.set_xticks(x + (width / 2), days, rotation=90)
-        with warnings.catch_warnings():
-            warnings.simplefilter('ignore', category=UserWarning)
-            ax.set_yticklabels([f'{label:,.0f}' for label in ax.get_yticks()])
-
-        ax.set_title(f'Product counts for {product} from {days[0]} to {days[-1]}', fontsize=14)
-
-        ymax = max(product_data['total_products'])
-        if ymax > 0:
-            ymax = ceil(ymax * 1.2)
-        else:
-            ymax = 1
-
-        ax.set_ylim(bottom=0, top=ymax)
-
-        ax.legend(['Total Product Count', 'Duplicate Product Count'], fontsize=12)
-
-        plot_path = plot_dir / f'{product}_counts.png'
-        s3_key = str(s3_path / f'{product}_counts.png').lstrip('/')
-
-        plt.savefig(plot_path)
-        logger.info(f'Wrote duplicate product counts plot to {str(plot_path)}')
+    for product in data['date_maps']:
+        days = sorted(set(data['date_maps'][product].keys()) | report_acquisition_dates)
+        jobs.append(plot_rendering.chart_job(
+            frame, product, days, plot_dir / f'{product}_counts.png',
+            f'Product counts for {product} from {days[0]} to {days[-1]}'
+        ))
 
-        s3.upload_file(plot_path, s3_bucket, s3_key)
-        logger.info(f'Uploaded total products plot to s3://{s3_bucket}/{s3_key}')
+    _upload_charts(jobs, plot_rendering.render_charts(jobs, workers), s3_dir, uploads)
 
 
-def plot_timeseries_data_and_save(data, plot_dir, s3_dir):
+def plot_timeseries_data_and_save(data, plot_dir, s3_dir, uploads, workers=plot_rendering.PLOT_WORKERS):
     plot_dir.mkdir(exist_ok=True, parents=True)
 
-    s3_url = urlparse(s3_dir)
-    s3_bucket = s3_url.netloc
-    s3_path = Path(s3_url.path.lstrip('/'))
-
-    data.sort(key=lambda x: x['date'])
+    frame = plot_rendering.timeseries_counts_frame(data)
+    days = list(frame.index)
 
-    product_set = []
+    jobs = []
 
-    for record in data:
-        product_set.extend(record['product_counts'].keys())
-
-    product_set = list(set(product_set))
-    product_set.sort()
+    for product in sorted(frame.columns.unique(level='product')):
+        jobs.append(plot_rendering.chart_job(
+            frame, product, days, plot_dir / f'{product}_counts_timeseries.png',
+            f'Product counts timeseries for {product} from {days[0]} to {days[-1]}'
+        ))
 
-    days = [r['date'] for r in data]
+    _upload_charts(jobs, plot_rendering.render_charts(jobs, workers), s3_dir, uploads)
 
-    x = np.arange(len(days))
 
-    for product in product_set:
-        product_data = {
-            'total_products': tuple([r['product_counts'].get(product, {}).get('total_products', 0) for r in data]),
-            'duplicate_products': tuple([r['product_counts'].get(product, {}).get('duplicates', 0) for r in data]),
-            'duplicate_percent': tuple([r['product_counts'].get(product, {}).get('percent_duplicates', 0) for r in data])
+def duplicate_date_docs(product, report, report_date, index):
+    """Yields bulk index actions with the duplicate counts of each acquisition date in a product's report"""
+    for date, counts in report['dates'].items():
+        yield index, f'{report_date}-{product}-{date}', {
+            '@timestamp': report_date,
+            'report_time': report_date,
+            'product': product,
+            'acquisition_date': date,
+            'n_granules': counts['n_granules'],
+            'duplicate_count': counts['n_duplicates'],
+            'percent_duplicates': counts['percent_duplicates'],
         }
 
-        width = 1 / 3
-        multiplier = 0
 
-        fig, ax = plt.subplots(layout='constrained', figsize=(5 + 1 * len(days), 8))
+def duplicate_granule_docs(product, report, report_date, index):
+    """Yields bulk index actions for each duplicate granule in a product's report, keyed by granule ID"""
+    for date, counts in report['dates'].items():
+        for unique_id, group in counts['duplicates'].items():
+            for granule_id in group['duplicate_products']:
+                yield index, granule_id, {
+                    '@timestamp': report_date,
+                    'report_time': report_date,
+                    'product': product,
+                    'acquisition_date': date,
+                    'granule_id': granule_id,
+                    'latest_product': group['latest_product'],
+                    'unique_id': unique_id,
+                }
 
-        for measure, color in zip(['total_products', 'duplicate_products'],
-                                  ['tab:blue', 'tab:orange']):
-            count = product_data[measure]
-            offset = width * multiplier
-            rects = ax.bar(x + offset, count, width, label=measure, color=color)
 
-            if measure == 'total_products':
-                ax.bar_label(rects, padding=3, fmt='{:,.0f}', fontsize=12, rotation=90)
-            else:
-                labels = [f'{c:,}\n({perc:0.2f}%)' for c, perc in zip(count, product_data['duplicate_percent'])]
-                ax.bar_label(rects, labels, padding=3, fontsize=12, rotation=90)
+def _index_docs(args, actions, session, description):
+    n_indexed, errors = bulk_index(args.opensearch, actions, session=session)
 
-            multiplier += 1
+    if len(errors) > 0:
+        raise RuntimeError(f'Failed to index {len(errors):,} of {n_indexed + len(errors):,} {description} docs')
 
-        ax.set_xlabel('Acquisition date (at 00:00:00Z)', fontsize=12)
-        ax.set_ylabel('Granule Count', fontsize=12)
+    logger.info(f'Indexed {n_indexed:,} {description} docs into Opensearch')
 
-        ax.set_xticks(x + (width / 2), days, rotation=90)
-        with warnings.catch_warnings():
-            warnings.simplefilter('ignore', category=UserWarning)
-            ax.set_yticklabels([f'{label:,.0f}' for label in ax.get_yticks()])
 
-        ax.set_title(f'Product counts timeseries for {product} from {days[0]} to {days[-1]}', fontsize=14)
-
-        ymax = max(product_data['total_products'])
-        if ymax > 0:
-            ymax = ceil(ymax * 1.2)  # Scale a bit to fit the labels
-        else:
-            ymax = 1
-
-        ax.set_ylim(bottom=0, top=ymax)
-
-        ax.legend(['Total Product Count', 'Duplicate Product Count'], fontsize=12)
-
-        plot_path = plot_dir / f'{product}_counts_timeseries.png'
-        s3_key = str(s3_path / f'{product}_counts_timeseries.png').lstrip('/')
-
-        plt.savefig(plot_path)
-        logger.info(f'Wrote duplicate product counts plot to {str(plot_path)}')
-
-        s3.upload_file(plot_path, s3_bucket, s3_key)
-        logger.info(f'Uploaded total products plot to s3://{s3_bucket}/{s3_key}')
-
-
-def record_dswx_hls_accountability(args, start_date, end_date):
+def record_dswx_hls_accountability(args, start_date, end_date, uploads, opensearch=None):
     report_path = str(args.report_dir / 'DSWX_HLS_accountability.json')
     report_date = now().strftime('%Y-%m-%d')
 
@@ -371,8 +338,8 @@ def record_dswx_hls_accountability(args, start_date, end_date):
 
             s3_key = str(s3_path / 'DSWX_HLS_accountability.png').lstrip('/')
 
-            s3.upload_file(expected_path, s3_bucket, s3_key)
-            logger.info(f'Uploaded DSWx-HLS accountability plot to s3://{s3_bucket}/{s3_key}')
+            with open(expected_path, 'rb') as f:
+                uploads.upload_bytes(f.read(), s3_bucket, s3_key, 'DSWx-HLS accountability plot')
 
             try:
                 os.unlink(expected_path)
@@ -381,21 +348,16 @@ def record_dswx_hls_accountability(args, start_date, end_date):
         else:
             logger.error(f'Expected plot for DSWX_HLS accountability ({expected_path}) does not exist')
 
-        with TemporaryDirectory() as temp_dir:
-            s3_url = urlparse(args.s3_report_path)
-
-            s3_bucket = s3_url.netloc
-            s3_path = Path(s3_url.path.lstrip('/'))
+        s3_url = urlparse(args.s3_report_path)
 
-            report_filename = f'OPERA_DSWx_HLS_accountability_{days[0]}_to_{days[-1]}.txt'
-            report_path = os.path.join(temp_dir, report_filename)
-            report_key = str(s3_path / 'DSWX_HLS' / f'{report_date}' / report_filename).lstrip('/')
+        s3_bucket = s3_url.netloc
+        s3_path = Path(s3_url.path.lstrip('/'))
 
-            with open(report_path, 'w') as f:
-                for missing in sorted(report_data['hls_missing_dswx']):
-                    f.write(f'{missing}\n')
+        report_filename = f'OPERA_DSWx_HLS_accountability_{days[0]}_to_{days[-1]}.txt'
+        report_key = str(s3_path / 'DSWX_HLS' / f'{report_date}' / report_filename).lstrip('/')
 
-            s3.upload_file(report_path, s3_bucket, report_key)
+        missing_report = ''.join(f'{missing}\n' for missing in sorted(report_data['hls_missing_dswx']))
+        uploads.upload_bytes(missing_report.encode('utf-8'), s3_bucket, report_key, 'DSWx-HLS missing granules report')
 
         duplicate_count = len(report_data['hls_missing_dswx'])
         report_url = f's3://{s3_bucket}/{report_key}'
@@ -412,19 +374,111 @@ def record_dswx_hls_accountability(args, start_date, end_date):
     }
 
     if args.opensearch is not None:
-        resp = requests.post(
-            f'{args.opensearch.rstrip("/")}/{args.accountability_index}/_doc/{report_date}-DSWX_HLS',
-            headers={'Content-Type': 'application/json'},
-            data=json.dumps(es_doc)
+        _index_docs(args, [(args.accountability_index, f'{report_date}-DSWX_HLS', es_doc)], opensearch,
+                    'DSWX_HLS accountability')
+
+
+def _check_product(product, args, session):
+    """Runs the duplicate check for one product in this process and writes its report, returning (report, seconds)"""
+    check_start = time.monotonic()
+
+    report = duplicate_check.check_product(
+        product, args.venue, args.start_date, args.end_date, facet='dates', session=session
+    )
+
+    if report is not None:
+        report_path = args.report_dir / f'{product}.json'
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        logger.info(f'Wrote report for product {product}: {report_path}')
+
+    return report, time.monotonic() - check_start
+
+
+def publish_product_report(product, report, args, s3_paths, start_date, end_date, report_date, uploads,
+                           opensearch=None):
+    """Uploads the duplicates list of one product and bulk indexes its docs, returning its plot data entries"""
+    if report is None:
+        report: dict = {'months': {}, 'summary': {'n_granules': 0}, 'dates': {}}
+        logger.info(f'No report was produced for product {product}, likely because there were no products in the '
+                    f'time window. Initializing an empty report')
+
+    duplicates = []
+    date_map = {}
+
+    for date in report['dates']:
+        report_acq_date = report['dates'][date]
+        for duplicate in report_acq_date['duplicates']:
+            duplicates.extend(report_acq_date['duplicates'][duplicate]['duplicate_products'])
+
+        date_map[date] = {
+            'products': report_acq_date['n_granules'],
+            'duplicates': report_acq_date['n_duplicates'],
+            'percent_duplicates': report_acq_date['percent_duplicates'],
+        }
+
+    duplicates.sort()
+
+    if len(duplicates) > 0:
+        s3_bucket, root_s3_path = s3_paths
+
+        s3_key = (
+                root_s3_path / f'{product}' / f'{report_date}' /
+                f'OPERA_DUPLICATES_{product}_{start_date}_to_{end_date}_checked_{report_date}.txt'
         )
+        s3_key = str(s3_key).lstrip('/')
+
+        duplicates_report = ''.join(f'{duplicate}\n' for duplicate in duplicates)
+        uploads.upload_bytes(duplicates_report.encode('utf-8'), s3_bucket, s3_key,
+                             f'duplicates report for {product} (len={len(duplicates)})')
+
+        es_doc = {
+            '@timestamp': report_date,
+            'id': report_date,
+            'start_date': start_date,
+            'end_date': end_date,
+            'product': product,
+            'report_url': f's3://{s3_bucket}/{s3_key}',
+            'duplicate_count': len(duplicates)
+        }
+    else:
+        es_doc = {
+            '@timestamp': report_date,
+            'report_time': report_date,
+            'report_id': f'{report_date}-{product}',
+            'start_date': start_date,
+            'end_date': end_date,
+            'product': product,
+            'report_url': None,
+            'duplicate_count': 0
+        }
+
+    if args.opensearch is not None:
+        # The summary and any finer grained docs for the product all go out in the same _bulk batches
+        actions = [[(args.duplicate_index, f'{report_date}-{product}', es_doc)]]
+
+        if args.duplicate_date_index is not None:
+            actions.append(duplicate_date_docs(product, report, report_date, args.duplicate_date_index))
+        if args.duplicate_granule_index is not None:
+            actions.append(duplicate_granule_docs(product, report, report_date, args.duplicate_granule_index))
 
-        resp.raise_for_status()
-        logger.info(f'Inserted accountability doc for product DSWX_HLS into Opensearch: {resp.json()}')
+        _index_docs(args, chain.from_iterable(actions), opensearch, f'{product} duplicate')
+
+    product_counts = {
+        'total_products': report['summary']['n_granules'],
+        'duplicates': len(duplicates),
+        'percent_duplicates': (len(duplicates) / report['summary']['n_granules'] * 100) if
+        report['summary']['n_granules'] > 0 else 0,
+    }
+
+    return product_counts, date_map
 
 
 def main(args):
     start = datetime.now()
-    procs = []
 
     start_date, end_date = _get_start_end_dates(args)
     report_date = now().strftime('%Y-%m-%d')
@@ -437,38 +491,19 @@ def main(args):
         ] if args.venue == 'PROD' else None
     }
 
-    for product in args.products:
-        report_path = args.report_dir / f'{product}.json'
-        report_path.parent.mkdir(parents=True, exist_ok=True)
-
-        report_path = str(report_path)
-
-        logger.info(f'Invoking duplicate search script for product {product}')
-        procs.append(subprocess.Popen(
-            [sys.executable, 'duplicate_check.py', product, '-o', report_path, '--venue', args.venue,
-             '--start-date', start_date, '--end-date', end_date, '--facet', 'dates'],
-            stdout=subprocess.PIPE
-        ))
+    # The accountability script still runs as its own process, alongside the in-process duplicate checks
+    accountability_procs = []
 
+    for product in args.products:
         if accountability_script_map.get(product, None) is not None:
-            procs.append(subprocess.Popen(accountability_script_map[product], stdout=subprocess.PIPE))
-
-    for proc in procs:
-        ret = proc.wait()
-
-        if ret != 0:
-            logger.critical('One or more scripts failed. Quitting')
-            exit(1)
-
-    logger.info('All scripts complete')
+            logger.info(f'Invoking accountability script for product {product}')
+            accountability_procs.append(subprocess.Popen(accountability_script_map[product], stdout=subprocess.PIPE))
 
     s3_url = urlparse(args.s3_report_path)
     s3_paths = (s3_url.netloc, Path(s3_url.path))
 
-    if args.opensearch is not None:
-        opensearch_url = f'{args.opensearch.rstrip("/")}/{args.duplicate_index}/_doc'
-    else:
-        opensearch_url = None
+    opensearch = opensearch_session() if args.opensearch is not None else None
+    uploads = S3UploadManager(s3, workers=args.upload_workers)
 
     plot_data = {
         'date': report_date,
@@ -479,131 +514,78 @@ def main(args):
         'date_maps': {}
     }
 
-    for product in args.products:
-        report_path = args.report_dir / f'{product}.json'
-        report_path = str(report_path)
-
-        if os.path.exists(report_path):
-            with open(report_path, 'r') as f:
-                report: dict = json.load(f)
-
-            logger.info(f'Loaded report for product {product}: {report_path}')
-        else:
-            report: dict = {'months': {}, 'summary': {'n_granules': 0}, 'dates': {}}
-            logger.info(f'No report was produced for product {product}, likely because there were no products in the '
-                        f'time window. Initializing an empty report')
+    product_counts = {}
+    date_maps = {}
+    timings = {}
 
-        duplicates = []
-        date_map = {}
+    # All checks share one pooled CMR session. Each product's report is published as soon as its check finishes,
+    # while the remaining checks keep running. The daily charts are rendered together once all checks are done.
+    session = duplicate_check.cmr_session(pool_size=len(args.products))
 
-        for date in report['dates']:
-            report_acq_date = report['dates'][date]
-            for duplicate in report_acq_date['duplicates']:
-                duplicates.extend(report_acq_date['duplicates'][duplicate]['duplicate_products'])
+    with ThreadPoolExecutor(max_workers=len(args.products)) as executor:
+        futures = {executor.submit(_check_product, product, args, session): product for product in args.products}
 
-            date_map[date] = {
-                'products': report_acq_date['n_granules'],
-                'duplicates': report_acq_date['n_duplicates'],
-                'percent_duplicates': report_acq_date['percent_duplicates'],
-            }
+        for future in as_completed(futures):
+            product = futures[future]
 
-        duplicates.sort()
+            try:
+                report, check_time = future.result()
+            except Exception:
+                logger.critical(f'Duplicate check for product {product} failed. Quitting', exc_info=True)
+                executor.shutdown(wait=False, cancel_futures=True)
+                exit(1)
 
-        if len(duplicates) > 0:
-            s3_bucket, root_s3_path = s3_paths
+            logger.info(f'Duplicate check for product {product} finished in {check_time:.1f}s')
+            publish_start = time.monotonic()
 
-            s3_key = (
-                    root_s3_path / f'{product}' / f'{report_date}' /
-                    f'OPERA_DUPLICATES_{product}_{start_date}_to_{end_date}_checked_{report_date}.txt'
-            )
-            s3_key = str(s3_key).lstrip('/')
-
-            with TemporaryDirectory() as temp_dir:
-                with open(os.path.join(temp_dir, 'duplicates.txt'), 'w') as f:
-                    for duplicate in duplicates:
-                        f.write(f'{duplicate}\n')
-
-                s3.upload_file(os.path.join(temp_dir, 'duplicates.txt'), s3_bucket, s3_key)
-                logger.info(f'Uploaded duplicates report for {product} '
-                            f'(len={len(duplicates)}) to s3://{s3_bucket}/{s3_key}')
-
-            es_doc = {
-                '@timestamp': report_date,
-                'id': report_date,
-                'start_date': start_date,
-                'end_date': end_date,
-                'product': product,
-                'report_url': f's3://{s3_bucket}/{s3_key}',
-                'duplicate_count': len(duplicates)
-            }
-        else:
-            es_doc = {
-                '@timestamp': report_date,
-                'report_time': report_date,
-                'report_id': f'{report_date}-{product}',
-                'start_date': start_date,
-                'end_date': end_date,
-                'product': product,
-                'report_url': None,
-                'duplicate_count': 0
-            }
-
-        if opensearch_url is not None:
-            resp = requests.post(
-                f'{opensearch_url}/{report_date}-{product}',
-                headers={'Content-Type': 'application/json'},
-                data=json.dumps(es_doc)
+            product_counts[product], date_maps[product] = publish_product_report(
+                product, report, args, s3_paths, start_date, end_date, report_date, uploads, opensearch
             )
 
-            resp.raise_for_status()
-            logger.info(f'Inserted doc for product {product} into Opensearch: {resp.json()}')
-
-        plot_data['product_counts'][product] = {
-            'total_products': report['summary']['n_granules'],
-            'duplicates': len(duplicates),
-            'percent_duplicates': (len(duplicates) / report['summary']['n_granules'] * 100) if
-            report['summary']['n_granules'] > 0 else 0,
-        }
-        plot_data['date_maps'][product] = date_map
-
-    s3_bucket, root_s3_path = s3_paths
+            timings[product] = (check_time, time.monotonic() - publish_start)
 
-    plot_data_key = str(root_s3_path / 'plot_data.json').lstrip('/')
+    # One batch, so the charts are rendered in parallel while the accountability script finishes
+    plot_start = time.monotonic()
+    plot_data_and_save(
+        {'start_date': start_date, 'end_date': end_date,
+         'date_maps': {product: date_maps[product] for product in args.products}},
+        args.plot_dir, args.s3_plot_path, uploads, args.plot_workers
+    )
+    logger.info(f'Rendered daily product count plots in {time.monotonic() - plot_start:.1f}s')
 
-    plot_data_exists = len(s3.list_objects_v2(Bucket=s3_bucket, Prefix=plot_data_key).get('Contents', [])) != 0
+    for proc in accountability_procs:
+        ret = proc.wait()
 
-    if plot_data_exists:
-        with TemporaryDirectory() as temp_dir:
-            s3.download_file(s3_bucket, plot_data_key, os.path.join(temp_dir, 'plot_data.json'))
-            with open(os.path.join(temp_dir, 'plot_data.json')) as f:
-                existing_plot_data = json.load(f)
+        if ret != 0:
+            logger.critical('One or more scripts failed. Quitting')
+            exit(1)
 
-        logger.info('Read in existing plot data')
+    logger.info('All checks complete')
 
-        timeseries_plot_data = existing_plot_data + [plot_data]
-    else:
-        timeseries_plot_data = [plot_data]
+    # Keep report order stable regardless of which check finished first
+    plot_data['product_counts'] = {product: product_counts[product] for product in args.products}
+    plot_data['date_maps'] = {product: date_maps[product] for product in args.products}
 
-    for i in range(len(timeseries_plot_data) - 1):
-        if timeseries_plot_data[i]['date'] == report_date:
-            logger.warning('Date already exists in timeseries plot data')
-            timeseries_plot_data.pop(i)
+    s3_bucket, root_s3_path = s3_paths
 
-    timeseries_plot_data = timeseries_plot_data[:args.plot_length]
-    timeseries_plot_data.sort(key=lambda x: x['date'])
+    # Per-date entries are appended to the store, and only the plotted window of recent dates is read back
+    plot_data_prefix = str(root_s3_path)
+    plot_data_store.migrate_legacy(s3, s3_bucket, plot_data_prefix)
+    plot_data_store.append(s3, s3_bucket, plot_data_prefix, plot_data)
 
-    with TemporaryDirectory() as temp_dir:
-        with open(os.path.join(temp_dir, 'plot_data.json'), 'w') as f:
-            json.dump(timeseries_plot_data, f, indent=2)
+    timeseries_plot_data = plot_data_store.read_window(s3, s3_bucket, plot_data_prefix, args.plot_length)
 
-        s3.upload_file(os.path.join(temp_dir, 'plot_data.json'), s3_bucket, plot_data_key)
+    plot_timeseries_data_and_save(timeseries_plot_data, args.plot_dir, args.s3_plot_path, uploads, args.plot_workers)
 
-        logger.info(f'Uploaded plot data to s3://{s3_bucket}/{plot_data_key}')
+    record_dswx_hls_accountability(args, start_date, end_date, uploads, opensearch)
 
-    plot_data_and_save(plot_data, args.plot_dir, args.s3_plot_path)
-    plot_timeseries_data_and_save(timeseries_plot_data, args.plot_dir, args.s3_plot_path)
+    # Uploads run in the background from the moment each artifact is ready; this only waits for the stragglers
+    uploads.wait()
 
-    record_dswx_hls_accountability(args, start_date, end_date)
+    logger.info('Per-product timings (duplicate check / publish):')
+    for product in args.products:
+        check_time, publish_time = timings[product]
+        logger.info(f'  {product:<10} {check_time:8.1f}s {publish_time:8.1f}s')
 
     logger.info(f'Finished all tasks in {datetime.now() - start}')
 
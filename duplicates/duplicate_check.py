@@ -5,6 +5,7 @@ import requests
 from datetime import datetime
 import backoff
 import logging
+from collections import Counter
 from itertools import chain
 
 logging.basicConfig(
@@ -175,6 +176,14 @@ PRODUCTS = {
 }
 
 
+def cmr_session(pool_size=10):
+    """Returns a requests session whose connection pool can serve pool_size concurrent CMR queries"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    return session
+
+
 def _fatal_code(err: requests.exceptions.RequestException) -> bool:
     return err.response.status_code not in [401, 418, 429, 500, 502, 503, 504]
 
@@ -193,20 +202,19 @@ def _backoff_logger(details):
                       giveup=_fatal_code,
                       on_backoff=_backoff_logger,
                       interval=15)
-def _do_cmr_query(url, params, headers=None):
+def _do_cmr_query(url, params, headers=None, session=None):
     if headers is None:
         headers = {}
     logger.info(f'Querying {url} with params {params} and headers {headers}')
-    response = requests.get(url, params=params, headers=headers)
+    response = (session or requests).get(url, params=params, headers=headers)
     response.raise_for_status()
     response_json = response.json()
     return ([i['umm']['GranuleUR'] for i in response_json.get('items', [])],
             response.headers.get('CMR-Search-After', None))
 
 
-def get_granule_ids_from_cmr(cmr_url, ccid, start, end, temporal, test_pattern: re.Pattern = None):
-    granules = []
-
+def iter_granule_id_pages(cmr_url, ccid, start, end, temporal, test_pattern: re.Pattern = None, session=None):
+    """Yields each page of granule IDs from CMR as it is retrieved"""
     params = {
         'collection_concept_id': ccid,
         'page_size': 2000
@@ -221,149 +229,174 @@ def get_granule_ids_from_cmr(cmr_url, ccid, start, end, temporal, test_pattern:
         else:
             params['revision_date[]'] = f'{start_q_str},{end_q_str}'
 
-    query_result, search_after = _do_cmr_query(cmr_url, params)
-    granules.extend(query_result)
-    if len(granules) > 0:
-        logger.info(f'Most recent granule retrieved: {granules[-1]}')
+    query_result, search_after = _do_cmr_query(cmr_url, params, session=session)
+    if len(query_result) > 0:
+        logger.info(f'Most recent granule retrieved: {query_result[-1]}')
         if test_pattern is not None:
-            if test_pattern.match(granules[0]) is None:
-                raise ValueError(f'Pattern {test_pattern} does not match granule: {granules[0]}')
+            if test_pattern.match(query_result[0]) is None:
+                raise ValueError(f'Pattern {test_pattern} does not match granule: {query_result[0]}')
+    yield query_result
+
     while search_after is not None:
         headers = {'CMR-Search-After': search_after}
-        query_result, search_after = _do_cmr_query(cmr_url, params, headers)
-        granules.extend(query_result)
-        if len(granules) > 0:
-            logger.info(f'Most recent granule retrieved: {granules[-1]}')
+        query_result, search_after = _do_cmr_query(cmr_url, params, headers, session=session)
+        if len(query_result) > 0:
+            logger.info(f'Most recent granule retrieved: {query_result[-1]}')
+        yield query_result
 
-    return granules
 
+def get_granule_ids_from_cmr(cmr_url, ccid, start, end, temporal, test_pattern: re.Pattern = None, session=None):
+    return list(chain.from_iterable(
+        iter_granule_id_pages(cmr_url, ccid, start, end, temporal, test_pattern=test_pattern, session=session)
+    ))
 
-def main(args):
-    start_time = datetime.now()
 
-    ccid = PRODUCTS[args.product]['CCID'][args.venue]
-    cmr_url = CMR_URLS[args.venue]
+class DuplicateAggregator:
+    """Single-pass duplicate aggregation over a stream of granule IDs.
 
-    pattern = PRODUCTS[args.product]['PATTERN']
-    unique_groups = PRODUCTS[args.product]['UNIQUE_GROUPS']
-    aggregation_ts = PRODUCTS[args.product]['AGG_TS_GROUP']
-    aggregation_ts_fmt = PRODUCTS[args.product].get('AGG_TS_FORMAT', DEFAULT_GRANULE_TIME_FMT)
+    Each granule ID is parsed once. The only state kept is granule counts per day, the first granule ID seen for each
+    unique ID (keyed by one joined string rather than a tuple), and one (unique ID, granule ID, creation time, day)
+    record per duplicate, in the order seen. Month and date facets are both derived from that table when the report
+    is built, instead of being kept as two full copies.
+    """
 
-    logger.info(f'Listing granule IDs for product {args.product}({ccid}) from {args.venue}')
+    def __init__(self, product):
+        config = PRODUCTS[product]
 
-    granule_ids = get_granule_ids_from_cmr(
-        cmr_url, ccid, args.start_date, args.end_date, args.use_temporal, test_pattern=pattern
-    )
-
-    logger.info(f'Found {len(granule_ids)} granule IDs')
-
-    if len(granule_ids) == 0:
-        logger.info('No data found!')
-        return
+        self.pattern = config['PATTERN']
+        self.unique_groups = config['UNIQUE_GROUPS']
+        self.aggregation_ts = config['AGG_TS_GROUP']
+        self.aggregation_ts_fmt = config.get('AGG_TS_FORMAT', DEFAULT_GRANULE_TIME_FMT)
+        self.create_ts = config.get('CREATE_TS_GROUP')
 
-    granule_month_map = {}
-    aqc_date_map = {}
-    unique_granules = {}
+        self.n_granules = 0
+        self.granules_per_day = Counter()
+        self.first_granules = {}
+        self.duplicates = []
+        self._groups = {}
 
-    for granule_id in granule_ids:
-        match = pattern.match(granule_id)
+    def add(self, granule_id):
+        match = self.pattern.match(granule_id)
 
         if match is None:
-            raise RuntimeError(f'Failed to parse granule ID {granule_id} with pattern {pattern.pattern}')
+            raise RuntimeError(f'Failed to parse granule ID {granule_id} with pattern {self.pattern.pattern}')
 
-        group_dict = match.groupdict()
+        granule_agg_time = datetime.strptime(match.group(self.aggregation_ts), self.aggregation_ts_fmt)
+        granule_agg_day = granule_agg_time.strftime('%Y-%m-%d')
 
-        granule_agg_time = datetime.strptime(group_dict[aggregation_ts], aggregation_ts_fmt)
-        granule_agg_day = granule_agg_time.replace(hour=0, minute=0, second=0, microsecond=0)
-        granule_agg_day = granule_agg_day.strftime('%Y-%m-%d')
+        self.n_granules += 1
+        self.granules_per_day[granule_agg_day] += 1
 
-        granule_agg_month = granule_agg_time.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        granule_agg_month = granule_agg_month.strftime('%Y-%m')
+        unique_key = '\x1f'.join([match.group(grp) for grp in self.unique_groups])
 
-        if granule_agg_day not in aqc_date_map:
-            aqc_date_map[granule_agg_day] = {
+        if unique_key in self.first_granules:
+            creation_ts = match.group(self.create_ts) if self.create_ts is not None else None
+            self.duplicates.append((unique_key, granule_id, creation_ts, granule_agg_day))
+        else:
+            self.first_granules[unique_key] = granule_id
+
+    def _group(self, unique_key):
+        """Report key and (granule ID, creation time) of the first granule of a duplicated unique ID. Only duplicated
+        IDs get here, so re-parsing their first granule is cheaper than keeping this for every unique ID."""
+        group = self._groups.get(unique_key)
+
+        if group is None:
+            first_granule = self.first_granules[unique_key]
+            match = self.pattern.match(first_granule)
+            creation_ts = match.group(self.create_ts) if self.create_ts is not None else None
+            group = self._groups[unique_key] = (
+                repr(tuple([match.group(grp) for grp in self.unique_groups])), (first_granule, creation_ts)
+            )
+
+        return group
+
+    def facet(self, period_of):
+        """Builds a facet keyed by period_of(day). Each period lists every unique ID with a duplicate in that period,
+        together with the first granule seen for it."""
+        facet_map = {}
+
+        for day, n_granules in self.granules_per_day.items():
+            period = facet_map.setdefault(period_of(day), {
                 'n_granules': 0,
                 'n_duplicates': 0,
                 'percent_duplicates': -1.0,
                 'duplicates': {}
-            }
+            })
+            period['n_granules'] += n_granules
 
-        if granule_agg_month not in granule_month_map:
-            granule_month_map[granule_agg_month] = {
-                'n_granules': 0,
-                'n_duplicates': 0,
-                'percent_duplicates': -1.0,
-                'duplicates': {}
-            }
+        for unique_key, granule_id, creation_ts, day in self.duplicates:
+            period = facet_map[period_of(day)]
+            period['n_duplicates'] += 1
 
-        aqc_date_map[granule_agg_day]['n_granules'] += 1
-        granule_month_map[granule_agg_month]['n_granules'] += 1
+            key, first = self._group(unique_key)
 
-        granule_unique_ids = tuple([group_dict[grp] for grp in unique_groups])
+            group = period['duplicates'].get(key)
+            if group is None:
+                group = period['duplicates'][key] = [first]
+            group.append((granule_id, creation_ts))
 
-        if granule_unique_ids in unique_granules:
-            granule_month_map[granule_agg_month]['n_duplicates'] += 1
-            aqc_date_map[granule_agg_day]['n_duplicates'] += 1
-            first_duplicate = unique_granules[granule_unique_ids]
+        for period in facet_map.values():
+            period['percent_duplicates'] = (period['n_duplicates'] / period['n_granules']) * 100
 
-            if first_duplicate[1] not in granule_month_map[granule_agg_month]['duplicates']:
-                granule_month_map[granule_agg_month]['duplicates'][first_duplicate[1]] = [first_duplicate[0]]
+            for key, group in period['duplicates'].items():
+                if self.create_ts is not None:
+                    # Creation times were captured at parse time, so no IDs are re-parsed to sort the group
+                    group.sort(key=lambda g: g[1], reverse=True)
+                    period['duplicates'][key] = {
+                        'latest_product': group[0][0],
+                        'duplicate_products': [g[0] for g in group[1:]],
+                    }
+                else:
+                    period['duplicates'][key] = [g[0] for g in group]
 
-            if first_duplicate[1] not in aqc_date_map[granule_agg_day]['duplicates']:
-                aqc_date_map[granule_agg_day]['duplicates'][first_duplicate[1]] = [first_duplicate[0]]
+        return dict(sorted(facet_map.items()))
 
-            granule_month_map[granule_agg_month]['duplicates'][first_duplicate[1]].append(granule_id)
-            aqc_date_map[granule_agg_day]['duplicates'][first_duplicate[1]].append(granule_id)
-        else:
-            unique_granules[granule_unique_ids] = (granule_id, repr(granule_unique_ids))
-
-    if 'CREATE_TS_GROUP' in PRODUCTS[args.product]:
-        for month in granule_month_map:
-            for duplicate in granule_month_map[month]['duplicates']:
-                duplicate_granule_ids = granule_month_map[month]['duplicates'][duplicate]
-                duplicate_granule_ids.sort(
-                    key=lambda x: pattern.match(x).groupdict()[PRODUCTS[args.product]['CREATE_TS_GROUP']], reverse=True
-                )
-
-                granule_month_map[month]['duplicates'][duplicate] = {
-                    'latest_product': duplicate_granule_ids[0],
-                    'duplicate_products': duplicate_granule_ids[1:],
-                }
-
-        for date in aqc_date_map:
-            for duplicate in aqc_date_map[date]['duplicates']:
-                duplicate_granule_ids = aqc_date_map[date]['duplicates'][duplicate]
-                duplicate_granule_ids.sort(
-                    key=lambda x: pattern.match(x).groupdict()[PRODUCTS[args.product]['CREATE_TS_GROUP']], reverse=True
-                )
-
-                aqc_date_map[date]['duplicates'][duplicate] = {
-                    'latest_product': duplicate_granule_ids[0],
-                    'duplicate_products': duplicate_granule_ids[1:],
-                }
-
-    granule_month_map = dict(sorted(granule_month_map.items()))
-    aqc_date_map = dict(sorted(aqc_date_map.items()))
-
-    for month in granule_month_map.keys():
-        granule_month_map[month]['percent_duplicates'] = (granule_month_map[month]['n_duplicates'] /
-                                                          granule_month_map[month]['n_granules']) * 100
-
-    for date in aqc_date_map.keys():
-        aqc_date_map[date]['percent_duplicates'] = (aqc_date_map[date]['n_duplicates'] /
-                                                    aqc_date_map[date]['n_granules']) * 100
-
-    n_duplicates = sum([month['n_duplicates'] for month in granule_month_map.values()])
-    logger.info(f'Found {n_duplicates} duplicate granule IDs out of {len(granule_ids)} granules '
-                f'({(n_duplicates / len(granule_ids)) * 100:.1f}%)')
-
-    if 'CREATE_TS_GROUP' in PRODUCTS[args.product]:
-        duplicate_counts = list(chain.from_iterable(list(map(lambda x: [len(dup['duplicate_products'])
-                                                                        for dup in x['duplicates'].values()],
-                                                             granule_month_map.values()))))
-    else:
-        duplicate_counts = list(chain.from_iterable(list(map(lambda x: [len(dup) for dup in x['duplicates'].values()],
-                                                             granule_month_map.values()))))
+    def duplicate_counts(self):
+        """Number of duplicates of each unique ID in each month, as reported in the month facet"""
+        counts = Counter((day[:7], unique_key) for unique_key, _, _, day in self.duplicates)
+
+        if self.create_ts is None:
+            # Without a creation time there is no latest product, so the first granule is counted too
+            return [count + 1 for count in counts.values()]
+
+        return list(counts.values())
+
+
+def check_product(product, venue='PROD', start_date=None, end_date=None, use_temporal=True, facet='months',
+                  session=None):
+    """Runs the duplicate check for one product and returns the report, or None if CMR has no granules in range.
+
+    Pass a shared session (see cmr_session) to reuse pooled CMR connections across concurrent checks.
+    """
+    start_time = datetime.now()
+
+    ccid = PRODUCTS[product]['CCID'][venue]
+    cmr_url = CMR_URLS[venue]
+
+    pattern = PRODUCTS[product]['PATTERN']
+
+    logger.info(f'Listing granule IDs for product {product}({ccid}) from {venue}')
+
+    aggregator = DuplicateAggregator(product)
+
+    for page in iter_granule_id_pages(cmr_url, ccid, start_date, end_date, use_temporal, test_pattern=pattern,
+                                      session=session):
+        for granule_id in page:
+            aggregator.add(granule_id)
+
+    n_granules = aggregator.n_granules
+
+    logger.info(f'Found {n_granules} granule IDs')
+
+    if n_granules == 0:
+        logger.info('No data found!')
+        return None
+
+    n_duplicates = len(aggregator.duplicates)
+    logger.info(f'Found {n_duplicates} duplicate granule IDs out of {n_granules} granules '
+                f'({(n_duplicates / n_granules) * 100:.1f}%)')
+
+    duplicate_counts = aggregator.duplicate_counts()
 
     if len(duplicate_counts) > 0:
         logger.info(f'Minimum number of duplicates per granule ID: {min(duplicate_counts)}')
@@ -372,12 +405,12 @@ def main(args):
 
     final_report = {
         'summary': {
-            'product': args.product,
-            'venue': args.venue,
+            'product': product,
+            'venue': venue,
             'ccid': ccid,
-            'n_granules': len(granule_ids),
+            'n_granules': n_granules,
             'n_duplicates': n_duplicates,
-            'percent_duplicates': (n_duplicates / len(granule_ids)) * 100,
+            'percent_duplicates': (n_duplicates / n_granules) * 100,
             'min_duplicates_per_granule': min(duplicate_counts) if n_duplicates > 0 else None,
             'max_duplicates_per_granule': max(duplicate_counts) if n_duplicates > 0 else None,
             'avg_duplicates_per_granule': sum(duplicate_counts) / len(duplicate_counts) if n_duplicates > 0 else None,
@@ -385,10 +418,22 @@ def main(args):
         },
     }
 
-    if args.facet in {'months', 'both'}:
-        final_report['months'] = granule_month_map
-    if args.facet in {'dates', 'both'}:
-        final_report['dates'] = aqc_date_map
+    if facet in {'months', 'both'}:
+        final_report['months'] = aggregator.facet(lambda day: day[:7])
+    if facet in {'dates', 'both'}:
+        final_report['dates'] = aggregator.facet(lambda day: day)
+
+    return final_report
+
+
+def main(args):
+    start_time = datetime.now()
+
+    final_report = check_product(args.product, args.venue, args.start_date, args.end_date, args.use_temporal,
+                                 args.facet)
+
+    if final_report is None:
+        return
 
     with open(args.output, 'w') as f:
         json.dump(final_report, f, indent=2)
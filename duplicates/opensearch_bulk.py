@@ -0,0 +1,103 @@
+import json
+import logging
+
+import backoff
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Documents per _bulk request
+BULK_BATCH_SIZE = 500
+
+
+def opensearch_session(pool_size=10):
+    """Returns a requests session whose connection pool is reused across bulk requests"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _fatal_code(err: Exception) -> bool:
+    if isinstance(err, requests.exceptions.RequestException) and err.response is not None:
+        return err.response.status_code not in [429, 500, 502, 503, 504]
+    return False
+
+
+def _backoff_logger(details):
+    logger.warning(
+        f"Backing off {details['target']} function for {details['wait']:0.1f} "
+        f"seconds after {details['tries']} tries."
+    )
+    logger.warning(f"Total time elapsed: {details['elapsed']:0.1f} seconds.")
+
+
+@backoff.on_exception(backoff.expo,
+                      requests.exceptions.RequestException,
+                      max_time=120,
+                      giveup=_fatal_code,
+                      on_backoff=_backoff_logger)
+def _post_bulk(session, url, body):
+    response = session.post(url, data=body, headers={'Content-Type': 'application/x-ndjson'})
+    response.raise_for_status()
+    return response.json()
+
+
+def _send_batch(session, url, batch):
+    body = ''.join(
+        f'{json.dumps({"index": {"_index": index, "_id": doc_id}})}\n{json.dumps(doc)}\n'
+        for index, doc_id, doc in batch
+    )
+
+    result = _post_bulk(session, url, body.encode('utf-8'))
+
+    errors = []
+
+    if result.get('errors'):
+        for item in result['items']:
+            action = item['index']
+            if 'error' in action:
+                errors.append({
+                    'index': action.get('_index'),
+                    'id': action.get('_id'),
+                    'status': action.get('status'),
+                    'error': action['error'],
+                })
+
+    return len(batch) - len(errors), errors
+
+
+def bulk_index(opensearch, actions, session=None, batch_size=BULK_BATCH_SIZE):
+    """Indexes (index, doc_id, doc) tuples through the _bulk API in NDJSON batches of batch_size documents.
+
+    A failed document does not fail its batch. Returns (number of documents indexed, list of per-document errors), so
+    the caller decides whether partial failures are fatal.
+    """
+    if session is None:
+        session = opensearch_session(pool_size=1)
+
+    url = f'{opensearch.rstrip("/")}/_bulk'
+    n_indexed = 0
+    errors = []
+    batch = []
+
+    for action in actions:
+        batch.append(action)
+
+        if len(batch) >= batch_size:
+            batch_indexed, batch_errors = _send_batch(session, url, batch)
+            n_indexed += batch_indexed
+            errors.extend(batch_errors)
+            batch = []
+
+    if batch:
+        batch_indexed, batch_errors = _send_batch(session, url, batch)
+        n_indexed += batch_indexed
+        errors.extend(batch_errors)
+
+    for error in errors:
+        logger.error(f'Failed to index doc {error["id"]} into {error["index"]} (status {error["status"]}): '
+                     f'{error["error"]}')
+
+    return n_indexed, errors
@@ -0,0 +1,109 @@
+"""Append-only S3 store for the duplicate cron's timeseries plot data.
+
+Each report date is its own small object, <prefix>/plot_data/<date>.json, so a run writes only its own entry.
+<prefix>/plot_data/index.json holds the sorted list of stored dates. It lets the plotting step fetch just the most
+recent window of entries without downloading the whole history.
+"""
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = 'plot_data'
+INDEX_NAME = 'index.json'
+LEGACY_NAME = 'plot_data.json'
+
+
+def _key(prefix, name):
+    return f'{prefix.strip("/")}/{STORE_DIR}/{name}'.lstrip('/')
+
+
+def _get_json(client, bucket, key):
+    try:
+        response = client.get_object(Bucket=bucket, Key=key)
+    except client.exceptions.NoSuchKey:
+        return None
+
+    return json.loads(response['Body'].read())
+
+
+def _put_json(client, bucket, key, data):
+    client.put_object(Bucket=bucket, Key=key, Body=json.dumps(data, indent=2).encode('utf-8'),
+                      ContentType='application/json')
+
+
+def _list_dates(client, bucket, prefix):
+    dates = []
+    paginator = client.get_paginator('list_objects_v2')
+
+    for page in paginator.paginate(Bucket=bucket, Prefix=_key(prefix, '')):
+        for obj in page.get('Contents', []):
+            name = obj['Key'].rsplit('/', 1)[-1]
+            if name != INDEX_NAME and name.endswith('.json'):
+                dates.append(name[:-len('.json')])
+
+    return sorted(dates)
+
+
+def read_index(client, bucket, prefix):
+    """Returns the sorted stored report dates, rebuilding the index from a listing if it is missing"""
+    index = _get_json(client, bucket, _key(prefix, INDEX_NAME))
+
+    if index is None:
+        dates = _list_dates(client, bucket, prefix)
+
+        if len(dates) > 0:
+            logger.warning(f'Plot data index is missing, rebuilt it from {len(dates)} stored entries')
+            _put_json(client, bucket, _key(prefix, INDEX_NAME), {'dates': dates})
+
+        return dates
+
+    return index['dates']
+
+
+def migrate_legacy(client, bucket, prefix):
+    """Splits a legacy single-file plot_data.json list into per-date entries, if the store does not exist yet"""
+    legacy_key = f'{prefix.strip("/")}/{LEGACY_NAME}'.lstrip('/')
+
+    if len(read_index(client, bucket, prefix)) > 0:
+        return
+
+    legacy = _get_json(client, bucket, legacy_key)
+
+    if not legacy:
+        return
+
+    for entry in legacy:
+        _put_json(client, bucket, _key(prefix, f'{entry["date"]}.json'), entry)
+
+    _put_json(client, bucket, _key(prefix, INDEX_NAME), {'dates': sorted({entry['date'] for entry in legacy})})
+    logger.info(f'Migrated {len(legacy)} entries from s3://{bucket}/{legacy_key}')
+
+
+def append(client, bucket, prefix, plot_data):
+    """Stores one report's plot data, replacing any earlier entry for the same report date"""
+    date = plot_data['date']
+
+    # Read the index before writing the entry, so a missing index is not rebuilt from the entry being added
+    dates = read_index(client, bucket, prefix)
+
+    _put_json(client, bucket, _key(prefix, f'{date}.json'), plot_data)
+
+    if date not in dates:
+        dates = sorted(dates + [date])
+        _put_json(client, bucket, _key(prefix, INDEX_NAME), {'dates': dates})
+    else:
+        logger.warning(f'Replaced existing plot data for {date}')
+
+    logger.info(f'Stored plot data for {date} in s3://{bucket}/{_key(prefix, f"{date}.json")}')
+
+
+def read_window(client, bucket, prefix, length, workers=8):
+    """Returns the entries for the most recent length report dates, sorted by date"""
+    dates = read_index(client, bucket, prefix)[-length:]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        entries = list(executor.map(lambda d: _get_json(client, bucket, _key(prefix, f'{d}.json')), dates))
+
+    return [entry for entry in entries if entry is not None]
@@ -0,0 +1,170 @@
+"""Rendering of the duplicate cron's product count bar charts.
+
+Chart inputs are built for all products at once as a pandas frame and then split into per-product jobs. Jobs are
+rendered in a process pool onto one reused matplotlib Figure per worker. A job is skipped when its data hash matches
+the hash stored next to the existing PNG.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when the chart layout changes so existing PNGs are re-rendered even if their data has not
+RENDER_VERSION = 1
+
+PLOT_WORKERS = 4
+
+MEASURES = ['total_products', 'duplicate_products', 'duplicate_percent']
+
+_figure = None
+
+
+def daily_counts_frame(date_maps):
+    """Frame of per-date counts for every product, indexed by date with (measure, product) columns. Dates a product
+    has no entry for are NaN."""
+    rows = [
+        (product, date, counts['products'], counts['duplicates'], counts['percent_duplicates'])
+        for product, date_map in date_maps.items()
+        for date, counts in date_map.items()
+    ]
+
+    frame = pd.DataFrame(rows, columns=['product', 'date'] + MEASURES)
+    return frame.pivot(index='date', columns='product', values=MEASURES).sort_index()
+
+
+def timeseries_counts_frame(records):
+    """Frame of per-report product counts, indexed by report date with (measure, product) columns. Products missing
+    from a report are 0."""
+    rows = [
+        (record['date'], product, counts.get('total_products', 0), counts.get('duplicates', 0),
+         counts.get('percent_duplicates', 0))
+        for record in records
+        for product, counts in record['product_counts'].items()
+    ]
+
+    frame = pd.DataFrame(rows, columns=['date', 'product'] + MEASURES)
+    frame = frame.pivot(index='date', columns='product', values=MEASURES)
+    frame = frame.reindex(sorted({record['date'] for record in records})).fillna(0)
+    return frame
+
+
+def chart_job(frame, product, days, path, title):
+    """Builds a picklable render job for one product's columns of a counts frame, over the given days"""
+    if product in frame.columns.get_level_values('product'):
+        product_frame = frame.xs(product, axis=1, level='product').reindex(days).fillna(0)
+    else:
+        product_frame = pd.DataFrame(0, index=days, columns=MEASURES)
+
+    return {
+        'path': str(path),
+        'title': title,
+        'days': list(days),
+        'total_products': product_frame['total_products'].astype(np.int64).tolist(),
+        'duplicate_products': product_frame['duplicate_products'].astype(np.int64).tolist(),
+        'duplicate_percent': product_frame['duplicate_percent'].astype(float).tolist(),
+    }
+
+
+def _job_hash(job):
+    return hashlib.sha256(json.dumps([RENDER_VERSION, job], sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _hash_path(job):
+    path = Path(job['path'])
+    return path.with_name(path.name + '.sha256')
+
+
+def is_current(job):
+    """Whether the job's PNG exists and was rendered from the same data"""
+    hash_path = _hash_path(job)
+    return Path(job['path']).exists() and hash_path.exists() and hash_path.read_text().strip() == _job_hash(job)
+
+
+def _get_figure(width, height):
+    global _figure
+
+    # Figures made directly (not through pyplot) are not tracked by pyplot, so nothing accumulates across charts
+    if _figure is None:
+        from matplotlib.figure import Figure
+        _figure = Figure(layout='constrained')
+
+    _figure.clear()
+    _figure.set_size_inches(width, height)
+    return _figure
+
+
+def render_chart(job):
+    """Renders one chart job to its path, unless the PNG exists with the same data hash. Returns True if rendered."""
+    if is_current(job):
+        return False
+
+    path = Path(job['path'])
+
+    days = job['days']
+    x = np.arange(len(days))
+    width = 1 / 3
+
+    fig = _get_figure(5 + 1 * len(days), 8)
+    ax = fig.subplots()
+
+    totals = ax.bar(x, job['total_products'], width, label='total_products', color='tab:blue')
+    ax.bar_label(totals, padding=3, fmt='{:,.0f}', fontsize=12, rotation=90)
+
+    duplicates = ax.bar(x + width, job['duplicate_products'], width, label='duplicate_products', color='tab:orange')
+    labels = [f'{c:,}\n({perc:0.2f}%)' for c, perc in zip(job['duplicate_products'], job['duplicate_percent'])]
+    ax.bar_label(duplicates, labels, padding=3, fontsize=12, rotation=90)
+
+    ax.set_xlabel('Acquisition date (at 00:00:00Z)', fontsize=12)
+    ax.set_ylabel('Granule Count', fontsize=12)
+
+    ax.set_xticks(x + (width / 2), days, rotation=90)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=UserWarning)
+        ax.set_yticklabels([f'{label:,.0f}' for label in ax.get_yticks()])
+
+    ax.set_title(job['title'], fontsize=14)
+
+    ymax = max(job['total_products'])
+    if ymax > 0:
+        ymax = ceil(ymax * 1.2)  # Scale a bit to fit the labels
+    else:
+        ymax = 1
+
+    ax.set_ylim(bottom=0, top=ymax)
+
+    ax.legend(['Total Product Count', 'Duplicate Product Count'], fontsize=12)
+
+    path.parent.mkdir(exist_ok=True, parents=True)
+    fig.savefig(path)
+    fig.clear()
+
+    _hash_path(job).write_text(_job_hash(job))
+    return True
+
+
+def render_charts(jobs, workers=PLOT_WORKERS):
+    """Renders chart jobs, in a process pool when there is more than one. Returns whether each job was rendered."""
+    rendered = [False] * len(jobs)
+    pending = [i for i, job in enumerate(jobs) if not is_current(job)]
+
+    if len(pending) <= 1 or workers <= 1:
+        for i in pending:
+            rendered[i] = render_chart(jobs[i])
+        return rendered
+
+    # spawn rather than fork: the cron has live threads and boto3/requests state that should not be copied
+    with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        for i, was_rendered in zip(pending, executor.map(render_chart, [jobs[i] for i in pending])):
+            rendered[i] = was_rendered
+
+    return rendered
@@ -0,0 +1,110 @@
+"""Concurrent S3 uploads that skip objects whose content is already in the bucket.
+
+Every upload is hashed first. An object is skipped when its stored sha256 metadata matches the hash, or, for objects
+uploaded without that metadata in a single part, when its ETag matches the MD5. Everything else is uploaded on a
+thread pool with tuned multipart settings, tagged with its sha256 for the next run.
+"""
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_WORKERS = 8
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True,
+)
+
+_READ_SIZE = 1024 * 1024
+
+
+def _digests(fileobj):
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5(usedforsecurity=False)
+
+    for chunk in iter(lambda: fileobj.read(_READ_SIZE), b''):
+        sha256.update(chunk)
+        md5.update(chunk)
+
+    return sha256.hexdigest(), md5.hexdigest()
+
+
+class S3UploadManager:
+    def __init__(self, client, workers=UPLOAD_WORKERS, transfer_config=TRANSFER_CONFIG):
+        self.client = client
+        self.transfer_config = transfer_config
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._futures = []
+        self.uploaded = 0
+        self.skipped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.wait()
+        else:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _is_unchanged(self, bucket, key, sha256, md5):
+        try:
+            head = self.client.head_object(Bucket=bucket, Key=key)
+        except ClientError as err:
+            if err.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+        if 'sha256' in head.get('Metadata', {}):
+            return head['Metadata']['sha256'] == sha256
+
+        return head['ETag'].strip('"') == md5
+
+    def _upload(self, opener, bucket, key, description):
+        with opener() as f:
+            sha256, md5 = _digests(f)
+
+            if self._is_unchanged(bucket, key, sha256, md5):
+                logger.info(f'{description} is unchanged at s3://{bucket}/{key}, skipped upload')
+                return False
+
+            f.seek(0)
+            self.client.upload_fileobj(f, bucket, key, ExtraArgs={'Metadata': {'sha256': sha256}},
+                                       Config=self.transfer_config)
+
+        logger.info(f'Uploaded {description} to s3://{bucket}/{key}')
+        return True
+
+    def upload_file(self, path, bucket, key, description=None):
+        """Queues an upload of a local file. The file must exist until wait() returns."""
+        description = description or str(path)
+        future = self._executor.submit(self._upload, lambda: open(path, 'rb'), bucket, key, description)
+        self._futures.append(future)
+        return future
+
+    def upload_bytes(self, data, bucket, key, description=None):
+        """Queues an upload of in-memory content, for artifacts that would otherwise need a temporary file"""
+        description = description or key
+        future = self._executor.submit(self._upload, lambda: io.BytesIO(data), bucket, key, description)
+        self._futures.append(future)
+        return future
+
+    def wait(self):
+        """Waits for every queued upload, raising the first failure"""
+        futures, self._futures = self._futures, []
+
+        for future in futures:
+            if future.result():
+                self.uploaded += 1
+            else:
+                self.skipped += 1
+
+        logger.info(f'S3 uploads complete: {self.uploaded} uploaded, {self.skipped} unchanged')
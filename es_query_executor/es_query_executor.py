@@ -11,7 +11,8 @@ from elasticsearch import Elasticsearch
 # Set up command-line arguments
 parser = argparse.ArgumentParser()
 parser.add_argument("--host", help="Elasticsearch host and port", required=True)
-parser.add_argument("--query_file", help="Path to the JSON file containing the Elasticsearch query", required=True)
+parser.add_argument("--query_file", nargs="+", help="Path to one or more JSON files containing Elasticsearch queries. "
+                    "All queries run in order over a single client connection", required=True)
 parser.add_argument("--log_file", help="Path to the logging file this script writes to", required=True)
 parser.add_argument("--action", help="Action to invoke for query, i.e. 'search' or 'delete'", required=True)
 args = parser.parse_args()
@@ -29,47 +30,55 @@ logger = logging.getLogger()
 logger.addHandler(logging_handler)
 logger.setLevel(logging_level)
 
-# Connect to Elasticsearch
+# Connect to Elasticsearch once; the client's connection pool is reused for every query file
 es = Elasticsearch([args.host])
 
-# Extract the index name out of the query file folder structure
-query_file_path_components = os.path.normpath(args.query_file).split(os.sep)
-query_file_path_folders = [component for component in query_file_path_components if component]
-if (len(query_file_path_folders) >= 3):
-    index_name = query_file_path_folders[-2] # always at index position two given expected folder structure
-else:
-    error_msg = "Invalid --query_file value [" + args.query_file + "]. Must follow expected folder structure: `queries/[index_name]/*.json`"
-    print(error_msg)
-    logging.critical(error_msg)
-    sys.exit(1)
 
-# Load the query from the JSON file
-with open(args.query_file, "r") as f:
-    query = json.load(f)
-
-# Execute the query on Elasticsearch with specified index per action requested
-logging.info("Executing [" + args.action + "] with query file [" + args.query_file + "]")
-if (args.action == "count"):
-    res = es.count(index=index_name, body=query)
-
-    # Log the detailed results
-    logging.debug(res)
-
-    # Log and print the confirmation info
-    confirm_message = "Found documents: " + str(res['count']) + " using query file [" + args.query_file + "]"
-    print(confirm_message)
-    logging.info(confirm_message)
-elif (args.action == "delete"):
-    res = es.delete_by_query(index=index_name, body=query)
-
-    # Log the detailed results
-    logging.debug(res)
-
-    # Log and print the confirmation info
-    confirm_message = "Affected documents: " + str(res['deleted']) + " using query file [" + args.query_file + "]"
-    print(confirm_message)
-    logging.info(confirm_message)
-else:
+def get_index_name(query_file):
+    # Extract the index name out of the query file folder structure
+    query_file_path_components = os.path.normpath(query_file).split(os.sep)
+    query_file_path_folders = [component for component in query_file_path_components if component]
+    if (len(query_file_path_folders) >= 3):
+        return query_file_path_folders[-2] # always at index position two given expected folder structure
+    else:
+        error_msg = "Invalid --query_file value [" + query_file + "]. Must follow expected folder structure: `queries/[index_name]/*.json`"
+        print(error_msg)
+        logging.critical(error_msg)
+        sys.exit(1)
+
+
+if args.action not in ("count", "delete"):
     print("Invalid --action value [" + args.action + "]. Choose from 'count' or 'delete'")
     logging.critical("Invalid --action value [" + args.action + "]. Choose from 'count' or 'delete'")
     sys.exit(1)
+
+# Validate every query file before running any of them, so a bad path can't leave a batch half-executed
+index_names = [get_index_name(query_file) for query_file in args.query_file]
+
+for query_file, index_name in zip(args.query_file, index_names):
+    # Load the query from the JSON file
+    with open(query_file, "r") as f:
+        query = json.load(f)
+
+    # Execute the query on Elasticsearch with specified index per action requested
+    logging.info("Executing [" + args.action + "] with query file [" + query_file + "]")
+    if (args.action == "count"):
+        res = es.count(index=index_name, body=query)
+
+        # Log the detailed results
+        logging.debug(res)
+
+        # Log and print the confirmation info
+        confirm_message = "Found documents: " + str(res['count']) + " using query file [" + query_file + "]"
+        print(confirm_message)
+        logging.info(confirm_message)
+    elif (args.action == "delete"):
+        res = es.delete_by_query(index=index_name, body=query)
+
+        # Log the detailed results
+        logging.debug(res)
+
+        # Log and print the confirmation info
+        confirm_message = "Affected documents: " + str(res['deleted']) + " using query file [" + query_file + "]"
+        print(confirm_message)
+        logging.info(confirm_message)
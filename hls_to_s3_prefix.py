@@ -1,14 +1,16 @@
 import datetime as dt
 import boto3
 import argparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 
 RS_BUCKET = 'opera-pst-rs-pop1'
 
 
-def format_prefix(hls_id):
+def _parse_hls_id(hls_id):
     '''
-    convert hls file prefix to DSWx prefix
+    extract tile, acquisition date and time of day from an hls file prefix
     '''
 
     tile = hls_id[8:14]
@@ -18,30 +20,101 @@ def format_prefix(hls_id):
 
     # convert doy to date/month
     date = dt.datetime(int(year), 1, 1) + dt.timedelta(int(doy)-1)
-    date_str = date.strftime('%Y%m%d') + time_of_day
-    
+
+    return tile, date.strftime('%Y%m%d'), time_of_day
+
+
+def format_prefix(hls_id):
+    '''
+    convert hls file prefix to DSWx prefix
+    '''
+
+    tile, date_str, time_of_day = _parse_hls_id(hls_id)
+
     # filename subject to change during cal/val
-    return f'products/OPERA_L3_DSWx-HLS_{tile}_{date_str}Z_'   
+    return f'products/OPERA_L3_DSWx-HLS_{tile}_{date_str}{time_of_day}Z_'
+
+
+def format_parent_prefix(hls_id):
+    '''
+    convert hls file prefix to the DSWx prefix shared by all products of its tile and date
+    '''
+
+    tile, date_str, _ = _parse_hls_id(hls_id)
+    return f'products/OPERA_L3_DSWx-HLS_{tile}_{date_str}'
+
+
+def _list_products(client, bucket, parent_prefix):
+    '''
+    list product directories under a parent prefix, without listing the files inside them
+    '''
+
+    products = []
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=parent_prefix, Delimiter='/'):
+        for common_prefix in page.get('CommonPrefixes', []):
+            products.append(common_prefix['Prefix'].split('/')[1])
+    return products
+
+
+def resolve_products(bucket, hls_ids):
+    '''
+    resolve hls file prefixes to DSWx products with one full listing of each granule's product prefix
+    '''
+
+    prods = set()
+    for hls in hls_ids:
+        prefix = format_prefix(hls)
+
+        for obj in bucket.objects.filter(Prefix=prefix):
+            prod = obj.key.split('/')[1] # just want prefix, not individual files
+            prods.add(prod)
+
+    return prods
+
+
+def resolve_products_bulk(client, hls_ids, bucket=RS_BUCKET, workers=16):
+    '''
+    resolve hls file prefixes to DSWx products with one delimited LIST per tile and date, run on a thread pool,
+    matching products to the requested prefixes locally
+    '''
+
+    prefixes_by_parent = defaultdict(set)
+    for hls_id in hls_ids:
+        prefixes_by_parent[format_parent_prefix(hls_id)].add(format_prefix(hls_id).split('/')[1])
+
+    prods = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        parents = list(prefixes_by_parent)
+        for parent, products in zip(parents, executor.map(lambda p: _list_products(client, bucket, p), parents)):
+            for prod in products:
+                if any(prod.startswith(prefix) for prefix in prefixes_by_parent[parent]):
+                    prods.add(prod)
+
+    return prods
 
 
 if __name__ == '__main__':
 
     parser = argparse.ArgumentParser(description='convert HLS granules to s3 DSWx prefixes')
     parser.add_argument('file')
+    parser.add_argument('--bulk', action='store_true',
+                        help='list each tile/date prefix once, in parallel, instead of one full listing per granule')
+    parser.add_argument('--workers', type=int, default=16, help='number of concurrent LIST requests in bulk mode')
+    parser.add_argument('--bucket', default=RS_BUCKET)
+    parser.add_argument('--endpoint-url', default=None,
+                        help='alternate S3 endpoint, e.g. a local MinIO or moto server for testing')
     args = parser.parse_args()
 
-    s3 = boto3.resource('s3')
-    bucket = s3.Bucket(RS_BUCKET)
-    
     with open(args.file, 'r') as f:
-        
-        prods = set()
-        for hls in f:
-            prefix = format_prefix(hls)
+        hls_ids = [line for line in f if line.strip()]
 
-            for obj in bucket.objects.filter(Prefix=prefix):
-                prod = obj.key.split('/')[1] # just want prefix, not individual files
-                prods.add(prod)
+    if args.bulk:
+        client = boto3.client('s3', endpoint_url=args.endpoint_url)
+        prods = sorted(resolve_products_bulk(client, hls_ids, args.bucket, args.workers))
+    else:
+        s3 = boto3.resource('s3', endpoint_url=args.endpoint_url)
+        prods = resolve_products(s3.Bucket(args.bucket), hls_ids)
 
     for prod in prods:
-        print(f's3://{RS_BUCKET}/products/{prod}/')
+        print(f's3://{args.bucket}/products/{prod}/')
@@ -1,13 +1,21 @@
-import requests
-import mgrs
+import argparse
 import csv
 import json
-from shapely.geometry import box, mapping
-from pyproj import Transformer
+import os
+import re
+from collections import defaultdict
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cache
+
+import backoff
 import folium
+import mgrs
+import requests
 from folium.plugins import MarkerCluster
-import re
+from pyproj import Transformer
+from requests.adapters import HTTPAdapter
+from shapely.geometry import box, mapping
 
 # === INPUT PARAMETERS ===
 # Define a dictionary of MGRS tiles over the U.S. with descriptions
@@ -35,14 +43,8 @@ import re
 #     "44QKK": "44QKK", "49UCQ": "49UCQ", "56MPV": "56MPV", "13UDV": "13UDV", "56HLH": "56HLH"
 # }
 
-# or read the list from a CSV file
-mgrs_tiles = {}
-with open('mgrs_from_umd_20260625.txt', 'r') as f:
-    for line in f:
-        tile = line.strip()
-        if tile:
-            mgrs_tiles[tile] = tile
-print(mgrs_tiles)
+# or read the list from a text file, one tile per line
+mgrs_tiles_file = "mgrs_from_umd_20260625.txt"
 
 product_type = "SLC"
 csv_output = "s1_slc_results.csv"
@@ -51,6 +53,9 @@ geojson_output = "s1_slc_results.geojson"
 map_output = "s1_slc_map.html"
 no_safe_output = "mgrs_with_no_safe_coverage.txt"
 
+# Cached tile -> (lon_min, lat_min, lon_max, lat_max) lookup so reruns skip projection
+bounds_lookup = "mgrs_tile_bounds.json"
+
 # Use these settings for Sentinel-1A/B
 start_date = "2021-01-01"
 end_date = "2021-12-31"
@@ -61,6 +66,26 @@ platforms = ["Sentinel-1A", "Sentinel-1B"]
 # end_date = "2021-12-01"
 # platforms = ["Sentinel-1C"]
 
+ASF_SEARCH_URL = "https://api.daac.asf.alaska.edu/services/search/param"
+
+# Number of tiles searched concurrently. ASF throttles aggressive clients, so keep this modest
+max_workers = 8
+
+RECORD_FIELDS = [
+    "mgrs_tile", "description", "platform", "file_id", "start_time", "stop_time", "absolute_orbit", "path_number",
+    "frame_number", "beam_mode", "polarization", "flight_direction", "look_direction", "burst_count", "download_url"
+]
+
+
+def read_mgrs_tiles(path):
+    mgrs_tiles = {}
+    with open(path, "r") as f:
+        for line in f:
+            tile = line.strip()
+            if tile:
+                mgrs_tiles[tile] = tile
+    return mgrs_tiles
+
 
 def flatten(items):
     for x in items:
@@ -69,39 +94,116 @@ def flatten(items):
         else:
             yield x
 
-def get_mgrs_tile_bounds(tile):
-    m = mgrs.MGRS()
-    if len(tile) != 5:
-        raise ValueError(f"MGRS tile ID '{tile}' must be exactly 5 characters")
-    try:
-        lat, lon = m.toLatLon(tile + "55")
-    except Exception as e:
-        raise ValueError(f"Invalid MGRS tile '{tile}': {e}")
-
+def _tile_epsg(tile):
     zone_number = int(tile[:2])
     hemisphere = "north" if tile[2] >= "N" else "south"
-    epsg = 32600 + zone_number if hemisphere == "north" else 32700 + zone_number
+    return 32600 + zone_number if hemisphere == "north" else 32700 + zone_number
+
 
+@cache
+def _utm_transformers(epsg):
+    """Transformer construction dominates per-tile cost, so build each UTM zone's pair only once"""
     transformer_to_utm = Transformer.from_crs("EPSG:4326", f"EPSG:{epsg}", always_xy=True)
     transformer_to_latlon = Transformer.from_crs(f"EPSG:{epsg}", "EPSG:4326", always_xy=True)
+    return transformer_to_utm, transformer_to_latlon
+
 
-    x_center, y_center = transformer_to_utm.transform(lon, lat)
+def compute_mgrs_tile_bounds(tiles):
+    """Computes lon/lat bounds of the 100 km box around each tile's center, one batched transform per UTM zone.
+
+    :return: dict of tile -> (lon_min, lat_min, lon_max, lat_max), and dict of invalid tile -> error message
+    """
+    m = mgrs.MGRS()
     half = 50000
-    x_min, x_max = x_center - half, x_center + half
-    y_min, y_max = y_center - half, y_center + half
+    zone_tiles = defaultdict(list)
+    bounds = {}
+    errors = {}
+
+    for tile in tiles:
+        if len(tile) != 5:
+            errors[tile] = f"MGRS tile ID '{tile}' must be exactly 5 characters"
+            continue
+        try:
+            lat, lon = m.toLatLon(tile + "55")
+        except Exception as e:
+            errors[tile] = f"Invalid MGRS tile '{tile}': {e}"
+            continue
+        zone_tiles[_tile_epsg(tile)].append((tile, lon, lat))
+
+    for epsg, entries in zone_tiles.items():
+        transformer_to_utm, transformer_to_latlon = _utm_transformers(epsg)
+
+        x_centers, y_centers = transformer_to_utm.transform([e[1] for e in entries], [e[2] for e in entries])
+
+        # Lower-left corners followed by upper-right corners, so both go back in one call
+        xs = [x - half for x in x_centers] + [x + half for x in x_centers]
+        ys = [y - half for y in y_centers] + [y + half for y in y_centers]
+        lons, lats = transformer_to_latlon.transform(xs, ys)
+
+        n = len(entries)
+        for i, (tile, _, _) in enumerate(entries):
+            bounds[tile] = (lons[i], lats[i], lons[n + i], lats[n + i])
+
+    return bounds, errors
 
-    lon_min, lat_min = transformer_to_latlon.transform(x_min, y_min)
-    lon_max, lat_max = transformer_to_latlon.transform(x_max, y_max)
 
-    return (lon_min, lat_min, lon_max, lat_max)
+def load_mgrs_tile_bounds(tiles, lookup_path=bounds_lookup):
+    """Returns bounds for the given tiles, reusing the tile -> bbox lookup file and only projecting tiles not in it"""
+    lookup = {}
+    if lookup_path and os.path.exists(lookup_path):
+        with open(lookup_path) as f:
+            lookup = {tile: tuple(bbox) for tile, bbox in json.load(f).items()}
+
+    missing = [tile for tile in tiles if tile not in lookup]
+    computed, errors = compute_mgrs_tile_bounds(missing)
+
+    lookup.update(computed)
+
+    if computed and lookup_path:
+        with open(lookup_path, "w") as f:
+            json.dump(lookup, f, indent=2, sort_keys=True)
+        print(f"📁 Saved bounds for {len(computed)} new tiles to {lookup_path}")
+
+    return {tile: lookup[tile] for tile in tiles if tile in lookup}, errors
+
+
+def get_mgrs_tile_bounds(tile):
+    bounds, errors = compute_mgrs_tile_bounds([tile])
+    if tile in errors:
+        raise ValueError(errors[tile])
+    return bounds[tile]
 
 
 # regular expression to filter out any SAFE file that is not "_IW_"
 # S1B_IW_SLC__1SDV_20210325T190648_20210325T190715_026175_031FB3_744C.zip
 PATTERN = re.compile(r'^S1[ABC]_IW_SLC__\d{1}[A-Z]{3}_\d{8}T\d{6}_\d{8}T\d{6}_\d{6}_[A-Z0-9]{6}_[A-Z0-9]{4}$')
 
-def search_asf_s1_slc(minx, miny, maxx, maxy, start_date, end_date, platform):
-    url = "https://api.daac.asf.alaska.edu/services/search/param"
+
+def _fatal_code(err: Exception) -> bool:
+    if isinstance(err, requests.exceptions.RequestException) and err.response is not None:
+        return err.response.status_code not in [408, 429, 500, 502, 503, 504]
+    return False
+
+
+def _backoff_logger(details):
+    print(f"   ⏳ Backing off {details['wait']:0.1f} seconds after {details['tries']} tries")
+
+
+def asf_session(pool_size=max_workers):
+    """Creates a session whose connection pool is shared by all search workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    return session
+
+
+@backoff.on_exception(backoff.expo,
+                      requests.exceptions.RequestException,
+                      max_tries=6,
+                      giveup=_fatal_code,
+                      on_backoff=_backoff_logger,
+                      factor=2)
+def search_asf_s1_slc(minx, miny, maxx, maxy, start_date, end_date, platform, session=None):
     params = {
         "platform": platform,
         "processingLevel": product_type,
@@ -110,150 +212,305 @@ def search_asf_s1_slc(minx, miny, maxx, maxy, start_date, end_date, platform):
         "intersectsWith": f"POLYGON(({minx} {miny}, {maxx} {miny}, {maxx} {maxy}, {minx} {maxy}, {minx} {miny}))",
         "output": "json"
     }
-    for attempt in range(3):
+    response = (session or requests).get(ASF_SEARCH_URL, params=params, timeout=300)
+    response.raise_for_status()
+    return response.json()
+
+
+def _to_record(item, tile, description, platform):
+    return {
+        "mgrs_tile": tile,
+        "description": description,
+        "platform": platform,
+        "file_id": item.get("fileID"),
+        "start_time": item.get("startTime"),
+        "stop_time": item.get("stopTime"),
+        "absolute_orbit": item.get("absoluteOrbit"),
+        "path_number": item.get("pathNumber"),
+        "frame_number": item.get("frameNumber"),
+        "beam_mode": item.get("beamMode"),
+        "polarization": item.get("polarization"),
+        "flight_direction": item.get("flightDirection"),
+        "look_direction": item.get("lookDirection"),
+        "burst_count": item.get("burstCount"),
+        "download_url": item.get("downloadUrl")
+    }
+
+
+def _search_tile(tile, description, bounds, start_date, end_date, platforms, session):
+    """Searches all platforms for one tile, returning its records and per-platform log lines"""
+    minx, miny, maxx, maxy = bounds
+    records = []
+    messages = []
+
+    for platform in platforms:
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            results = search_asf_s1_slc(minx, miny, maxx, maxy, start_date, end_date, platform, session=session)
+            platform_records = [
+                _to_record(item, tile, description, platform) for item in flatten(results) if isinstance(item, dict)
+            ]
+            if platform_records:
+                messages.append(f"   ✅ {len(platform_records)} results from {platform}")
+            else:
+                messages.append(f"   ⚠️ No usable results from {platform}")
+            records.extend(platform_records)
         except Exception as e:
-            print(f"Attempt {attempt + 1} failed: {e}")
-            if attempt == 2:
-                print("All attempts failed.")
-                raise e
+            messages.append(f"   ❌ Error querying {platform}: {e}")
+
+    return records, messages
+
+
+class _StreamingWriter:
+    """Writes the CSV, granule ID and GeoJSON outputs incrementally as tile results arrive"""
+
+    def __init__(self, csv_path, ids_path, geojson_path):
+        self._csv_file = open(csv_path, "w", newline="")
+        self._csv = csv.DictWriter(self._csv_file, fieldnames=RECORD_FIELDS)
+        self._csv.writeheader()
+        self._ids_file = open(ids_path, "w", newline="\n")
+        self._geojson_file = open(geojson_path, "w")
+        self._geojson_file.write('{"type": "FeatureCollection", "features": [\n')
+        self._first_feature = True
+
+    def write(self, record, feature):
+        self._csv.writerow(record)
+
+        filename = (record["download_url"] or "").split("/")[-1].replace(".zip", "")
+        if PATTERN.match(filename):
+            self._ids_file.write(f"{filename}\n")
+
+        if not self._first_feature:
+            self._geojson_file.write(",\n")
+        self._geojson_file.write(json.dumps(feature))
+        self._first_feature = False
+
+    def flush(self):
+        for f in (self._csv_file, self._ids_file, self._geojson_file):
+            f.flush()
+
+    def close(self):
+        self._geojson_file.write("\n]}\n")
+        for f in (self._csv_file, self._ids_file, self._geojson_file):
+            f.close()
+
 
+def search_mgrs_tiles(mgrs_tiles, start_date, end_date, platforms, csv_output=csv_output, ids_output=csv_output_2,
+                      geojson_output=geojson_output, no_safe_output=no_safe_output, workers=max_workers,
+                      bounds_lookup=bounds_lookup):
+    """Searches ASF for SAFE files over every MGRS tile, streaming results to disk as each tile finishes.
 
-all_results = []
-features = []
-no_safe = []
+    Tiles are searched concurrently on a bounded thread pool sharing one pooled HTTP session.
+
+    :param mgrs_tiles: dict of MGRS tile ID -> description
+    :return: list of GeoJSON features for all results, and list of tiles with no results from any platform
+    """
+    features = []
+    no_safe = []
+
+    tile_bounds, errors = load_mgrs_tile_bounds(list(mgrs_tiles), bounds_lookup)
+    for tile, error in errors.items():
+        print(f"❌ Error processing tile {tile}: {error}")
+
+    writer = _StreamingWriter(csv_output, ids_output, geojson_output)
 
-for tile, description in mgrs_tiles.items():
-    print(f"\n🔍 Searching MGRS tile: {tile} — {description}")
     try:
-        minx, miny, maxx, maxy = get_mgrs_tile_bounds(tile)
-        safe_found = False
-        for platform in platforms:
-            print(f"   → Searching {platform}")
-            try:
-                results = search_asf_s1_slc(minx, miny, maxx, maxy, start_date, end_date, platform)
-                flat_results = list(flatten(results))
-                count = 0
-                for item in flat_results:
-                    if isinstance(item, dict):
-                        record = {
-                            "mgrs_tile": tile,
-                            "description": description,
-                            "platform": platform,
-                            "file_id": item.get("fileID"),
-                            "start_time": item.get("startTime"),
-                            "stop_time": item.get("stopTime"),
-                            "absolute_orbit": item.get("absoluteOrbit"),
-                            "path_number": item.get("pathNumber"),
-                            "frame_number": item.get("frameNumber"),
-                            "beam_mode": item.get("beamMode"),
-                            "polarization": item.get("polarization"),
-                            "flight_direction": item.get("flightDirection"),
-                            "look_direction": item.get("lookDirection"),
-                            "burst_count": item.get("burstCount"),
-                            "download_url": item.get("downloadUrl")
-                        }
-                        all_results.append(record)
-                        geometry = box(minx, miny, maxx, maxy)
-                        features.append({
-                            "type": "Feature",
-                            "geometry": mapping(geometry),
-                            "properties": record
-                        })
-                        count += 1
-                if count > 0:
-                    print(f"   ✅ {count} results from {platform}")
-                    safe_found = True
-                else:
-                    print(f"   ⚠️ No usable results from {platform}")
-            except Exception as e:
-                print(f"   ❌ Error querying {platform}: {e}")
-            # record tiles for which no platform yield results
-            if not safe_found:
-                no_safe.append(tile)
-    except Exception as e:
-        print(f"❌ Error processing tile {tile}: {e}")
-
-# === Output CSV ===
-if all_results:
-    keys = all_results[0].keys()
-    with open(csv_output, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        writer.writerows(all_results)
+        with asf_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    _search_tile, tile, description, tile_bounds[tile], start_date, end_date, platforms, session
+                ): tile
+                for tile, description in mgrs_tiles.items() if tile in tile_bounds
+            }
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                tile = futures[future]
+                print(f"\n🔍 [{done}/{len(futures)}] MGRS tile: {tile} — {mgrs_tiles[tile]}")
+
+                try:
+                    records, messages = future.result()
+                except Exception as e:
+                    print(f"❌ Error processing tile {tile}: {e}")
+                    continue
+
+                print("\n".join(messages))
+
+                # record tiles for which no platform yield results
+                if not records:
+                    no_safe.append(tile)
+                    continue
+
+                geometry = mapping(box(*tile_bounds[tile]))
+
+                for record in records:
+                    feature = {
+                        "type": "Feature",
+                        "geometry": geometry,
+                        "properties": record
+                    }
+                    writer.write(record, feature)
+                    features.append(feature)
+                writer.flush()
+    finally:
+        writer.close()
+
     print(f"\n📁 CSV saved: {csv_output}")
+    print(f"\n📁 CSV saved: {ids_output}")
+    print(f"🗺️  GeoJSON saved: {geojson_output}")
+
+    # Write out list of MGRS tiles with no SAFE file acquired over it
+    if no_safe:
+        with open(no_safe_output, "w", newline="") as f:
+            for mgrs_tile in no_safe:
+                f.write(mgrs_tile+"\n")
+        print(f"\n📁 List of MGRS tiles with no SAFE tile completed: {no_safe_output}")
 
-    # write out granule id only
-    with open(csv_output_2, "w", newline="\n") as f:
-        for result in all_results:
-            filename = result['download_url'].split("/")[-1].replace(".zip", "")
-            if PATTERN.match(filename):
-                f.write(f"{filename}\n")
-    print(f"\n📁 CSV saved: {csv_output_2}")
-
-else:
-    print("\n⚠️ No results to write to CSV.")
-
-# Write out list of MGRS tiles with no SAFE file acquired over it in 2021
-if no_safe:
-    with open(no_safe_output, "w", newline="") as f:
-        for mgrs_tile in no_safe:
-            f.write(mgrs_tile+"\n")
-    print(f"\n📁 List of MGRS tiles with no SAFE tile completed: {no_safe_output}")
-
-# === Output GeoJSON ===
-if features:
-    geojson = {
+    return features, no_safe
+
+
+def render_map(features, map_output=map_output):
+    print("\n🌍 Generating interactive map...")
+
+    m = folium.Map(location=[0, 0], zoom_start=2, tiles="CartoDB positron")
+    marker_cluster = MarkerCluster().add_to(m)
+
+    for feature in features:
+        props = feature["properties"]
+        geom = feature["geometry"]
+        coords = geom["coordinates"][0]
+        center_lat = sum([pt[1] for pt in coords]) / len(coords)
+        center_lon = sum([pt[0] for pt in coords]) / len(coords)
+
+        # Polygon
+        folium.GeoJson(
+            data=feature,
+            style_function=lambda x: {
+                "fillColor": "#3186cc",
+                "color": "#3186cc",
+                "weight": 1,
+                "fillOpacity": 0.3,
+            },
+            tooltip=props["file_id"]
+        ).add_to(m)
+
+        # Marker
+        folium.Marker(
+            location=[center_lat, center_lon],
+            popup=folium.Popup(
+                f"<b>{props['file_id']}</b><br>"
+                f"Platform: {props['platform']}<br>"
+                f"Tile: {props['mgrs_tile']}<br>"
+                f"Orbit: {props['absolute_orbit']}<br>"
+                f"Date: {props['start_time'][:10]}",
+                max_width=250
+            ),
+            icon=folium.Icon(color="blue", icon="info-sign")
+        ).add_to(marker_cluster)
+
+    m.save(map_output)
+    print(f"✅ Interactive map saved: {map_output}")
+
+
+def summarize_tiles(features):
+    """Dissolves per-SAFE features into one feature per MGRS tile box, with aggregated SAFE counts"""
+    tiles = {}
+
+    for feature in features:
+        props = feature["properties"]
+        tile = props["mgrs_tile"]
+
+        if tile not in tiles:
+            tiles[tile] = {
+                "geometry": feature["geometry"],
+                "platforms": defaultdict(int),
+                "orbits": set(),
+                "dates": [],
+            }
+
+        summary = tiles[tile]
+        summary["platforms"][props["platform"]] += 1
+        summary["orbits"].add(props["absolute_orbit"])
+        if props["start_time"]:
+            summary["dates"].append(props["start_time"][:10])
+
+    return {
         "type": "FeatureCollection",
-        "features": features
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": summary["geometry"],
+                "properties": {
+                    "mgrs_tile": tile,
+                    "safe_count": sum(summary["platforms"].values()),
+                    "platforms": ", ".join(f"{p}: {n}" for p, n in sorted(summary["platforms"].items())),
+                    "orbit_count": len(summary["orbits"]),
+                    "first_date": min(summary["dates"], default=""),
+                    "last_date": max(summary["dates"], default=""),
+                }
+            } for tile, summary in tiles.items()
+        ]
     }
-    with open(geojson_output, "w") as f:
-        json.dump(geojson, f, indent=2)
-    print(f"🗺️  GeoJSON saved: {geojson_output}")
-else:
-    print("⚠️ No features to write to GeoJSON.")
 
-# === Folium Map Visualization ===
-print("\n🌍 Generating interactive map...")
 
-m = folium.Map(location=[0, 0], zoom_start=2, tiles="CartoDB positron")
-marker_cluster = MarkerCluster().add_to(m)
+def render_summary_map(features, map_output=map_output):
+    """Renders one layer with a feature per tile, so map size scales with tiles rather than SAFE results"""
+    print("\n🌍 Generating interactive tile summary map...")
+
+    collection = summarize_tiles(features)
+
+    m = folium.Map(location=[0, 0], zoom_start=2, tiles="CartoDB positron")
 
-for feature in features:
-    props = feature["properties"]
-    geom = feature["geometry"]
-    coords = geom["coordinates"][0]
-    center_lat = sum([pt[1] for pt in coords]) / len(coords)
-    center_lon = sum([pt[0] for pt in coords]) / len(coords)
+    fields = ["mgrs_tile", "safe_count", "platforms", "orbit_count", "first_date", "last_date"]
+    aliases = ["Tile", "SAFE files", "Platforms", "Orbits", "First", "Last"]
 
-    # Polygon
     folium.GeoJson(
-        data=feature,
+        data=collection,
         style_function=lambda x: {
             "fillColor": "#3186cc",
             "color": "#3186cc",
             "weight": 1,
             "fillOpacity": 0.3,
         },
-        tooltip=props["file_id"]
+        tooltip=folium.GeoJsonTooltip(fields=["mgrs_tile", "safe_count"], aliases=["Tile", "SAFE files"]),
+        popup=folium.GeoJsonPopup(fields=fields, aliases=aliases, max_width=300)
     ).add_to(m)
 
-    # Marker
-    folium.Marker(
-        location=[center_lat, center_lon],
-        popup=folium.Popup(
-            f"<b>{props['file_id']}</b><br>"
-            f"Platform: {props['platform']}<br>"
-            f"Tile: {props['mgrs_tile']}<br>"
-            f"Orbit: {props['absolute_orbit']}<br>"
-            f"Date: {props['start_time'][:10]}",
-            max_width=250
-        ),
-        icon=folium.Icon(color="blue", icon="info-sign")
-    ).add_to(marker_cluster)
-
-m.save(map_output)
-print(f"✅ Interactive map saved: {map_output}")
+    m.save(map_output)
+    print(f"✅ Interactive map of {len(collection['features'])} tiles saved: {map_output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find Sentinel-1 SAFE files in the ASF archive covering MGRS tiles")
+    parser.add_argument("--tiles-file", default=mgrs_tiles_file, help="Text file with one MGRS tile ID per line")
+    parser.add_argument("--start", default=start_date, help="Search start date (YYYY-MM-DD)")
+    parser.add_argument("--end", default=end_date, help="Search end date (YYYY-MM-DD)")
+    parser.add_argument("--platforms", nargs="+", default=platforms, help="ASF platforms to search")
+    parser.add_argument("--workers", type=int, default=max_workers, help="Number of tiles to search concurrently")
+    parser.add_argument("--bounds-lookup", default=bounds_lookup,
+                        help="JSON file caching MGRS tile bounds between runs")
+    parser.add_argument("--map-mode", choices=["summary", "detailed"], default="summary",
+                        help="summary: one box per tile with aggregated SAFE counts; "
+                             "detailed: one box and marker per SAFE result (slow for large result sets)")
+    parser.add_argument("--no-map", action="store_true", help="Skip generating the interactive map")
+    args = parser.parse_args()
+
+    mgrs_tiles = read_mgrs_tiles(args.tiles_file)
+    print(f"Loaded {len(mgrs_tiles)} MGRS tiles from {args.tiles_file}")
+
+    features, _ = search_mgrs_tiles(mgrs_tiles, args.start, args.end, args.platforms, workers=args.workers,
+                                    bounds_lookup=args.bounds_lookup)
+
+    if not features:
+        print("\n⚠️ No results found.")
+        return
+
+    if args.no_map:
+        return
+
+    if args.map_mode == "summary":
+        render_summary_map(features)
+    else:
+        render_map(features)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Local SQLite store of Sentinel-1 burst footprints, built once from the OPERA burst_db geometry release.
+
+Looking bursts up in the GeoJSON with GeoPandas means downloading and parsing ~1.5M geometries on every start and a
+full scan per lookup. The store keeps each burst's bounding box keyed by its JPL burst ID (e.g. t174_372072_iw1), plus
+an R-tree over the same boxes for spatial queries.
+
+Build it ahead of time with:
+- python burst_geometry_store.py
+"""
+import os
+import sqlite3
+
+burst_geometry_file = "https://github.com/opera-adt/burst_db/releases/download/v0.9.0/burst-id-geometries-simple-0.9.0.geojson.zip"
+burst_db_file = "burst_geometries_0.9.0.sqlite"
+
+
+def to_jpl_burst_id(burst_id):
+    # "T174-372072-IW1" --> "t174_372072_iw1"
+    return burst_id.lower().replace('-', '_')
+
+
+def build_burst_db(db_path=burst_db_file, source=burst_geometry_file):
+    """Reads the burst geometry file and writes the bounding box of every burst to a new SQLite store"""
+    import geopandas as gpd
+
+    print(f"Reading burst geometry file: {source}")
+    burst_grid = gpd.read_file(source, columns=["burst_id_jpl"])
+    bounds = burst_grid.geometry.bounds
+
+    rows = zip(
+        range(1, len(burst_grid) + 1),
+        burst_grid["burst_id_jpl"],
+        bounds["minx"], bounds["miny"], bounds["maxx"], bounds["maxy"],
+    )
+
+    # Build under a temporary name so an interrupted build is never mistaken for a complete store
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    with conn:
+        conn.execute("""
+            CREATE TABLE bursts (
+                id INTEGER PRIMARY KEY,
+                burst_id_jpl TEXT NOT NULL UNIQUE,
+                minx REAL, miny REAL, maxx REAL, maxy REAL
+            )
+        """)
+        conn.execute("CREATE VIRTUAL TABLE bursts_rtree USING rtree(id, minx, maxx, miny, maxy)")
+        conn.executemany("INSERT INTO bursts VALUES (?, ?, ?, ?, ?, ?)", rows)
+        conn.execute("INSERT INTO bursts_rtree SELECT id, minx, maxx, miny, maxy FROM bursts")
+    conn.close()
+
+    os.replace(tmp_path, db_path)
+    print(f"Wrote {len(burst_grid)} burst footprints to {db_path}")
+
+
+def open_burst_db(db_path=burst_db_file, source=burst_geometry_file):
+    """Opens the burst store, building it first if it does not exist yet"""
+    if not os.path.exists(db_path):
+        build_burst_db(db_path, source)
+    return sqlite3.connect(db_path, check_same_thread=False)
+
+
+def get_burst_bounds(conn, burst_id):
+    """Returns (minx, miny, maxx, maxy) for a burst ID in either OPERA or JPL form, or None if unknown"""
+    row = conn.execute(
+        "SELECT minx, miny, maxx, maxy FROM bursts WHERE burst_id_jpl = ?", (to_jpl_burst_id(burst_id),)
+    ).fetchone()
+    return tuple(row) if row else None
+
+
+def find_bursts_in_bbox(conn, minx, miny, maxx, maxy):
+    """Returns the JPL burst IDs whose bounding boxes intersect the given box"""
+    rows = conn.execute("""
+        SELECT b.burst_id_jpl
+        FROM bursts_rtree r JOIN bursts b ON b.id = r.id
+        WHERE r.maxx >= ? AND r.minx <= ? AND r.maxy >= ? AND r.miny <= ?
+    """, (minx, maxx, miny, maxy)).fetchall()
+    return [row[0] for row in rows]
+
+
+if __name__ == "__main__":
+    build_burst_db()
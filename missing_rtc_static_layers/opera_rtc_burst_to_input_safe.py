@@ -1,7 +1,22 @@
 """
 Instructions:
-- Edit the custom parameters section, including start/stop count to break up the number of queries.
-- nohup python -u opera_rtc_burst_to_input_safe.py &
+- nohup python -u opera_rtc_burst_to_input_safe.py --input-file rtc_cslc_missing_static_layers.txt &
+- python unique_safe_ids.py --ledger safe_file_ids.sqlite
+
+Every burst in the input file is searched against ASF on a bounded pool of workers. Each finished burst is recorded in
+a SQLite progress ledger (safe_file_ids.sqlite by default), so if the run is interrupted, rerunning the same command
+only searches the bursts not yet in the ledger. Once all bursts are done, the results are written to
+safe_file_ids.txt in the same format as before, and unique_safe_ids.py can read the SAFE IDs straight from the ledger.
+
+With --cluster, bursts on the same relative orbit and swath with (nearly) consecutive burst numbers are merged into one
+footprint and searched together, and the returned SAFE files are assigned back to each burst by footprint
+intersection. Bursts no returned SAFE file intersects fall back to their own search. For large burst lists this cuts
+the number of ASF requests by roughly the cluster size.
+
+Input files:
+- rtc_bursts_without_static_bursts.txt: Global scope
+- rtc_cslc_missing_static_layers.txt: Missing RTC/CSLC static layers from DISP-S1-STATIC and Tropo System Tests
+- rtc_bursts_without_static_bursts_au.txt: Australia scope
 
 The input files contain the burst ids with missing static products, in the form:
 T174-372337-IW3
@@ -11,102 +26,316 @@ where:
 - 372337: globally unique burst id assigned by ASF
 - IW3: polarization
 
+Burst footprints are looked up in a local SQLite store (see burst_geometry_store.py), which is built from the burst_db
+geometry release on the first run and reused afterwards.
 """
-import requests
+import argparse
 import re
-import geopandas as gpd
+import sqlite3
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import backoff
+import requests
+from requests.adapters import HTTPAdapter
+from shapely import wkt
+from shapely.geometry import box
+
+from burst_geometry_store import open_burst_db, get_burst_bounds
 
 # Parameters
 url = "https://api.daac.asf.alaska.edu/services/search/param"
-burst_geometry_file = "https://github.com/opera-adt/burst_db/releases/download/v0.9.0/burst-id-geometries-simple-0.9.0.geojson.zip"
 start_time = "2017-01-01T00:00:00Z"
 end_time = "2018-01-01T00:00:00Z"
 
-# Global scope
-# input_file = "rtc_bursts_without_static_bursts.txt"
-# start_count = 10001
-# stop_count = 12000
-
-# Missing RTC/CSLC static layers from DISP-S1-STATIC and Tropo System Tests
 input_file = "rtc_cslc_missing_static_layers.txt"
-start_count = 1
-stop_count = 1000
-
-# Australia scope
-# input_file = "rtc_bursts_without_static_bursts_au.txt"
-# start_count = 1
-# stop_count = 4
-
-output_file = f"safe_file_ids_{start_count}_{stop_count}.txt"
-
-# Read the Sentinel-1 geometry file from GitHub
-print(f"Reading burst geometry file: {burst_geometry_file}")
-burst_grid = gpd.read_file(burst_geometry_file)
-# print(burst_grid)
-# print(burst_grid.columns)
-
-# Open output file for writing
-with open(output_file, "w") as fout:
-    fout.write("RTC-S1 Burst ID, SAFE file ID, Absolute Orbit, Relative Orbit, Polygon\n")
-    
-    # --- Load burst IDs from a local file
-    with open(input_file) as f:
+ledger_file = "safe_file_ids.sqlite"
+output_file = "safe_file_ids.txt"
+
+# Number of concurrent ASF searches. ASF throttles aggressive clients, so keep this modest
+max_workers = 8
+
+# Cluster planning: bursts further apart than this along track, or beyond this many per cluster, start a new cluster
+max_cluster_gap = 3
+max_cluster_bursts = 30
+
+BURST_PATTERN = re.compile(r"T(\d{3})-(\d+)-IW(\d)")
+
+
+def _fatal_code(err: Exception) -> bool:
+    if isinstance(err, requests.exceptions.RequestException) and err.response is not None:
+        return err.response.status_code not in [408, 429, 500, 502, 503, 504]
+    return False
+
+
+def _backoff_logger(details):
+    print(f"  ⏳ Backing off {details['wait']:0.1f} seconds after {details['tries']} tries")
+
+
+def asf_session(pool_size=max_workers):
+    """Creates a session whose connection pool is shared by all search workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    return session
+
+
+def to_polygon(minx, miny, maxx, maxy):
+    return f"POLYGON(({minx} {miny}, {maxx} {miny}, {maxx} {maxy}, {minx} {maxy}, {minx} {miny}))"
+
+
+@backoff.on_exception(backoff.expo,
+                      requests.exceptions.RequestException,
+                      max_tries=6,
+                      giveup=_fatal_code,
+                      on_backoff=_backoff_logger,
+                      factor=2)
+def search_asf_slc(session, params):
+    response = session.get(url, params=params, timeout=300)
+    response.raise_for_status()
+    return response.json()[0]
+
+
+def _search_burst(session, burst_id, relative_orbit, polygon, start, end):
+    """Searches ASF for one SAFE file covering the burst, returning ledger rows for the burst"""
+    params = {
+        "platform": "Sentinel-1",
+        "processingLevel": "SLC",
+        "beamMode": "IW",
+        "relativeOrbit": relative_orbit,
+        "start": start,
+        "end": end,
+        "output": "json",
+        "maxResults": 1,
+        "intersectsWith": polygon,
+    }
+
+    granules = search_asf_slc(session, params)
+
+    if not granules:
+        return [(burst_id, None, None, None, polygon)]
+
+    return [
+        (burst_id, granule['product_file_id'], granule['absoluteOrbit'], granule['relativeOrbit'], polygon)
+        for granule in granules
+    ]
+
+
+def plan_clusters(tasks):
+    """Groups bursts by relative orbit and swath into runs of nearby burst numbers.
+
+    :param tasks: list of (burst_id, relative_orbit, bounds)
+    :return: list of (relative_orbit, [(burst_id, bounds), ...])
+    """
+    groups = defaultdict(list)
+    for burst_id, relative_orbit, bounds in tasks:
+        match = BURST_PATTERN.match(burst_id)
+        groups[(relative_orbit, match.group(3))].append((int(match.group(2)), burst_id, bounds))
+
+    clusters = []
+    for (relative_orbit, _), bursts in sorted(groups.items()):
+        current = []
+        minx = maxx = last_number = None
+        for number, burst_id, bounds in sorted(bursts):
+            if current:
+                # Also split clusters that would straddle the antimeridian
+                span = max(maxx, bounds[2]) - min(minx, bounds[0])
+                if number - last_number > max_cluster_gap or len(current) >= max_cluster_bursts or span > 180:
+                    clusters.append((relative_orbit, current))
+                    current = []
+
+            if not current:
+                minx, maxx = bounds[0], bounds[2]
+            minx, maxx = min(minx, bounds[0]), max(maxx, bounds[2])
+            last_number = number
+            current.append((burst_id, bounds))
+
+        clusters.append((relative_orbit, current))
+
+    return clusters
+
+
+def _search_cluster(session, relative_orbit, bursts, start, end):
+    """Searches ASF once over the merged footprint of a cluster, assigning each burst the first returned SAFE file
+    that intersects it. Returns the ledger rows for every burst in the cluster and the number of requests made."""
+    minx = min(bounds[0] for _, bounds in bursts)
+    miny = min(bounds[1] for _, bounds in bursts)
+    maxx = max(bounds[2] for _, bounds in bursts)
+    maxy = max(bounds[3] for _, bounds in bursts)
+
+    params = {
+        "platform": "Sentinel-1",
+        "processingLevel": "SLC",
+        "beamMode": "IW",
+        "relativeOrbit": relative_orbit,
+        "start": start,
+        "end": end,
+        "output": "json",
+        "intersectsWith": to_polygon(minx, miny, maxx, maxy),
+    }
+
+    granules = search_asf_slc(session, params)
+    footprints = [
+        (granule, wkt.loads(granule['stringFootprint'])) for granule in granules if granule.get('stringFootprint')
+    ]
+
+    rows = []
+    requests_made = 1
+
+    for burst_id, bounds in bursts:
+        polygon = to_polygon(*bounds)
+        burst_box = box(*bounds)
+        granule = next((g for g, footprint in footprints if footprint.intersects(burst_box)), None)
+
+        if granule is None:
+            rows.extend(_search_burst(session, burst_id, relative_orbit, polygon, start, end))
+            requests_made += 1
+        else:
+            rows.append(
+                (burst_id, granule['product_file_id'], granule['absoluteOrbit'], granule['relativeOrbit'], polygon)
+            )
+
+    return rows, requests_made
+
+
+def open_ledger(path=ledger_file):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                burst_id TEXT NOT NULL,
+                safe_file_id TEXT,
+                absolute_orbit TEXT,
+                relative_orbit TEXT,
+                polygon TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS results_burst_id ON results (burst_id)")
+    return conn
+
+
+def _record(ledger, rows):
+    # All rows for a burst are committed together so a burst is either fully recorded or retried on the next run
+    with ledger:
+        ledger.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?)", rows)
+
+
+def read_burst_ids(path, start_count=None, stop_count=None):
+    with open(path) as f:
         burst_ids = [line.strip() for line in f if line.strip()]
 
-    # --- Loop over each burst ID and search ASF
-    count = 0
-    for burst_id in burst_ids:
-        count += 1
-        match = re.match(r"T(\d{3})-(\d+)-IW(\d)", burst_id)
+    # Optional 1-based, inclusive subset of the input file
+    first = (start_count or 1) - 1
+    last = stop_count if stop_count else len(burst_ids)
+    return burst_ids[first:last]
+
+
+def run(burst_ids, ledger, burst_db, start=start_time, end=end_time, workers=max_workers, cluster=False):
+    """Searches every burst not yet in the ledger, recording results as each search completes"""
+    done = {row[0] for row in ledger.execute("SELECT DISTINCT burst_id FROM results")}
+    pending = [burst_id for burst_id in dict.fromkeys(burst_ids) if burst_id not in done]
+
+    print(f"{len(burst_ids) - len(pending)} of {len(burst_ids)} bursts already in the ledger, {len(pending)} to search")
+
+    tasks = []
+    for burst_id in pending:
+        match = BURST_PATTERN.match(burst_id)
         if not match:
             print(f"Invalid burst ID format: {burst_id}")
             continue
 
-        if (count >= start_count) and (count <= stop_count):
-
-            relative_orbit = int(match.group(1))
-            swath = f"IW{match.group(3)}"
-
-            # "T174-372072-IW1" --> "t174_372072_iw1"
-            burst_id_converted = burst_id.lower().replace('-', '_')
-            burst_geom = burst_grid[burst_grid['burst_id_jpl'] == burst_id_converted]
-            # print(burst_geom)
-            (minx, miny, maxx, maxy) = burst_geom.geometry.iloc[0].bounds
-            # print(minx, miny, maxx, maxy)
-            polygon = f"POLYGON(({minx} {miny}, {maxx} {miny}, {maxx} {maxy}, {minx} {maxy}, {minx} {miny}))"
-
-            params = {
-                "platform": "Sentinel-1",
-                "processingLevel": "SLC",
-                "beamMode": "IW",
-                "relativeOrbit": relative_orbit,
-                "start": start_time,
-                "end": end_time,
-                "output": "json",
-                "maxResults": 1,
-                "intersectsWith": polygon,
-                # "burst": burst_id,
-                # "absoluteOrbit": "15301",
+        bounds = get_burst_bounds(burst_db, burst_id)
+        if bounds is None:
+            print(f"Burst ID not found in burst geometry store: {burst_id}")
+            continue
+
+        tasks.append((burst_id, int(match.group(1)), bounds))
+
+    failed = 0
+    total_requests = 0
+
+    with asf_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as executor:
+        if cluster:
+            clusters = plan_clusters(tasks)
+            print(f"Planned {len(clusters)} cluster searches for {len(tasks)} bursts")
+            futures = {
+                executor.submit(_search_cluster, session, relative_orbit, bursts, start, end):
+                    [burst_id for burst_id, _ in bursts]
+                for relative_orbit, bursts in clusters
             }
+        else:
+            futures = {
+                executor.submit(_search_burst, session, burst_id, relative_orbit, to_polygon(*bounds), start, end):
+                    [burst_id]
+                for burst_id, relative_orbit, bounds in tasks
+            }
+
+        for count, future in enumerate(as_completed(futures), start=1):
+            label = ", ".join(futures[future]) if len(futures[future]) <= 3 else \
+                f"{futures[future][0]} .. {futures[future][-1]} ({len(futures[future])} bursts)"
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += len(futures[future])
+                print(f"  ❌ [{count}/{len(futures)}] {label}: request failed, will retry on next run: {e}")
+                continue
+
+            rows, requests_made = result if cluster else (result, 1)
+            total_requests += requests_made
+
+            _record(ledger, rows)
+            found = sum(1 for row in rows if row[1] is not None)
+            print(f"🔍 [{count}/{len(futures)}] {label}: {found} result(s)")
+
+    print(f"Made {total_requests} ASF searches for {len(tasks)} bursts")
+
+    return failed
+
+
+def export_results(ledger, burst_ids, path=output_file):
+    """Writes ledger rows for the given bursts, in input order, in the original safe_file_ids CSV format"""
+    rows_by_burst = {}
+    for row in ledger.execute("SELECT * FROM results ORDER BY rowid"):
+        rows_by_burst.setdefault(row[0], []).append(row)
+
+    with open(path, "w") as fout:
+        fout.write("RTC-S1 Burst ID, SAFE file ID, Absolute Orbit, Relative Orbit, Polygon\n")
+        for burst_id in dict.fromkeys(burst_ids):
+            for row in rows_by_burst.get(burst_id, []):
+                fout.write(", ".join(str(value) for value in row) + "\n")
+
+    print(f"Results written to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find input SAFE files for RTC-S1 bursts with missing static layers")
+    parser.add_argument("--input-file", default=input_file, help="File with one burst ID per line")
+    parser.add_argument("--start-time", default=start_time, help="ASF search start time")
+    parser.add_argument("--end-time", default=end_time, help="ASF search end time")
+    parser.add_argument("--ledger", default=ledger_file, help="SQLite progress ledger, used to resume interrupted runs")
+    parser.add_argument("--output-file", default=output_file, help="CSV of results written once all bursts are done")
+    parser.add_argument("--workers", type=int, default=max_workers, help="Number of concurrent ASF searches")
+    parser.add_argument("--cluster", action="store_true",
+                        help="Search clusters of adjacent bursts together instead of one search per burst")
+    parser.add_argument("--start-count", type=int, default=None, help="First line of the input file to process (1-based)")
+    parser.add_argument("--stop-count", type=int, default=None, help="Last line of the input file to process")
+    args = parser.parse_args()
+
+    burst_ids = read_burst_ids(args.input_file, args.start_count, args.stop_count)
+
+    # Open the local burst geometry store, building it from GitHub on first use
+    burst_db = open_burst_db()
+    ledger = open_ledger(args.ledger)
+
+    failed = run(burst_ids, ledger, burst_db, args.start_time, args.end_time, args.workers, args.cluster)
+
+    if failed:
+        print(f"{failed} burst searches failed; rerun the same command to retry them")
+    else:
+        export_results(ledger, burst_ids, args.output_file)
+
+    ledger.close()
+
 
-            print(f"\n🔍 Granule count: {count} Searching for burst ID: {burst_id} (Track {relative_orbit}, Swath {swath})")
-
-            attempts = 0
-            while attempts < 3:
-                try:
-                    response = requests.get(url, params=params)
-                    response.raise_for_status()
-                    granules = response.json()[0]
-                    print(f"Number of results: {len(granules)}")
-                    if not granules:
-                        print("  No results found.")
-                        fout.write(f"{burst_id}, None, None, None, {polygon}\n")
-                    else:
-                        for granule in granules:
-                            fout.write(f"{burst_id}, {granule['product_file_id']}, "
-                                       f"{granule['absoluteOrbit']}, {granule['relativeOrbit']}, {polygon}\n")
-                    # no more attempts for this granule
-                    break
-                except requests.RequestException as e:
-                    attempts += 1
-                    print(f"  ❌ Attempt #: {attempts} Request failed: {e}")
+if __name__ == "__main__":
+    main()
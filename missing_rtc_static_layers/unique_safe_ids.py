@@ -1,22 +1,37 @@
+import argparse
 import glob
 import csv
+import sqlite3
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--ledger', default=None,
+                    help='Read SAFE IDs from the opera_rtc_burst_to_input_safe.py progress ledger '
+                         'instead of merging safe_file_ids*.txt files')
+args = parser.parse_args()
 
 # Set to hold unique second-column values
 unique_ids = set()
 
-# Find all matching files
-for filename in glob.glob('safe_file_ids*.txt'):
-    print(f"Processing {filename}")
-    with open(filename, 'r', newline='') as f:
-        reader = csv.reader(f)
-        next(reader, None)  # Skip the header
-        for row in reader:
-            if len(row) > 1:
-                unique_ids.add(row[1])
+if args.ledger:
+    print(f"Processing {args.ledger}")
+    conn = sqlite3.connect(args.ledger)
+    for row in conn.execute('SELECT DISTINCT safe_file_id FROM results WHERE safe_file_id IS NOT NULL'):
+        unique_ids.add(row[0])
+    conn.close()
+else:
+    # Find all matching files
+    for filename in glob.glob('safe_file_ids*.txt'):
+        print(f"Processing {filename}")
+        with open(filename, 'r', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip the header
+            for row in reader:
+                if len(row) > 1:
+                    unique_ids.add(row[1])
 
 # Write unique values to output file
 with open('unique_safe_ids.txt', 'w') as out_file:
     for uid in sorted(unique_ids):  # Sort for consistency
         out_file.write(f"{uid}\n")
 
-print("Unique second column values written to unique_safe_ids.txt")
\ No newline at end of file
+print("Unique second column values written to unique_safe_ids.txt")
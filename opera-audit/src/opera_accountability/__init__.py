@@ -1,20 +1,17 @@
 """OPERA Accountability Framework - Duplicate detection and accountability analysis."""
 
-from importlib.resources import files as _pkg_files
-
-import yaml
+from .config import LazyConfig
 
 __version__ = "0.1.0"
 
-# Load configuration on import.
+# Configuration from the packaged ``config.yaml``, loaded on first access.
 #
 # ``config.yaml`` lives inside the package (``src/opera_accountability/``) so
-# it is available via :mod:`importlib.resources` for both editable installs
-# (``pip install -e .``) and wheel installs (``pip install .``). Previously
-# the loader walked up from ``__file__`` to the project root, which worked
-# for editable installs but silently broke for installed wheels where the
-# project root no longer contains ``config.yaml``.
-_config_resource = _pkg_files('opera_accountability').joinpath('config.yaml')
-CONFIG = yaml.safe_load(_config_resource.read_text())
+# it is available for both editable installs (``pip install -e .``) and wheel
+# installs (``pip install .``). Previously the loader walked up from
+# ``__file__`` to the project root, which worked for editable installs but
+# silently broke for installed wheels where the project root no longer
+# contains ``config.yaml``. See :mod:`.config` for the lazy load and cache.
+CONFIG = LazyConfig()
 
 __all__ = ['CONFIG', '__version__']
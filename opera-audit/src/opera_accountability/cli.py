@@ -3,20 +3,18 @@
 import logging
 import subprocess
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 import typer
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
 
+# Only typer and the (lazy) config are imported up front. rich, the CMR client
+# (requests, backoff) and the strategies are imported by the commands that use
+# them, so ``version``, ``dashboard`` and ``--help`` start quickly. Keep it that
+# way: tests/test_startup.py checks the import budget.
 from . import CONFIG, __version__
-from .cmr import query_cmr
-from .duplicates import detect_duplicates
-from .strategies.dswx_hls import analyze_accountability
-from .reports import save_reports
 
 # Set up logging (default to WARNING, not INFO)
 logging.basicConfig(
@@ -33,12 +31,33 @@ app = typer.Typer(
     no_args_is_help=True
 )
 
-console = Console()
+class _LazyConsole:
+    """Proxy for the shared rich Console, created on first use."""
+
+    _console = None
+
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
 
 
 @app.command()
 def duplicates(
-    product: str = typer.Argument(..., help="Product name (DSWX_HLS, RTC_S1, CSLC_S1, DSWX_S1, DISP_S1)"),
+    products: Optional[list[str]] = typer.Argument(
+        None,
+        help="Product name(s) (DSWX_HLS, RTC_S1, CSLC_S1, DSWX_S1, DISP_S1, ...). Several run concurrently."
+    ),
+    all_products: bool = typer.Option(
+        False, "--all", help="Run every product with a collection ID configured for the venue"
+    ),
+    workers: int = typer.Option(
+        4, "--workers", "-w", help="Products checked concurrently when running several"
+    ),
     days_back: int = typer.Option(7, "--days-back", "-d", help="Number of days to look back"),
     start: Optional[str] = typer.Option(None, "--start", "-s", help="Start date (YYYY-MM-DD)"),
     end: Optional[str] = typer.Option(None, "--end", "-e", help="End date (YYYY-MM-DD)"),
@@ -48,17 +67,44 @@ def duplicates(
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Minimal output"),
     verbose: bool = typer.Option(False, "--verbose", help="Verbose output")
 ):
-    """Run duplicate detection for a product."""
+    """Run duplicate detection for one or more products.
+
+    With several products (or ``--all``) the checks run concurrently in this
+    process, sharing one CMR connection pool, and a combined summary with
+    per-product timing is printed at the end.
+    """
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from .cmr import query_cmr
+    from .duplicates import detect_duplicates
+    from .reports import save_reports
 
     if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    # Validate product
-    if product not in CONFIG['products']:
-        console.print(f"[red]Error: Unknown product '{product}'[/red]")
+    if all_products and products:
+        console.print("[red]Error: Pass product names or --all, not both[/red]")
+        raise typer.Exit(1)
+
+    if all_products:
+        products = [name for name, cfg in CONFIG['products'].items() if cfg['ccid'].get(venue)]
+        skipped = [name for name in CONFIG['products'] if name not in products]
+        if skipped and not quiet:
+            console.print(f"[yellow]Skipping products with no {venue} collection ID: {', '.join(skipped)}[/yellow]")
+    elif not products:
+        console.print("[red]Error: Pass a product name or --all[/red]")
         console.print(f"Available products: {', '.join(CONFIG['products'].keys())}")
         raise typer.Exit(1)
 
+    # Validate products
+    products = list(dict.fromkeys(products))
+    for product in products:
+        if product not in CONFIG['products']:
+            console.print(f"[red]Error: Unknown product '{product}'[/red]")
+            console.print(f"Available products: {', '.join(CONFIG['products'].keys())}")
+            raise typer.Exit(1)
+
     # Calculate date range
     if start and end:
         start_date = datetime.strptime(start, '%Y-%m-%d')
@@ -67,6 +113,12 @@ def duplicates(
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
 
+    if all_products or len(products) > 1:
+        _run_duplicates_batch(products, start_date, end_date, venue, save, output_dir, quiet, workers)
+        return
+
+    product = products[0]
+
     if not quiet:
         mode_str = "save to files" if save else "stdout only"
         console.print(Panel(
@@ -135,6 +187,179 @@ def duplicates(
         console.print("[green]Done![/green]")
 
 
+def _check_product_duplicates(
+    product: str,
+    start_date: datetime,
+    end_date: datetime,
+    venue: str,
+    save: bool,
+    output_dir: str,
+    session=None,
+) -> dict:
+    """Query, analyze and optionally save one product for the batch mode.
+
+    Returns the results (None when CMR has no granules), the files written and
+    the seconds spent querying CMR and analyzing/saving.
+    """
+    from .cmr import query_cmr
+    from .duplicates import detect_duplicates
+    from .reports import save_reports
+
+    ccid = CONFIG['products'][product]['ccid'][venue]
+    if not ccid:
+        raise ValueError(f"No collection ID configured for {product} in {venue}")
+
+    query_start = time.perf_counter()
+    cmr_granules = query_cmr(ccid, start_date, end_date, venue, session=session, progress=False)
+    query_seconds = time.perf_counter() - query_start
+
+    analysis_start = time.perf_counter()
+    results = None
+    files = {}
+
+    if len(cmr_granules) > 0:
+        results = detect_duplicates(cmr_granules, product)
+        if save:
+            files = save_reports(
+                results, output_dir, product, 'duplicates', venue,
+                start_date=start_date, end_date=end_date,
+            )
+
+    return {
+        'results': results,
+        'files': files,
+        'query_seconds': query_seconds,
+        'analysis_seconds': time.perf_counter() - analysis_start,
+    }
+
+
+def _run_duplicates_batch(
+    products: list[str],
+    start_date: datetime,
+    end_date: datetime,
+    venue: str,
+    save: bool,
+    output_dir: str,
+    quiet: bool,
+    workers: int,
+) -> None:
+    """Check several products concurrently over one pooled CMR session and print a combined summary."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from .cmr import cmr_session
+
+    workers = max(1, min(workers, len(products)))
+
+    if not quiet:
+        mode_str = "save to files" if save else "stdout only"
+        console.print(Panel(
+            f"[bold]Duplicate Detection[/bold]\n"
+            f"Products: {', '.join(products)}\n"
+            f"Venue: {venue}\n"
+            f"Date Range: {start_date.date()} to {end_date.date()}\n"
+            f"Workers: {workers}\n"
+            f"Mode: {mode_str}",
+            title="OPERA Audit",
+            border_style="cyan"
+        ))
+
+    outcomes = {}
+    batch_start = time.perf_counter()
+
+    with cmr_session(pool_size=workers) as session, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _check_product_duplicates, product, start_date, end_date, venue, save, output_dir, session
+            ): product
+            for product in products
+        }
+
+        for future in as_completed(futures):
+            product = futures[future]
+            try:
+                outcomes[product] = future.result()
+            except Exception as e:
+                logger.error(f"Duplicate check failed for {product}: {e}")
+                outcomes[product] = {'error': str(e)}
+                continue
+
+            if not quiet:
+                outcome = outcomes[product]
+                total = outcome['results']['total'] if outcome['results'] else 0
+                console.print(f"[cyan]{product}[/cyan]: {total:,} granules checked "
+                              f"in {outcome['query_seconds'] + outcome['analysis_seconds']:.1f}s")
+
+    wall_seconds = time.perf_counter() - batch_start
+    failed = [product for product in products if 'error' in outcomes[product]]
+
+    if quiet:
+        for product in products:
+            results = outcomes[product].get('results')
+            if results is not None:
+                print(f"{product},{results['total']},{results['unique']},{results['duplicates']}")
+            elif product not in failed:
+                print(f"{product},0,0,0")
+    else:
+        table = Table(title="Duplicate Detection Summary")
+        table.add_column("Product", style="cyan")
+        table.add_column("Total", justify="right", style="green")
+        table.add_column("Unique", justify="right", style="green")
+        table.add_column("Duplicates", justify="right", style="yellow")
+        table.add_column("Duplicate Rate", justify="right")
+        table.add_column("CMR Query", justify="right")
+        table.add_column("Analysis", justify="right")
+        table.add_column("Time", justify="right")
+
+        totals = {'total': 0, 'unique': 0, 'duplicates': 0}
+
+        for product in products:
+            outcome = outcomes[product]
+            if 'error' in outcome:
+                table.add_row(product, "[red]failed[/red]", "", "", "", "", "", "")
+                continue
+
+            results = outcome['results'] or dict.fromkeys(totals, 0)
+            for key in totals:
+                totals[key] += results[key]
+
+            rate = f"{results['duplicates'] / results['total'] * 100:.2f}%" if results['total'] else "-"
+            table.add_row(
+                product,
+                f"{results['total']:,}",
+                f"{results['unique']:,}",
+                f"{results['duplicates']:,}",
+                rate,
+                f"{outcome['query_seconds']:.1f}s",
+                f"{outcome['analysis_seconds']:.1f}s",
+                f"{outcome['query_seconds'] + outcome['analysis_seconds']:.1f}s",
+            )
+
+        rate = f"{totals['duplicates'] / totals['total'] * 100:.2f}%" if totals['total'] else "-"
+        table.add_section()
+        table.add_row("All products", f"{totals['total']:,}", f"{totals['unique']:,}", f"{totals['duplicates']:,}",
+                      rate, "", "", f"{wall_seconds:.1f}s wall", style="bold")
+
+        console.print(table)
+
+        if save:
+            console.print("\n[bold]Files created:[/bold]")
+            for product in products:
+                for file_type, path in outcomes[product].get('files', {}).items():
+                    console.print(f"  {product} {file_type}: {path}")
+
+    if failed:
+        # Each failure was already logged; quiet mode keeps stdout to the CSV lines
+        if not quiet:
+            console.print(f"[red]Failed: {', '.join(failed)}[/red]")
+        raise typer.Exit(1)
+
+    if not quiet:
+        console.print("[green]Done![/green]")
+
+
 @app.command()
 def accountability(
     product: str = typer.Argument(
@@ -155,6 +380,10 @@ def accountability(
             "JPL Artifactory or the ADT package repo."
         )
     ),
+    engine: str = typer.Option(
+        "dict", "--engine",
+        help="DSWX_HLS engine: 'dict', or 'sorted' (integer-encoded IDs, less memory on long windows)"
+    ),
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Minimal output"),
     verbose: bool = typer.Option(False, "--verbose", help="Verbose output")
 ):
@@ -165,6 +394,9 @@ def accountability(
     - ``DSWX_HLS`` — strategy ``dswx_hls`` (HLS input → DSWx-HLS output mapping)
     - ``DSWX_S1`` — strategy ``dswx_s1`` (RTC-S1 → DSWx-S1 4-step pipeline)
     """
+    from rich.panel import Panel
+
+    from .strategies.dswx_hls import ENGINES as DSWX_HLS_ENGINES
 
     if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -183,6 +415,11 @@ def accountability(
 
     strategy = acc_cfg.get('strategy', 'dswx_hls')
 
+    if engine not in DSWX_HLS_ENGINES:
+        console.print(f"[red]Error: Unknown engine '{engine}'[/red]")
+        console.print(f"Available engines: {', '.join(DSWX_HLS_ENGINES)}")
+        raise typer.Exit(1)
+
     # Calculate date range
     if start and end:
         start_date = datetime.strptime(start, '%Y-%m-%d')
@@ -207,7 +444,7 @@ def accountability(
     # Dispatch by strategy
     if strategy == 'dswx_hls':
         _run_dswx_hls_accountability(
-            product, start_date, end_date, venue, save, output_dir, quiet
+            product, start_date, end_date, venue, save, output_dir, quiet, engine
         )
     elif strategy == 'dswx_s1':
         _run_dswx_s1_accountability(
@@ -226,8 +463,15 @@ def _run_dswx_hls_accountability(
     save: bool,
     output_dir: str,
     quiet: bool,
+    engine: str = 'dict',
 ) -> None:
     """Existing DSWX_HLS pipeline, extracted so the CLI can dispatch by strategy."""
+    from rich.table import Table
+
+    from .cmr import query_cmr
+    from .reports import save_reports
+    from .strategies.dswx_hls import analyze_accountability
+
     dswx_ccid = CONFIG['products'][product]['ccid'][venue]
     hls_s30_ccid = CONFIG['products'][product]['accountability']['hls_s30_ccid'][venue]
     hls_l30_ccid = CONFIG['products'][product]['accountability']['hls_l30_ccid'][venue]
@@ -244,7 +488,7 @@ def _run_dswx_hls_accountability(
 
     if not quiet:
         console.print("\n[cyan]Analyzing accountability...[/cyan]")
-    results = analyze_accountability(dswx_granules, hls_granules)
+    results = analyze_accountability(dswx_granules, hls_granules, engine=engine)
 
     files = {}
     if save:
@@ -292,6 +536,8 @@ def _run_dswx_s1_accountability(
 ) -> None:
     """DSWx-S1 pipeline dispatcher: runs the 4-step strategy and renders results."""
     # Imported lazily so the dswx_s1 package is only loaded when used.
+    from rich.table import Table
+
     from .strategies.dswx_s1 import run as run_dswx_s1
 
     if not quiet:
@@ -13,12 +13,23 @@ from . import CONFIG
 
 logger = logging.getLogger(__name__)
 
-CMR_URLS = {
-    'PROD': CONFIG['cmr']['url'],
-    'UAT': CONFIG['cmr']['url_uat']
+# Config keys of the CMR URL per venue, looked up per query so importing this
+# module does not load the config
+CMR_URL_KEYS = {
+    'PROD': 'url',
+    'UAT': 'url_uat'
 }
 
 
+def cmr_session(pool_size: int = 10) -> requests.Session:
+    """Return a session whose connection pool can be shared by concurrent CMR queries."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
 def _fatal_code(err: requests.exceptions.RequestException) -> bool:
     """Check if error code should stop retrying."""
     return err.response.status_code not in [401, 418, 429, 500, 502, 503, 504]
@@ -40,7 +51,12 @@ def _backoff_logger(details):
     on_backoff=_backoff_logger,
     interval=15
 )
-def _do_cmr_request(url: str, params: dict, headers: Optional[dict] = None) -> tuple[list[dict], Optional[str]]:
+def _do_cmr_request(
+    url: str,
+    params: dict,
+    headers: Optional[dict] = None,
+    session: Optional[requests.Session] = None
+) -> tuple[list[dict], Optional[str]]:
     """
     Execute a single CMR request with retry logic.
 
@@ -48,6 +64,7 @@ def _do_cmr_request(url: str, params: dict, headers: Optional[dict] = None) -> t
         url: CMR endpoint URL
         params: Query parameters
         headers: Optional headers (for pagination)
+        session: Optional session to reuse pooled connections
 
     Returns:
         Tuple of (granule list, search-after token)
@@ -56,7 +73,7 @@ def _do_cmr_request(url: str, params: dict, headers: Optional[dict] = None) -> t
         headers = {}
 
     logger.debug(f'Querying {url} with params {params}')
-    response = requests.get(url, params=params, headers=headers, timeout=CONFIG['cmr']['timeout'])
+    response = (session or requests).get(url, params=params, headers=headers, timeout=CONFIG['cmr']['timeout'])
     response.raise_for_status()
 
     response_json = response.json()
@@ -70,7 +87,9 @@ def query_cmr(
     collection_id: str,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    venue: str = 'PROD'
+    venue: str = 'PROD',
+    session: Optional[requests.Session] = None,
+    progress: bool = True
 ) -> list[dict]:
     """
     Query CMR for granules with pagination and retry logic.
@@ -80,11 +99,14 @@ def query_cmr(
         start_date: Start of temporal range (optional)
         end_date: End of temporal range (optional)
         venue: 'PROD' or 'UAT'
+        session: Optional session (see cmr_session) shared across queries
+        progress: Show the single-line progress counter on stderr. Disable
+            when running several queries at once, as the lines would mix.
 
     Returns:
         List of granule dicts (CMR UMM JSON format)
     """
-    cmr_url = CMR_URLS[venue]
+    cmr_url = CONFIG['cmr'][CMR_URL_KEYS[venue]]
     granules = []
 
     params = {
@@ -102,33 +124,38 @@ def query_cmr(
     start_time = time.time()
 
     # Show initial progress
-    print(f"\rQuerying CMR ({venue}): 0 granules retrieved | 00:00", end='', file=sys.stderr)
-    sys.stderr.flush()
+    if progress:
+        print(f"\rQuerying CMR ({venue}): 0 granules retrieved | 00:00", end='', file=sys.stderr)
+        sys.stderr.flush()
 
     # First request with text progress
-    page_granules, search_after = _do_cmr_request(cmr_url, params)
+    page_granules, search_after = _do_cmr_request(cmr_url, params, session=session)
     granules.extend(page_granules)
 
     # Print progress to stderr so it doesn't interfere with stdout
-    elapsed = int(time.time() - start_time)
-    elapsed_str = f"{elapsed // 60:02d}:{elapsed % 60:02d}"
-    print(f"\rQuerying CMR ({venue}): {len(granules)} granules retrieved | {elapsed_str}", end='', file=sys.stderr)
-    sys.stderr.flush()
+    if progress:
+        elapsed = int(time.time() - start_time)
+        elapsed_str = f"{elapsed // 60:02d}:{elapsed % 60:02d}"
+        print(f"\rQuerying CMR ({venue}): {len(granules)} granules retrieved | {elapsed_str}", end='', file=sys.stderr)
+        sys.stderr.flush()
 
     # Paginate through remaining results
     while search_after:
         headers = {'CMR-Search-After': search_after}
-        page_granules, search_after = _do_cmr_request(cmr_url, params, headers)
+        page_granules, search_after = _do_cmr_request(cmr_url, params, headers, session=session)
         granules.extend(page_granules)
 
         # Update progress with elapsed time
-        elapsed = int(time.time() - start_time)
-        elapsed_str = f"{elapsed // 60:02d}:{elapsed % 60:02d}"
-        print(f"\rQuerying CMR ({venue}): {len(granules)} granules retrieved | {elapsed_str}", end='', file=sys.stderr)
-        sys.stderr.flush()
+        if progress:
+            elapsed = int(time.time() - start_time)
+            elapsed_str = f"{elapsed // 60:02d}:{elapsed % 60:02d}"
+            print(f"\rQuerying CMR ({venue}): {len(granules)} granules retrieved | {elapsed_str}", end='',
+                  file=sys.stderr)
+            sys.stderr.flush()
 
     # Final newline
-    print(file=sys.stderr)
+    if progress:
+        print(file=sys.stderr)
 
-    logger.info(f"Retrieved {len(granules)} granules from CMR")
+    logger.info(f"Retrieved {len(granules)} granules from CMR for {collection_id}")
     return granules
@@ -0,0 +1,110 @@
+"""Lazy loading of the packaged ``config.yaml``.
+
+``CONFIG`` in the package namespace is a :class:`LazyConfig`. The YAML is only
+read on first access, so commands that never look at the configuration
+(``version``, ``dashboard``, ``--help``) do not pay for it. The parsed config is
+cached as a pickle keyed on the YAML file's path, mtime and size. Later runs
+load the pickle and never import :mod:`yaml`; editing ``config.yaml``
+invalidates the cache.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+# ``config.yaml`` lives inside the package so it ships with both editable and
+# wheel installs (see ``[tool.setuptools.package-data]``).
+CONFIG_PATH = Path(__file__).with_name('config.yaml')
+
+CACHE_FILE_NAME = 'config.pickle'
+
+
+def default_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/opera-audit``, defaulting to ``~/.cache/opera-audit``."""
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'opera-audit'
+
+
+def _parse_yaml(text: str) -> dict:
+    import yaml
+    return yaml.safe_load(text)
+
+
+def _read_packaged_config() -> dict:
+    # Fallback for installs where the package is not a plain directory (e.g.
+    # zipimport) and there is no file to stat or cache against.
+    from importlib.resources import files
+    return _parse_yaml(files('opera_accountability').joinpath('config.yaml').read_text())
+
+
+def load_config(path: Path | None = None, cache_dir: Path | None = None) -> dict:
+    """Parse ``config.yaml``, using the pickle cache when it matches the file.
+
+    A cache that is missing, stale or unreadable is rebuilt. Failing to write
+    it (e.g. a read-only home directory under cron) is logged and ignored.
+    """
+    path = Path(path) if path is not None else CONFIG_PATH
+
+    if path == CONFIG_PATH and not path.is_file():
+        return _read_packaged_config()
+
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    cache_path = (cache_dir if cache_dir is not None else default_cache_dir()) / CACHE_FILE_NAME
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, config = pickle.load(f)
+        if cached_key == key:
+            return config
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable config cache {cache_path}: {e}")
+
+    config = _parse_yaml(path.read_text())
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent runs never read a partial pickle
+        tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write config cache {cache_path}: {e}")
+
+    return config
+
+
+class LazyConfig(Mapping):
+    """Read-only mapping that loads the configuration on first access."""
+
+    def __init__(self, loader=load_config):
+        self._loader = loader
+        self._data: dict | None = None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            self._data = self._loader()
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f'{type(self).__name__}(<not loaded>)'
+        return f'{type(self).__name__}({self._data!r})'
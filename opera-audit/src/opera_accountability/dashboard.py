@@ -1116,6 +1116,32 @@ def _render_dswx_hls_panel(product: str, report: dict) -> None:
                         description="matched ÷ expected",
                         key=_next_key("m"))
 
+    # Daily series straight from the report's per-date counts. Older reports
+    # have an empty ``by_date`` and skip the chart.
+    by_date = results.get('by_date') or {}
+    if by_date:
+        _section_label("Accountability by acquisition date")
+        df = pd.DataFrame([
+            {"Date": d, "Matched": by_date[d]['actual'], "Missing": by_date[d]['missing']}
+            for d in sorted(by_date.keys())
+        ])
+        melted = df.melt('Date', var_name='Series', value_name='Count')
+        chart = (
+            alt.Chart(melted)
+            .mark_bar()
+            .encode(
+                x=alt.X('Date:N', title=None),
+                y=alt.Y('Count:Q', title='HLS granules', stack='zero'),
+                color=alt.Color('Series:N', legend=alt.Legend(orient='top'),
+                                scale=alt.Scale(domain=['Matched', 'Missing'],
+                                                range=[JPL_BLUE, NASA_RED])),
+                tooltip=['Date', 'Series', 'Count'],
+            )
+            .configure(**_altair_theme()["config"])
+            .properties(height=260)
+        )
+        st.altair_chart(chart, use_container_width=True)
+
     missing = results.get('missing') or []
     if missing:
         today = datetime.now().strftime('%Y-%m-%d')
@@ -5,6 +5,6 @@ window to compute accountability. Selected via
 ``products.DSWX_HLS.accountability.strategy: dswx_hls`` in ``config.yaml``.
 """
 
-from .accountability import analyze_accountability
+from .accountability import ENGINES, analyze_accountability
 
-__all__ = ["analyze_accountability"]
+__all__ = ["ENGINES", "analyze_accountability"]
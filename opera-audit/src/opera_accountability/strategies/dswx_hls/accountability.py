@@ -3,14 +3,18 @@
 import re
 import logging
 from datetime import datetime, timezone
-from os.path import basename
 from typing import Any
 from collections import defaultdict
 
 from ... import CONFIG
+from .inputs import map_hls_inputs
 
 logger = logging.getLogger(__name__)
 
+# ``dict`` maps HLS ID strings to DSWx granules; ``sorted`` encodes the IDs as
+# integers and uses sorted NumPy arrays (see encoded.py), for long windows.
+ENGINES = ('dict', 'sorted')
+
 # Landsat-9 cutoff date (from Riley's dswx-hls-input-map.py)
 L9_CUTOFF = None  # Will be set from config
 
@@ -29,7 +33,8 @@ def _parse_l9_cutoff():
 
 def analyze_accountability(
     dswx_granules: list[dict],
-    hls_granules: list[dict]
+    hls_granules: list[dict],
+    engine: str = 'dict'
 ) -> dict[str, Any]:
     """
     Analyze accountability for DSWX_HLS by mapping to HLS inputs.
@@ -39,11 +44,13 @@ def analyze_accountability(
     2. Query all HLS granules in time range
     3. Filter out L9 granules before cutoff date
     4. Find HLS granules with no DSWx output
-    5. Aggregate by date
+    5. Aggregate by acquisition date and month in the same pass
 
     Args:
         dswx_granules: List of DSWx-HLS granules from CMR
         hls_granules: List of HLS granules from CMR
+        engine: One of ENGINES. Both give identical results; ``sorted`` uses
+            a fraction of the memory on year-long windows.
 
     Returns:
         Dict with accountability results:
@@ -51,34 +58,30 @@ def analyze_accountability(
             "expected": int,
             "actual": int,
             "missing": [granule_ids],
-            "by_date": {date: {expected, actual, missing}}
+            "by_date": {YYYY-MM-DD: {expected, actual, missing}},
+            "by_month": {YYYY-MM: {expected, actual, missing}}
         }
+
+        by_date/by_month are keyed on HLS acquisition time (UTC), with
+        "missing" as a count; the missing granule IDs are only listed overall.
     """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {', '.join(ENGINES)}")
+
+    if engine == 'sorted':
+        from .encoded import analyze_accountability_encoded
+        return analyze_accountability_encoded(dswx_granules, hls_granules)
+
     if L9_CUTOFF is None:
         _parse_l9_cutoff()
 
     hls_config = CONFIG['products']['DSWX_HLS']['accountability']
     hls_pattern = re.compile(hls_config['hls_pattern'])
-    hls_suffix_pattern = re.compile(r'[.](B[A-Za-z0-9]{2}|Fmask)[.]tif$')
-
-    # Map HLS inputs to DSWx outputs
-    hls_to_dswx = defaultdict(list)
 
     logger.info(f"Processing {len(dswx_granules)} DSWx-HLS granules")
 
-    for granule in dswx_granules:
-        granule_id = granule['umm']['GranuleUR']
-        input_granules = granule['umm'].get('InputGranules', [])
-
-        # Extract HLS inputs from DSWx metadata
-        for input_file in input_granules:
-            # Strip path and HLS band suffix
-            input_name = basename(input_file)
-            input_name = re.sub(hls_suffix_pattern, '', input_name)
-
-            # Check if it matches HLS pattern
-            if hls_pattern.match(input_name):
-                hls_to_dswx[input_name].append(granule_id)
+    # Map HLS inputs (band files reduced to HLS granule IDs) to DSWx outputs
+    hls_to_dswx = map_hls_inputs(dswx_granules, hls_pattern)
 
     logger.info(f"Mapped DSWx to {len(hls_to_dswx)} unique HLS inputs")
     logger.info(f"Processing {len(hls_granules)} HLS granules")
@@ -86,6 +89,11 @@ def analyze_accountability(
     # Process HLS granules and filter L9
     filtered_hls = []
 
+    # Per acquisition date/month counts, accumulated in the same pass. The DSWx
+    # mapping is complete by now, so each HLS granule's match is known here.
+    by_date = defaultdict(lambda: {'expected': 0, 'actual': 0, 'missing': 0})
+    by_month = defaultdict(lambda: {'expected': 0, 'actual': 0, 'missing': 0})
+
     for granule in hls_granules:
         granule_id = granule['umm']['GranuleUR']
         acq_time_str = granule['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime']
@@ -100,9 +108,22 @@ def analyze_accountability(
 
         filtered_hls.append(granule_id)
 
-        # Add to mapping if not already there
+        acq_date = acq_time.date().isoformat()
+        day_counts = by_date[acq_date]
+        month_counts = by_month[acq_date[:7]]
+        day_counts['expected'] += 1
+        month_counts['expected'] += 1
+
+        # Add to mapping if not already there. A granule is missing only the
+        # first time it is seen, as in the overall counts below (actual is
+        # expected - missing), so the per-date counts sum to the totals.
         if granule_id not in hls_to_dswx:
             hls_to_dswx[granule_id] = []
+            day_counts['missing'] += 1
+            month_counts['missing'] += 1
+        else:
+            day_counts['actual'] += 1
+            month_counts['actual'] += 1
 
     logger.info(f"After L9 filtering: {len(filtered_hls)} HLS granules")
 
@@ -111,13 +132,11 @@ def analyze_accountability(
 
     logger.info(f"Found {len(missing)} HLS granules with no DSWx output")
 
-    # Aggregate by date (simplified - just overall counts for now)
-    by_date = {}  # TODO: Implement daily breakdown if needed
-
     return {
         'expected': len(filtered_hls),
         'actual': len(filtered_hls) - len(missing),
         'missing': sorted(missing),
         'missing_count': len(missing),
-        'by_date': by_date
+        'by_date': {d: by_date[d] for d in sorted(by_date)},
+        'by_month': {m: by_month[m] for m in sorted(by_month)},
     }
@@ -0,0 +1,172 @@
+"""Integer-encoded DSWX_HLS accountability engine for long (year-scale) windows.
+
+Produces the same result as :func:`.accountability.analyze_accountability`
+without its per-granule string dict. Every HLS granule ID is encoded as one
+int64 and the matched / missing sets are computed on sorted NumPy arrays.
+
+A standard HLS ID, ``HLS.S30.T10TEM.2026001T183821.v2.0``, is encoded as::
+
+    prefix_index * 10**13 + 2026001183821
+
+where ``prefix_index`` interns the ``(HLS.S30.T10TEM., .v2.0)`` pair of
+product, tile and version. That is a few hundred thousand strings at most,
+whatever the window length. The acquisition day-of-year and time are kept
+as digits. IDs that are not in that exact form are interned whole and get a
+negative code, so every ID round-trips exactly.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, datetime
+from typing import Any
+
+import numpy as np
+
+from ... import CONFIG
+from . import accountability
+from .inputs import reduce_input_hls_list
+
+logger = logging.getLogger(__name__)
+
+_ENCODABLE_PATTERN = re.compile(r'HLS\.[SL]30\.T[^\W_]{5}\.\d{7}T\d{6}\.v\d+\.\d+', re.ASCII)
+
+# Codes are prefix_index * _TS_RANGE + YYYYDDDHHMMSS, which must stay below 2**63
+_TS_RANGE = 10 ** 13
+_MAX_PREFIXES = (2 ** 63 - 1) // _TS_RANGE
+
+
+class _HLSIdCodec:
+    """Encodes HLS granule IDs to int64 codes and back."""
+
+    def __init__(self):
+        self._prefixes: dict[tuple[str, str], int] = {}
+        self._prefix_list: list[tuple[str, str]] = []
+        self._others: dict[str, int] = {}
+        self._other_list: list[str] = []
+
+    def encode(self, hls_id: str) -> int:
+        if _ENCODABLE_PATTERN.fullmatch(hls_id):
+            prefix = (hls_id[:15], hls_id[29:])
+            index = self._prefixes.get(prefix)
+
+            if index is None and len(self._prefix_list) < _MAX_PREFIXES:
+                index = self._prefixes[prefix] = len(self._prefix_list)
+                self._prefix_list.append(prefix)
+
+            if index is not None:
+                return index * _TS_RANGE + int(hls_id[15:22] + hls_id[23:29])
+
+        index = self._others.get(hls_id)
+        if index is None:
+            index = self._others[hls_id] = len(self._other_list)
+            self._other_list.append(hls_id)
+
+        return -1 - index
+
+    def decode(self, code: int) -> str:
+        if code < 0:
+            return self._other_list[-1 - code]
+
+        index, ts = divmod(code, _TS_RANGE)
+        head, tail = self._prefix_list[index]
+        return f'{head}{ts // 10 ** 6:07d}T{ts % 10 ** 6:06d}{tail}'
+
+
+def _counts(expected: np.ndarray, missing: np.ndarray) -> dict[str, int]:
+    return {'expected': int(expected), 'actual': int(expected - missing), 'missing': int(missing)}
+
+
+def analyze_accountability_encoded(
+    dswx_granules: list[dict],
+    hls_granules: list[dict]
+) -> dict[str, Any]:
+    """
+    Analyze accountability for DSWX_HLS with integer-encoded granule IDs.
+
+    Same arguments and result as
+    :func:`.accountability.analyze_accountability`. Memory is a few int64
+    arrays over the HLS granules, instead of a dict of ID strings to DSWx
+    granule lists.
+    """
+    if accountability.L9_CUTOFF is None:
+        accountability._parse_l9_cutoff()
+
+    hls_config = CONFIG['products']['DSWX_HLS']['accountability']
+    hls_pattern = re.compile(hls_config['hls_pattern'])
+
+    codec = _HLSIdCodec()
+    # Local to this call, so the checked inputs are freed with it
+    hls_id_cache = {}
+
+    logger.info(f"Processing {len(dswx_granules)} DSWx-HLS granules")
+
+    matched = np.fromiter(
+        (codec.encode(hls_id)
+         for granule in dswx_granules
+         for hls_id in reduce_input_hls_list(granule['umm'].get('InputGranules', []), hls_pattern, hls_id_cache)),
+        dtype=np.int64,
+    )
+    matched = np.unique(matched)
+
+    logger.info(f"Mapped DSWx to {len(matched)} unique HLS inputs")
+    logger.info(f"Processing {len(hls_granules)} HLS granules")
+
+    # Filtered HLS granules as parallel (code, acquisition day ordinal) arrays
+    codes = np.empty(len(hls_granules), dtype=np.int64)
+    days = np.empty(len(hls_granules), dtype=np.int32)
+    n_filtered = 0
+
+    for granule in hls_granules:
+        granule_id = granule['umm']['GranuleUR']
+        acq_time_str = granule['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime']
+        acq_time = datetime.fromisoformat(acq_time_str.replace('Z', '+00:00'))
+
+        platforms = [p['ShortName'] for p in granule['umm'].get('Platforms', [])]
+
+        # Filter out L9 before cutoff date
+        if 'LANDSAT-9' in platforms and acq_time < accountability.L9_CUTOFF:
+            logger.debug(f"Filtering out L9 granule {granule_id} before cutoff")
+            continue
+
+        codes[n_filtered] = codec.encode(granule_id)
+        days[n_filtered] = acq_time.date().toordinal()
+        n_filtered += 1
+
+    codes = codes[:n_filtered]
+    days = days[:n_filtered]
+
+    logger.info(f"After L9 filtering: {n_filtered} HLS granules")
+
+    # A granule listed more than once is missing only at its first listing, as in the dict engine
+    unique_codes, first_index = np.unique(codes, return_index=True)
+    is_missing = ~np.isin(unique_codes, matched, assume_unique=True)
+    missing_codes = unique_codes[is_missing]
+
+    logger.info(f"Found {len(missing_codes)} HLS granules with no DSWx output")
+
+    by_date = {}
+    by_month = {}
+
+    if n_filtered > 0:
+        first_day = int(days.min())
+        expected_per_day = np.bincount(days - first_day)
+        missing_per_day = np.bincount(days[first_index[is_missing]] - first_day, minlength=len(expected_per_day))
+
+        for offset in np.flatnonzero(expected_per_day):
+            acq_date = date.fromordinal(first_day + int(offset)).isoformat()
+            by_date[acq_date] = _counts(expected_per_day[offset], missing_per_day[offset])
+
+            month = by_month.setdefault(acq_date[:7], {'expected': 0, 'actual': 0, 'missing': 0})
+            for key, value in by_date[acq_date].items():
+                month[key] += value
+
+    return {
+        'expected': n_filtered,
+        'actual': n_filtered - len(missing_codes),
+        'missing': sorted(codec.decode(int(code)) for code in missing_codes),
+        'missing_count': len(missing_codes),
+        'by_date': by_date,
+        'by_month': by_month,
+    }
@@ -0,0 +1,99 @@
+"""Normalization of DSWx-HLS ``InputGranules`` entries to HLS granule IDs.
+
+DSWx-HLS CMR records list their inputs as per-band files (e.g.
+``.../HLS.S30.T10TEM.2026001T183821.v2.0.B02.tif``), around ten per HLS
+granule, plus ancillary files such as worldcover tiles. These helpers strip
+the band suffix with plain string operations and dedupe before doing any
+further work. The HLS regex check is cached for the duration of one
+:func:`map_hls_inputs` call, so nothing is held between runs.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterable
+
+# Band part of a ``.<band>.tif`` suffix, as in r'[.](B[A-Za-z0-9]{2}|Fmask)[.]tif$'
+_BAND_PATTERN = re.compile(r'B[A-Za-z0-9]{2}|Fmask')
+
+
+@lru_cache(maxsize=1024)
+def _is_band(band: str) -> bool:
+    return _BAND_PATTERN.fullmatch(band) is not None
+
+
+def _strip_band(input_file: str) -> str:
+    """The entry without its ``.<band>.tif`` suffix, path kept, so all band files of one input share a key"""
+    parts = input_file.rsplit('.', 2)
+
+    if len(parts) == 3 and parts[2] == 'tif' and _is_band(parts[1]):
+        return parts[0]
+
+    return input_file
+
+
+def strip_hls_suffix(input_file: str) -> str:
+    """Return the file name of an ``InputGranules`` entry without its path and HLS band suffix.
+
+    Equivalent to ``re.sub(r'[.](B[A-Za-z0-9]{2}|Fmask)[.]tif$', '', basename(input_file))``.
+    """
+    stripped = _strip_band(input_file)
+    return stripped[stripped.rfind('/') + 1:]
+
+
+def _hls_id(stripped: str, hls_pattern: re.Pattern) -> str | None:
+    name = stripped[stripped.rfind('/') + 1:]
+    return name if hls_pattern.match(name) else None
+
+
+def reduce_input_hls_list(
+    input_files: Iterable[str],
+    hls_pattern: re.Pattern,
+    cache: dict[str, str | None] | None = None,
+) -> list[str]:
+    """Normalize one DSWx-HLS granule's ``InputGranules`` to its unique HLS granule IDs.
+
+    Band suffixes are stripped with string operations and the entries deduped
+    before any path or regex work, so each HLS input is normalized once per
+    call. Entries that do not match ``hls_pattern`` (ancillary inputs) are
+    dropped. IDs keep the order they are first listed in.
+
+    ``cache``, if given, maps band-stripped entries to their HLS ID (or None)
+    and is filled in as entries are checked. Pass the same dict for every
+    granule of one run so shared inputs are checked once; it is only valid for
+    a single ``hls_pattern``.
+    """
+    if cache is None:
+        cache = {}
+
+    hls_ids = {}
+    for stripped in dict.fromkeys(map(_strip_band, input_files)):
+        try:
+            hls_id = cache[stripped]
+        except KeyError:
+            hls_id = cache[stripped] = _hls_id(stripped, hls_pattern)
+        hls_ids[hls_id] = None
+
+    hls_ids.pop(None, None)
+    return list(hls_ids)
+
+
+def map_hls_inputs(dswx_granules: Iterable[dict], hls_pattern: re.Pattern) -> defaultdict[str, list[str]]:
+    """Map each HLS granule ID used as an input to the DSWx-HLS granules produced from it.
+
+    Each DSWx-HLS granule is listed once per HLS input, however many of the
+    input's band files it references.
+    """
+    hls_to_dswx = defaultdict(list)
+    # Local to this call, so the checked inputs are freed with it
+    cache = {}
+
+    for granule in dswx_granules:
+        granule_id = granule['umm']['GranuleUR']
+
+        for hls_id in reduce_input_hls_list(granule['umm'].get('InputGranules', []), hls_pattern, cache):
+            hls_to_dswx[hls_id].append(granule_id)
+
+    return hls_to_dswx
@@ -5,9 +5,13 @@ Currently tests DSWX_HLS accountability, but structured to easily
 add tests for other products (RTC_S1, CSLC_S1, etc.) when supported.
 """
 
+import re
+from os.path import basename
+
 import pytest
 from datetime import datetime
-from opera_accountability.strategies.dswx_hls import accountability
+from opera_accountability import CONFIG
+from opera_accountability.strategies.dswx_hls import accountability, encoded, inputs
 from opera_accountability.strategies.dswx_hls import analyze_accountability
 
 
@@ -229,6 +233,174 @@ class TestDSWXHLSLandsat9Filtering:
         assert result['expected'] == 2
 
 
+class TestDSWXHLSDailyBreakdown:
+    """Tests for the per-acquisition-date and per-month counts."""
+
+    def test_empty_breakdown(self):
+        result = analyze_accountability([], [])
+
+        assert result['by_date'] == {}
+        assert result['by_month'] == {}
+
+    def test_counts_by_date_and_month(self):
+        hls_granules = [
+            create_hls_granule('HLS.S30.T10TEM.2026001T183821.v2.0', '2026-01-01T18:38:21Z'),
+            create_hls_granule('HLS.L30.T10TEM.2026001T183821.v2.0', '2026-01-01T18:38:21Z'),
+            create_hls_granule('HLS.S30.T10TEM.2026031T183821.v2.0', '2026-01-31T18:38:21Z'),
+            create_hls_granule('HLS.S30.T10TEM.2026032T183821.v2.0', '2026-02-01T18:38:21Z'),
+        ]
+        dswx_granules = [
+            create_dswx_granule('DSWX_1', ['HLS.S30.T10TEM.2026001T183821.v2.0.B02.tif']),
+            create_dswx_granule('DSWX_2', ['HLS.S30.T10TEM.2026032T183821.v2.0.B02.tif']),
+        ]
+
+        result = analyze_accountability(dswx_granules, hls_granules)
+
+        assert result['by_date'] == {
+            '2026-01-01': {'expected': 2, 'actual': 1, 'missing': 1},
+            '2026-01-31': {'expected': 1, 'actual': 0, 'missing': 1},
+            '2026-02-01': {'expected': 1, 'actual': 1, 'missing': 0},
+        }
+        assert result['by_month'] == {
+            '2026-01': {'expected': 3, 'actual': 1, 'missing': 2},
+            '2026-02': {'expected': 1, 'actual': 1, 'missing': 0},
+        }
+
+    def test_breakdown_sums_to_totals(self):
+        """Filtered L9 granules are excluded and repeated granules are only missing once."""
+        hls_granules = [
+            create_hls_granule('HLS.L30.T10TEM.2025274T183821.v2.0', '2025-09-30T18:38:21Z',
+                               platform='LANDSAT-9'),
+            create_hls_granule('HLS.L30.T10TEM.2026002T183821.v2.0', '2026-01-02T18:38:21Z'),
+            create_hls_granule('HLS.L30.T10TEM.2026002T183821.v2.0', '2026-01-02T18:38:21Z'),
+            create_hls_granule('HLS.S30.T10TEM.2026003T183821.v2.0', '2026-01-03T18:38:21Z'),
+        ]
+        dswx_granules = [
+            create_dswx_granule('DSWX_1', ['HLS.S30.T10TEM.2026003T183821.v2.0.Fmask.tif']),
+        ]
+
+        result = analyze_accountability(dswx_granules, hls_granules)
+
+        assert '2025-09-30' not in result['by_date']
+        for key, total in (('expected', result['expected']), ('actual', result['actual']),
+                           ('missing', result['missing_count'])):
+            assert sum(counts[key] for counts in result['by_date'].values()) == total
+            assert sum(counts[key] for counts in result['by_month'].values()) == total
+
+
+class TestDSWXHLSInputNormalization:
+    """Tests for reducing DSWx-HLS InputGranules entries to HLS granule IDs."""
+
+    HLS_ID = 'HLS.S30.T10TEM.2026001T183821.v2.0'
+
+    @pytest.fixture
+    def hls_pattern(self):
+        return re.compile(CONFIG['products']['DSWX_HLS']['accountability']['hls_pattern'])
+
+    @pytest.mark.parametrize('input_file', [
+        's3://lp-prod/HLS/HLS.S30.T10TEM.2026001T183821.v2.0.B02.tif',
+        'HLS.S30.T10TEM.2026001T183821.v2.0.Fmask.tif',
+        'HLS.S30.T10TEM.2026001T183821.v2.0.tif',
+        'HLS.S30.T10TEM.2026001T183821.v2.0.B02.tiff',
+        'a/b.B1x.tif',
+        'a/b.b02.tif',
+        'a.dir/b.tif',
+        'a/.B02.tif',
+        'B02.tif',
+        'worldcover_0.tif',
+        'dir/',
+    ])
+    def test_strip_matches_regex_sub(self, input_file):
+        """String-based stripping matches the regex it replaces."""
+        expected = re.sub(r'[.](B[A-Za-z0-9]{2}|Fmask)[.]tif$', '', basename(input_file))
+        assert inputs.strip_hls_suffix(input_file) == expected
+
+    def test_reduce_dedupes_bands_and_drops_ancillary(self, hls_pattern):
+        other = 'HLS.L30.T10TEM.2026001T183821.v2.0'
+        files = [
+            f's3://lp-prod/{self.HLS_ID}/{self.HLS_ID}.B02.tif',
+            f's3://lp-prod/{self.HLS_ID}/{self.HLS_ID}.B03.tif',
+            f'{other}.Fmask.tif',
+            f's3://lp-prod/{self.HLS_ID}/{self.HLS_ID}.Fmask.tif',
+            f'/other/path/{self.HLS_ID}.B04.tif',
+            'worldcover_0.tif',
+            'GSHHS_f_L1.shp',
+        ]
+
+        assert inputs.reduce_input_hls_list(files, hls_pattern) == [self.HLS_ID, other]
+
+    def test_map_lists_each_dswx_granule_once_per_input(self, hls_pattern):
+        dswx_granules = [
+            create_dswx_granule('DSWX_1', [f'{self.HLS_ID}.B02.tif', f'{self.HLS_ID}.B03.tif']),
+            create_dswx_granule('DSWX_2', [f'{self.HLS_ID}.B02.tif']),
+            create_dswx_granule('DSWX_3', ['worldcover_0.tif']),
+        ]
+
+        assert inputs.map_hls_inputs(dswx_granules, hls_pattern) == {self.HLS_ID: ['DSWX_1', 'DSWX_2']}
+
+    def test_reduce_fills_caller_cache(self, hls_pattern):
+        cache = {}
+        files = [f'{self.HLS_ID}.B02.tif', f'{self.HLS_ID}.B03.tif', 'worldcover_0.tif']
+
+        assert inputs.reduce_input_hls_list(files, hls_pattern, cache) == [self.HLS_ID]
+        assert cache == {self.HLS_ID: self.HLS_ID, 'worldcover_0.tif': None}
+        # Cached entries are reused as is
+        assert inputs.reduce_input_hls_list(files, hls_pattern, cache) == [self.HLS_ID]
+
+
+class TestDSWXHLSSortedEngine:
+    """Tests for the integer-encoded ``sorted`` engine, which must match the ``dict`` engine exactly."""
+
+    @pytest.mark.parametrize('hls_id', [
+        'HLS.S30.T10TEM.2026001T183821.v2.0',
+        'HLS.L30.T60XWR.0001001T000000.v10.12',
+        'HLS.S30.T10TEM.2026001T183821.v2.0.extra',
+        'HLS.S30.T10TEM.2026001T18382\u0663.v2.0',
+        'not-an-hls-id',
+    ])
+    def test_codec_round_trip(self, hls_id):
+        codec = encoded._HLSIdCodec()
+        code = codec.encode(hls_id)
+
+        assert codec.decode(code) == hls_id
+        assert codec.encode(hls_id) == code
+
+    def test_matches_dict_engine(self):
+        hls_granules = [
+            create_hls_granule('HLS.S30.T10TEM.2026001T183821.v2.0', '2026-01-01T18:38:21Z'),
+            create_hls_granule('HLS.L30.T10TEM.2026001T183821.v2.0', '2026-01-01T18:38:21Z'),
+            create_hls_granule('HLS.L30.T10TEM.2026001T183821.v2.0', '2026-01-01T18:38:21Z'),
+            create_hls_granule('HLS.L30.T11SKA.2025274T183821.v2.0', '2025-09-30T18:38:21Z',
+                               platform='LANDSAT-9'),
+            create_hls_granule('HLS.S30.T11SKA.2026040T183821.v2.0', '2026-02-09T18:38:21Z'),
+            create_hls_granule('HLS.S30.T11SKA.2026041T183821.v2.0.extra', '2026-02-10T18:38:21Z'),
+            create_hls_granule('HLS.S30.T11SKA.2026042T183821.v2.0', '2026-02-11T18:38:21Z'),
+        ]
+        dswx_granules = [
+            create_dswx_granule('DSWX_1', ['HLS.S30.T10TEM.2026001T183821.v2.0.B02.tif',
+                                           'HLS.S30.T10TEM.2026001T183821.v2.0.Fmask.tif']),
+            create_dswx_granule('DSWX_2', ['HLS.S30.T11SKA.2026041T183821.v2.0.extra.B02.tif',
+                                           'HLS.S30.T11SKA.2026042T183821.v2.0.B02.tif',
+                                           'worldcover_0.tif']),
+            create_dswx_granule('DSWX_3', ['HLS.S30.T12SUD.2026001T000000.v2.0.B02.tif']),
+        ]
+
+        expected = analyze_accountability(dswx_granules, hls_granules, engine='dict')
+        accountability.L9_CUTOFF = None
+        result = analyze_accountability(dswx_granules, hls_granules, engine='sorted')
+
+        assert result == expected
+        assert list(result['by_date']) == list(expected['by_date'])
+        assert result['missing'] == ['HLS.L30.T10TEM.2026001T183821.v2.0', 'HLS.S30.T11SKA.2026040T183821.v2.0']
+
+    def test_empty_data(self):
+        assert analyze_accountability([], [], engine='sorted') == analyze_accountability([], [])
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            analyze_accountability([], [], engine='bitmap')
+
+
 # ============================================================================
 # Future Product Tests - Placeholder structure
 # ============================================================================
@@ -282,3 +282,95 @@ def test_new_products_registered_in_config():
         assert prod_cfg['unique_fields'], f"{product} missing unique_fields"
         assert prod_cfg['aggregation_field'], f"{product} missing aggregation_field"
         assert prod_cfg['aggregation_format'], f"{product} missing aggregation_format"
+
+
+# ---------------------------------------------------------------------------
+# opera-audit duplicates with several products
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def fake_cmr(monkeypatch):
+    """Replace the CMR query with canned DSWX_HLS granules, recording each call."""
+    import threading
+
+    from opera_accountability import cmr
+
+    calls = []
+    lock = threading.Lock()
+    granules = [
+        {'umm': {'GranuleUR': 'OPERA_L3_DSWx-HLS_T10TEM_20260115T180931Z_20260115T235959Z_L8_30_v1.0'}},
+        {'umm': {'GranuleUR': 'OPERA_L3_DSWx-HLS_T10TEM_20260115T180931Z_20260116T235959Z_L8_30_v1.0'}},
+    ]
+
+    def query_cmr(collection_id, start_date=None, end_date=None, venue='PROD', session=None, progress=True):
+        with lock:
+            calls.append({'ccid': collection_id, 'session': session, 'progress': progress})
+        if collection_id == 'C-FAIL':
+            raise RuntimeError('CMR unavailable')
+        return granules if collection_id == 'C2617126679-POCLOUD' else []
+
+    monkeypatch.setattr(cmr, 'query_cmr', query_cmr)
+    return calls
+
+
+def _run_cli(*args):
+    from typer.testing import CliRunner
+
+    from opera_accountability.cli import app
+
+    # Wide enough that rich does not wrap the summary table
+    return CliRunner().invoke(app, ['duplicates', *args], env={'COLUMNS': '200'})
+
+
+def test_duplicates_batch_shares_one_session(fake_cmr, tmp_path):
+    result = _run_cli('DSWX_HLS', 'RTC_S1', '--quiet', '--save', '--output-dir', str(tmp_path))
+
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == ['DSWX_HLS,2,1,1', 'RTC_S1,0,0,0']
+    assert len(fake_cmr) == 2
+    assert fake_cmr[0]['session'] is not None
+    assert fake_cmr[0]['session'] is fake_cmr[1]['session']
+    assert not any(call['progress'] for call in fake_cmr)
+    assert len(list((tmp_path / 'reports' / 'duplicates' / 'DSWX_HLS').glob('*.json'))) == 1
+
+
+def test_duplicates_all_runs_every_product_with_a_ccid(fake_cmr):
+    from opera_accountability import CONFIG
+
+    result = _run_cli('--all', '--venue', 'UAT', '--quiet')
+
+    expected = [name for name, cfg in CONFIG['products'].items() if cfg['ccid']['UAT']]
+    assert result.exit_code == 0, result.output
+    assert [line.split(',')[0] for line in result.output.splitlines()] == expected
+    assert len(fake_cmr) == len(expected)
+
+
+def test_duplicates_batch_summary_table(fake_cmr):
+    result = _run_cli('DSWX_HLS', 'RTC_S1')
+
+    assert result.exit_code == 0, result.output
+    assert 'Duplicate Detection Summary' in result.output
+    assert 'All products' in result.output
+    assert 'wall' in result.output
+
+
+def test_duplicates_batch_reports_failures(fake_cmr, monkeypatch):
+    from opera_accountability import CONFIG, cli
+
+    config = dict(CONFIG)
+    config['products'] = {name: dict(cfg) for name, cfg in CONFIG['products'].items()}
+    config['products']['RTC_S1']['ccid'] = {'PROD': 'C-FAIL', 'UAT': ''}
+    monkeypatch.setattr(cli, 'CONFIG', config)
+
+    result = _run_cli('DSWX_HLS', 'RTC_S1', '--quiet')
+
+    assert result.exit_code == 1
+    assert 'DSWX_HLS,2,1,1' in result.output.splitlines()
+    assert 'RTC_S1' not in result.output
+
+
+def test_duplicates_requires_product_or_all():
+    assert _run_cli().exit_code == 1
+    assert _run_cli('DSWX_HLS', '--all').exit_code == 1
+    assert _run_cli('NOT_A_PRODUCT', 'DSWX_HLS').exit_code == 1
@@ -0,0 +1,132 @@
+"""Startup cost of the CLI and the lazy, cached configuration.
+
+The CLI is run from cron and shell loops, where import time dominates small
+queries. These tests keep heavy modules out of ``import opera_accountability.cli``
+and hold the import under a fixed budget.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from opera_accountability import config as config_module
+from opera_accountability.config import CACHE_FILE_NAME, LazyConfig, load_config
+
+# Generous against the ~70 ms measured locally, to absorb slow CI machines
+# while still catching an eager import of requests / rich / yaml / numpy.
+IMPORT_BUDGET_SECONDS = 0.25
+
+HEAVY_MODULES = [
+    'yaml',
+    'requests',
+    'backoff',
+    'rich.console',
+    'numpy',
+    'opera_accountability.cmr',
+    'opera_accountability.strategies',
+]
+
+
+def _run_python(code: str) -> str:
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+# ---------------------------------------------------------------------------
+# CLI import
+# ---------------------------------------------------------------------------
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    loaded = json.loads(_run_python(
+        'import json, sys\n'
+        'import opera_accountability.cli\n'
+        f'print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n'
+    ))
+
+    assert loaded == []
+
+
+def test_cli_import_time_within_budget():
+    """Best of three fresh interpreters, so one slow run does not fail the test."""
+    timings = [
+        float(_run_python(
+            'import time\n'
+            't = time.perf_counter()\n'
+            'import opera_accountability.cli\n'
+            'print(time.perf_counter() - t)\n'
+        ))
+        for _ in range(3)
+    ]
+
+    assert min(timings) < IMPORT_BUDGET_SECONDS, f'CLI import took {min(timings):.3f}s'
+
+
+# ---------------------------------------------------------------------------
+# Config loading and cache
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def config_file(tmp_path: Path) -> Path:
+    path = tmp_path / 'config.yaml'
+    path.write_text('cmr:\n  page_size: 2000\n')
+    return path
+
+
+def test_load_config_writes_and_reuses_cache(config_file: Path, tmp_path: Path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+
+    assert load_config(config_file, cache_dir) == {'cmr': {'page_size': 2000}}
+    assert (cache_dir / CACHE_FILE_NAME).exists()
+
+    def fail_parse(text):
+        raise AssertionError('config.yaml was parsed despite a valid cache')
+
+    monkeypatch.setattr(config_module, '_parse_yaml', fail_parse)
+    assert load_config(config_file, cache_dir) == {'cmr': {'page_size': 2000}}
+
+
+def test_load_config_cache_invalidated_by_edit(config_file: Path, tmp_path: Path):
+    cache_dir = tmp_path / 'cache'
+    load_config(config_file, cache_dir)
+
+    config_file.write_text('cmr:\n  page_size: 500\n  timeout: 30\n')
+
+    assert load_config(config_file, cache_dir) == {'cmr': {'page_size': 500, 'timeout': 30}}
+
+
+def test_load_config_ignores_corrupt_cache(config_file: Path, tmp_path: Path):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    (cache_dir / CACHE_FILE_NAME).write_bytes(b'not a pickle')
+
+    assert load_config(config_file, cache_dir) == {'cmr': {'page_size': 2000}}
+
+
+def test_load_config_without_writable_cache(config_file: Path, tmp_path: Path):
+    blocker = tmp_path / 'not-a-dir'
+    blocker.write_text('')
+
+    assert load_config(config_file, blocker / 'cache') == {'cmr': {'page_size': 2000}}
+
+
+def test_lazy_config_loads_once_on_first_access():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {'products': {'DSWX_HLS': {}}}
+
+    lazy = LazyConfig(loader)
+    assert calls == []
+
+    assert 'DSWX_HLS' in lazy['products']
+    assert list(lazy) == ['products']
+    assert lazy.get('missing') is None
+    assert calls == [1]
@@ -1,8 +1,10 @@
-import os
+import argparse
 import csv
-import sys
-from collections import defaultdict
-from datetime import datetime
+import gzip
+from contextlib import nullcontext
+from array import array
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
 
 _date_format_str = "%Y-%m-%dT%H:%M:%SZ"
 _date_format_str_cmr = _date_format_str[:-1] + ".%f"
@@ -18,6 +20,19 @@ Input file looks like this
 "2023-04-07T20:18:19.040-0400","HLS.L30.T01FBE.2023094T213802.v2.0",201
 '''
 
+# Lines buffered before each write in the columnar engine
+WRITE_BATCH_SIZE = 10_000
+
+STATS_PERCENTILES = (50, 95, 99)
+
+# Streaming engine: how long after a granule's first event its later revisions are still matched to it. None keeps
+# every granule until the end of input, so the output always matches the other engines.
+DEFAULT_REVISION_WINDOW_DAYS = None
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
 class HLSEvents:
     def __init__(self):
         # 201 code: initial revision for the granule
@@ -26,29 +41,29 @@ class HLSEvents:
         # 200 code: subsequent revisions for the granule. There can be several.
         self.subs_revisions = []
 
-event_dict = defaultdict(HLSEvents)
 
-file = sys.argv[1]
-csvreader = csv.reader(open(file, 'r'))
-next(csvreader) #skip the first line
+def process_events_python(file, outfile):
+    '''Original implementation: one HLSEvents object per granule, timestamps parsed row by row'''
+    event_dict = defaultdict(HLSEvents)
 
-for row in csvreader:
-    id = row[1]
-    date_str = row[0]
-    date = datetime.strptime(date_str[:-5], _date_format_str_cmr)
-    event = row[2]
+    with open(file, 'r') as f:
+        csvreader = csv.reader(f)
+        next(csvreader) #skip the first line
 
-    #print(id)
+        for row in csvreader:
+            id = row[1]
+            date_str = row[0]
+            date = datetime.strptime(date_str[:-5], _date_format_str_cmr)
+            event = row[2]
 
-    hls_event = event_dict[id]
+            hls_event = event_dict[id]
 
-    if event == '201':
-        hls_event.initial_revision = date
+            if event == '201':
+                hls_event.initial_revision = date
 
-    elif event == '200':
-        hls_event.subs_revisions.append(date)
+            elif event == '200':
+                hls_event.subs_revisions.append(date)
 
-with open(file+".result.csv", "w") as outfile:
     for id in event_dict:
         events = event_dict[id]
         events.subs_revisions.sort()
@@ -62,7 +77,279 @@ with open(file+".result.csv", "w") as outfile:
                 outfile.write(str(timedelta_mins))
                 outfile.write(',')
             outfile.write('\n')
-            #print(id)
-            #print('\t', events.initial_revision)
-            #print('\t', events.subs_revisions)
 
+
+def compute_revision_deltas(file):
+    '''Vectorized equivalent of process_events_python's delta computation.
+
+    Returns a DataFrame with one row per subsequent (200) revision of granules that also have an initial (201)
+    revision: native_id, initial (initial revision time), delta_mins, in the same granule and revision order as the
+    original implementation writes them.
+    '''
+    import numpy as np
+    import pandas as pd
+
+    df = pd.read_csv(file, usecols=['_time', 'native_id', 'status'],
+                     dtype={'_time': 'string', 'native_id': 'string', 'status': 'string'})
+
+    # Drop the UTC offset like the original, then parse every timestamp in one call
+    df['_time'] = pd.to_datetime(df['_time'].str[:-5], format=_date_format_str_cmr)
+
+    # Granules are written in order of first appearance in the input
+    df['order'], _ = pd.factorize(df['native_id'])
+
+    # A later 201 for the same granule overrides an earlier one
+    initial = df[df['status'] == '201'].groupby('native_id', sort=False)['_time'].last().rename('initial')
+
+    subs = df[df['status'] == '200'].join(initial, on='native_id', how='inner')
+    subs = subs.sort_values(['order', '_time'], kind='stable')
+
+    # np.round rounds half to even, matching Python's round()
+    delta_secs = (subs['_time'] - subs['initial']).dt.total_seconds()
+    subs['delta_mins'] = np.round(delta_secs / 60).astype('int64')
+
+    return subs[['native_id', 'initial', 'delta_mins']].reset_index(drop=True)
+
+
+def write_deltas(deltas, outfile):
+    '''Writes deltas from compute_revision_deltas in the original "id,delta,delta,...," format, in batches'''
+    import numpy as np
+
+    ids = deltas['native_id'].to_numpy()
+    values = deltas['delta_mins'].astype(str).to_numpy()
+
+    if len(ids) == 0:
+        return
+
+    starts = np.concatenate([[0], np.flatnonzero(ids[1:] != ids[:-1]) + 1, [len(ids)]])
+
+    lines = []
+    for start, end in zip(starts[:-1], starts[1:]):
+        lines.append(f"{ids[start]},{','.join(values[start:end])},\n")
+        if len(lines) >= WRITE_BATCH_SIZE:
+            outfile.write(''.join(lines))
+            lines = []
+    outfile.write(''.join(lines))
+
+
+def revision_latency_stats(deltas):
+    '''Per-day count and p50/p95/p99 of revision latency in minutes, keyed by the day of the initial revision'''
+    grouped = deltas.groupby(deltas['initial'].dt.date)['delta_mins']
+    stats = grouped.count().rename('count').to_frame()
+    for p in STATS_PERCENTILES:
+        stats[f'p{p}_mins'] = grouped.quantile(p / 100)
+    stats.index.name = 'date'
+    return stats
+
+
+def process_events_columnar(file, outfile, stats_file=None):
+    deltas = compute_revision_deltas(file)
+    write_deltas(deltas, outfile)
+
+    if stats_file is not None:
+        revision_latency_stats(deltas).to_csv(stats_file)
+
+
+def iter_events(files):
+    '''Yields (native_id, event time in epoch microseconds, status) from one or more event CSVs, plain or gzipped'''
+    for file in files:
+        opener = gzip.open if file.endswith('.gz') else open
+        with opener(file, 'rt', newline='') as f:
+            csvreader = csv.reader(f)
+            next(csvreader) #skip the first line
+
+            for row in csvreader:
+                # Drop the UTC offset like the original implementation
+                date = datetime.fromisoformat(row[0][:-5])
+                yield row[1], (date - _EPOCH) // _ONE_MICROSECOND, row[2]
+
+
+class GranuleRevisions:
+    '''Compact per-granule state: initial revision epoch and an array of subsequent revision epochs, in microseconds'''
+    __slots__ = ('initial', 'subs')
+
+    def __init__(self):
+        self.initial = None
+        self.subs = None
+
+
+def _granule_deltas(state):
+    return [round((sr - state.initial) / 10**6 / 60) for sr in sorted(state.subs)]
+
+
+def iter_revision_deltas(events, window_us=None, on_flush=None, on_late=None):
+    '''Consumes (native_id, epoch_us, status) events and yields (native_id, initial epoch_us, [delta_mins, ...]) for
+    granules with both an initial (201) and at least one subsequent (200) revision.
+
+    With window_us=None nothing is yielded before the end of input, and the results are identical to
+    process_events_python for any input.
+
+    With a window, the watermark is the latest event time seen. A granule is yielded, and its revision state dropped,
+    once the watermark is more than window_us past the granule's first event. Only its id is kept, so that a later
+    event for it is recognized as late: it is dropped and reported through on_late(native_id), which is called once
+    per late granule. A granule is therefore never yielded twice, and its line has the same values as
+    process_events_python unless on_late was called for it. The watermark only advances on input in ascending time
+    order; on newest-first input nothing is flushed early and the window has no effect.
+
+    on_flush(before_us), if given, is called after each flush: as long as events are no more than window_us out of time
+    order, every granule still to be yielded has its initial revision at or after before_us.'''
+    granules = {}
+    # (watermark when first seen, native_id) in order of first appearance. The watermark never decreases, so the
+    # oldest granules are always at the left.
+    first_seen = deque()
+    watermark = None
+    # Ids of flushed granules, mapped to whether a late event has been reported for them
+    flushed = {}
+
+    def flush(before):
+        while first_seen and (before is None or first_seen[0][0] < before):
+            _, native_id = first_seen.popleft()
+            state = granules.pop(native_id)
+            if before is not None:
+                flushed[native_id] = False
+            if state.initial is not None and state.subs is not None:
+                yield native_id, state.initial, _granule_deltas(state)
+
+    for native_id, epoch_us, status in events:
+        if watermark is None:
+            watermark = epoch_us
+        elif epoch_us > watermark:
+            watermark = epoch_us
+            if window_us is not None:
+                yield from flush(watermark - window_us)
+                if on_flush is not None:
+                    # Held granules may have events up to the window before they were first seen
+                    on_flush((first_seen[0][0] if first_seen else watermark) - window_us)
+
+        state = granules.get(native_id)
+        if state is None:
+            if native_id in flushed:
+                if not flushed[native_id]:
+                    flushed[native_id] = True
+                    if on_late is not None:
+                        on_late(native_id)
+                continue
+            state = granules[native_id] = GranuleRevisions()
+            first_seen.append((watermark, native_id))
+
+        if status == '201':
+            state.initial = epoch_us
+        elif status == '200':
+            if state.subs is None:
+                state.subs = array('q')
+            state.subs.append(epoch_us)
+
+    yield from flush(None)
+
+
+def _epoch_us_date(epoch_us):
+    return (_EPOCH + epoch_us * _ONE_MICROSECOND).date()
+
+
+def process_events_streaming(files, outfile, stats_file=None, window_days=None):
+    '''Writes the result lines as granules leave the revision window (see iter_revision_deltas).
+
+    With a stats_file, a day's row is written, and its deltas freed, once the window has passed the end of that day.
+    No granule still to be yielded can have its initial revision on that day. Memory for --stats is then bounded by the
+    days within the window. Without a window, all deltas are kept until the end of input.
+
+    Returns the number of granules whose results are incomplete because some of their events arrived after they left
+    the window, and the number left out of the stats for the same reason. Both are always 0 without a window.'''
+    window_us = None if window_days is None else int(window_days * 86400 * 10**6)
+    stats = defaultdict(lambda: array('q'))
+    written_before = None  # Stats rows have been written for all dates before this one
+    late = 0
+    late_stats = 0
+
+    def on_late(native_id):
+        nonlocal late
+        late += 1
+
+    with open(stats_file, 'w') if stats_file is not None else nullcontext() as stats_out:
+        def write_stats(before):
+            nonlocal written_before
+            import numpy as np
+
+            for date in sorted(d for d in stats if before is None or d < before):
+                deltas = np.frombuffer(stats.pop(date), dtype=np.int64)
+                percentiles = np.percentile(deltas, STATS_PERCENTILES)
+                stats_out.write(f"{date},{len(deltas)},{','.join(str(float(v)) for v in percentiles)}\n")
+            written_before = before
+
+        def on_flush(before_us):
+            # Remaining granules' events are all at or after before_us, so earlier days are complete
+            before = _epoch_us_date(before_us)
+            if written_before is None or before > written_before:
+                write_stats(before)
+
+        if stats_out is not None:
+            stats_out.write('date,count,' + ','.join(f'p{p}_mins' for p in STATS_PERCENTILES) + '\n')
+
+        deltas_iter = iter_revision_deltas(iter_events(files), window_us,
+                                           on_flush if stats_out is not None else None, on_late)
+
+        for native_id, initial, deltas in deltas_iter:
+            outfile.write(f"{native_id},{','.join(map(str, deltas))},\n")
+
+            if stats_out is None:
+                continue
+
+            date = _epoch_us_date(initial)
+            if written_before is not None and date < written_before:
+                # Only possible when events are out of time order by more than the window
+                late_stats += 1
+                continue
+            stats[date].extend(deltas)
+
+        if stats_out is not None:
+            write_stats(None)
+
+    if late:
+        print(f'Warning: {late} granules had events arriving more than the revision window after their first event. '
+              f'Those events were dropped, so these granules are missing revisions or left out of the output; '
+              f'rerun with --max-revision-window-days 0 for complete results')
+    if late_stats:
+        print(f'Warning: {late_stats} granules were left out of the stats because their events were out of time '
+              f'order by more than the revision window')
+
+    return late, late_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute HLS revision latencies from 200/201 ingest events')
+    parser.add_argument('files', nargs='+', help='CSV exports of "_time","native_id",status events')
+    parser.add_argument('--engine', choices=['columnar', 'python', 'streaming'], default='columnar',
+                        help='columnar: vectorized pandas implementation; python: original row-by-row implementation; '
+                             'streaming: reads any number of plain or gzipped CSVs with compact per-granule state')
+    parser.add_argument('--output', default=None, help='Output file (default: <first file>.result.csv)')
+    parser.add_argument('--stats', action='store_true',
+                        help='Also write per-day p50/p95/p99 revision latency to <output>.stats.csv '
+                             '(columnar and streaming engines)')
+    parser.add_argument('--max-revision-window-days', type=float, default=DEFAULT_REVISION_WINDOW_DAYS,
+                        help='streaming engine: write and drop a granule once the event time is this many days past '
+                             'its first event, keeping memory bounded on oldest-first input. Events arriving later are '
+                             'dropped and counted in a warning. By default, or with 0, every granule is kept until the '
+                             'end of input')
+    args = parser.parse_args()
+
+    if args.engine != 'streaming' and len(args.files) > 1:
+        parser.error('multiple input files are only supported by the streaming engine')
+    if args.engine == 'python' and args.stats:
+        parser.error('--stats is only supported by the columnar and streaming engines')
+    if args.engine != 'streaming' and args.max_revision_window_days:
+        parser.error('--max-revision-window-days is only supported by the streaming engine')
+
+    output = args.output or args.files[0]+".result.csv"
+    stats_file = output.removesuffix('.result.csv')+".stats.csv" if args.stats else None
+
+    with open(output, "w") as outfile:
+        if args.engine == 'python':
+            process_events_python(args.files[0], outfile)
+        elif args.engine == 'streaming':
+            process_events_streaming(args.files, outfile, stats_file, args.max_revision_window_days or None)
+        else:
+            process_events_columnar(args.files[0], outfile, stats_file)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+'''Indexed SLC granule <-> burst ID lookup database built from the static layer burst CSV.
+
+Build once, then query without re-parsing the CSV:
+
+    python slc_burst_db.py build rtc_query_bursts_2016-05-01_to_2023-09.csv
+    python slc_burst_db.py bursts S1B_IW_SLC__1SDV_20180920T164800_20180920T164829_012801_017A1E_06B8
+    python slc_burst_db.py slcs t001_000010_iw1
+    python slc_burst_db.py anomalies --expected 27
+'''
+import argparse
+import csv
+import os
+import sqlite3
+
+from slc_granules_to_bursts import CSV_FILE, EXPECTED_BURSTS
+
+DB_FILE = "rtc_query_bursts.sqlite"
+
+# Rows inserted per executemany call while building
+CHUNK_SIZE = 100_000
+
+
+def build_db(csv_file=CSV_FILE, db_path=DB_FILE):
+    '''Loads the burst CSV into a new SQLite database, indexed by both SLC granule and burst ID'''
+    # Build under a temporary name so an interrupted build is never mistaken for a complete database
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("CREATE TABLE slc_bursts (burst_id TEXT NOT NULL, sensing_time TEXT, slc_granule TEXT NOT NULL)")
+
+    rows = 0
+    with open(csv_file, 'r', newline='') as f:
+        reader = csv.reader(f, delimiter=',')
+        chunk = []
+        for row in reader:
+            chunk.append((row[0], row[1], row[2]))
+            if len(chunk) >= CHUNK_SIZE:
+                conn.executemany("INSERT INTO slc_bursts VALUES (?, ?, ?)", chunk)
+                rows += len(chunk)
+                chunk = []
+        if chunk:
+            conn.executemany("INSERT INTO slc_bursts VALUES (?, ?, ?)", chunk)
+            rows += len(chunk)
+    conn.commit()
+
+    print(f"Loaded {rows} rows, building indexes")
+
+    # Indexes are created after the bulk load, which is much faster than maintaining them per insert. Both are
+    # covering indexes, so lookups and the per-SLC aggregate never touch the table itself.
+    conn.execute("CREATE INDEX slc_bursts_by_slc ON slc_bursts (slc_granule, burst_id)")
+    conn.execute("CREATE INDEX slc_bursts_by_burst ON slc_bursts (burst_id, slc_granule)")
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+    os.replace(tmp_path, db_path)
+    print(f"Wrote {db_path}")
+
+
+def connect(db_path=DB_FILE):
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"{db_path} does not exist, build it first with: python slc_burst_db.py build")
+    return sqlite3.connect(db_path)
+
+
+def bursts_for_slc(conn, slc_granule):
+    '''Returns the sorted burst IDs produced by an SLC granule'''
+    rows = conn.execute(
+        "SELECT DISTINCT burst_id FROM slc_bursts WHERE slc_granule = ? ORDER BY burst_id", (slc_granule,)
+    )
+    return [row[0] for row in rows]
+
+
+def slcs_for_burst(conn, burst_id):
+    '''Returns the sorted SLC granules that produce a burst ID'''
+    rows = conn.execute(
+        "SELECT DISTINCT slc_granule FROM slc_bursts WHERE burst_id = ? ORDER BY slc_granule", (burst_id,)
+    )
+    return [row[0] for row in rows]
+
+
+def anomalies(conn, expected=EXPECTED_BURSTS):
+    '''Returns (SLC granule, burst count) for every SLC that does not map to the expected number of bursts'''
+    return conn.execute("""
+        SELECT slc_granule, COUNT(DISTINCT burst_id) AS burst_count
+        FROM slc_bursts
+        GROUP BY slc_granule
+        HAVING burst_count != ?
+    """, (expected,)).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query the SLC granule <-> burst ID lookup database')
+    parser.add_argument('--db', default=DB_FILE, help='Path of the lookup database')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Build the database from the burst CSV')
+    build_parser.add_argument('csv_file', nargs='?', default=CSV_FILE)
+
+    bursts_parser = subparsers.add_parser('bursts', help='List the bursts produced by SLC granules')
+    bursts_parser.add_argument('slc_granules', nargs='+')
+
+    slcs_parser = subparsers.add_parser('slcs', help='List the SLC granules that produce burst IDs')
+    slcs_parser.add_argument('burst_ids', nargs='+')
+
+    anomalies_parser = subparsers.add_parser('anomalies', help='List SLC granules without the expected burst count')
+    anomalies_parser.add_argument('--expected', type=int, default=EXPECTED_BURSTS)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_db(args.csv_file, args.db)
+        return
+
+    conn = connect(args.db)
+
+    if args.command == 'bursts':
+        for slc_granule in args.slc_granules:
+            print(slc_granule, ' '.join(bursts_for_slc(conn, slc_granule)))
+    elif args.command == 'slcs':
+        for burst_id in args.burst_ids:
+            print(burst_id, ' '.join(slcs_for_burst(conn, burst_id)))
+    elif args.command == 'anomalies':
+        rows = anomalies(conn, args.expected)
+        for slc_granule, burst_count in rows:
+            print(slc_granule, burst_count)
+        print("There are", len(rows), f"SLC granules that do not have {args.expected} bursts.")
+
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,24 @@
+import argparse
 import csv
 from collections import defaultdict
 
 # Parse csv file
 
+# the file is located:
+# https://github.com/nasa/opera-sds/blob/main/processing_request_datasets/static_layers/rtc_query_bursts_2016-05-01_to_2023-09.csv
+CSV_FILE = "rtc_query_bursts_2016-05-01_to_2023-09.csv"
+
+EXPECTED_BURSTS = 27
+
+# Bytes of CSV parsed per batch in streaming mode; bounds peak memory along with the unique pair keys
+BLOCK_SIZE = 64 * 1024 * 1024
+
 
 def map_slc_granules_to_bursts(csv_file):
     '''Parse csv that looks like this and map using default dict with value stored as sets:
     t001_000010_iw1,"2017-02-03 18:00:33.938144",S1A_IW_SLC__1SDV_20170203T180033_20170203T180101_015123_018BA2_8CB7
     t001_000010_iw2,"2017-02-03 18:00:34.879588",S1A_IW_SLC__1SDV_20170203T180033_20170203T180101_015123_018BA2_8CB7'''
 
-    # the file is located:
-    # https://github.com/nasa/opera-sds/blob/main/processing_request_datasets/static_layers/rtc_query_bursts_2016-05-01_to_2023-09.csv
     csv_file = open(csv_file, 'r')
     csv_reader = csv.reader(csv_file, delimiter=',')
 
@@ -20,16 +28,122 @@ def map_slc_granules_to_bursts(csv_file):
 
     return slc_granules_to_bursts
 
-m = map_slc_granules_to_bursts("rtc_query_bursts_2016-05-01_to_2023-09.csv")
 
-count = 0
+def _encode(values, dictionary):
+    '''Returns integer codes for values against a dictionary array, growing the dictionary with any new values'''
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    uniques = pc.unique(values)
+    new_values = pc.filter(uniques, pc.invert(pc.is_in(uniques, value_set=dictionary)))
+    if len(new_values) > 0:
+        dictionary = pa.concat_arrays([dictionary, new_values])
+
+    return pc.index_in(values, value_set=dictionary), dictionary
+
+
+def stream_slc_granules_to_bursts(csv_file, block_size=BLOCK_SIZE):
+    '''Streaming, columnar alternative to map_slc_granules_to_bursts for the multi-GB burst CSV.
+
+    The CSV is read in blocks with pyarrow. SLC granule and burst IDs are dictionary-encoded to integers, and each
+    (SLC, burst) pair is kept only as a deduplicated int64 key (slc_code << 32 | burst_code), so memory scales with
+    the number of distinct pairs rather than with Python string and set overhead.
+
+    Returns (slc_ids, burst_ids, pairs): the SLC and burst dictionaries as pyarrow string arrays, and the sorted
+    unique pair keys as a numpy array.
+    '''
+    import numpy as np
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    reader = pa_csv.open_csv(
+        csv_file,
+        read_options=pa_csv.ReadOptions(column_names=['burst_id', 'sensing_time', 'slc_granule'],
+                                         block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(include_columns=['burst_id', 'slc_granule'],
+                                              column_types={'burst_id': pa.string(), 'slc_granule': pa.string()}),
+    )
+
+    slc_ids = pa.array([], pa.string())
+    burst_ids = pa.array([], pa.string())
+    pairs = np.array([], dtype=np.int64)
+    pending = []
+    pending_size = 0
+
+    for batch in reader:
+        slc_codes, slc_ids = _encode(batch.column('slc_granule'), slc_ids)
+        burst_codes, burst_ids = _encode(batch.column('burst_id'), burst_ids)
+
+        keys = (slc_codes.to_numpy().astype(np.int64) << 32) | burst_codes.to_numpy().astype(np.int64)
+        keys = np.unique(keys)
+        pending.append(keys)
+        pending_size += len(keys)
+
+        # Periodically fold the batch keys in so duplicates across batches don't accumulate
+        if pending_size > len(pairs):
+            pairs = np.unique(np.concatenate([pairs] + pending))
+            pending = []
+            pending_size = 0
+
+    if pending:
+        pairs = np.unique(np.concatenate([pairs] + pending))
+
+    return slc_ids, burst_ids, pairs
+
+
+def count_bursts_per_slc(slc_ids, pairs):
+    '''Returns the number of distinct bursts for each SLC in slc_ids, from the pair keys of stream_slc_granules_to_bursts'''
+    import numpy as np
+
+    return np.bincount(pairs >> 32, minlength=len(slc_ids))
+
+
+def bursts_for_slc(slc_granule, slc_ids, burst_ids, pairs):
+    '''Returns the set of burst IDs for one SLC granule, from the output of stream_slc_granules_to_bursts'''
+    import pyarrow.compute as pc
+
+    slc_code = pc.index(slc_ids, slc_granule).as_py()
+    if slc_code < 0:
+        return set()
+
+    burst_codes = pairs[(pairs >> 32) == slc_code] & 0xFFFFFFFF
+    return {burst_ids[int(code)].as_py() for code in burst_codes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report SLC granules that do not map to the expected number of bursts')
+    parser.add_argument('csv_file', nargs='?', default=CSV_FILE)
+    parser.add_argument('--in-memory', action='store_true',
+                        help='Use the original dict-of-sets implementation instead of streaming with pyarrow')
+    parser.add_argument('--expected', type=int, default=EXPECTED_BURSTS, help='Expected number of bursts per SLC')
+    parser.add_argument('--show', action='append', default=[], help='Print the bursts of this SLC granule')
+    args = parser.parse_args()
+
+    count = 0
+
+    if args.in_memory:
+        m = map_slc_granules_to_bursts(args.csv_file)
+
+        # Iterate through the dictionary and print the key and value pairs
+        for key, value in m.items():
+            if (len(value) != args.expected):
+                print(key, len(value))
+                count += 1
+            if key in args.show:
+                print(value)
+    else:
+        slc_ids, burst_ids, pairs = stream_slc_granules_to_bursts(args.csv_file)
+        burst_counts = count_bursts_per_slc(slc_ids, pairs)
+
+        for slc_code in (burst_counts != args.expected).nonzero()[0]:
+            print(slc_ids[int(slc_code)].as_py(), burst_counts[slc_code])
+            count += 1
+
+        for slc_granule in args.show:
+            print(bursts_for_slc(slc_granule, slc_ids, burst_ids, pairs))
+
+    print("There are", count, f"SLC granules that do not have {args.expected} bursts.")
 
-# Iterate through the dictionary and print the key and value pairs
-for key, value in m.items():
-    if (len(value) != 27):
-        print(key, len(value))
-        count += 1
-    if key == "S1B_IW_SLC__1SDV_20180920T164800_20180920T164829_012801_017A1E_06B8":
-        print(value)
 
-print("There are", count, "SLC granules that do not have 27 bursts.")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Tests for hls_to_s3_prefix.py bulk product resolution against a moto-backed bucket."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+boto3 = pytest.importorskip('boto3')
+moto = pytest.importorskip('moto')
+
+_spec = importlib.util.spec_from_file_location(
+    'hls_to_s3_prefix', Path(__file__).resolve().parents[1] / 'hls_to_s3_prefix.py')
+hls_to_s3_prefix = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(hls_to_s3_prefix)
+
+BUCKET = 'test-rs-bucket'
+
+# Requested HLS granules: three tiles, several dates, two granules of one tile on the same date
+HLS_IDS = [
+    'HLS.L30.T10TEM.2023094T183802.v2.0',
+    'HLS.S30.T10TEM.2023094T190421.v2.0',
+    'HLS.L30.T10TEM.2023095T183915.v2.0',
+    'HLS.S30.T11SKA.2023001T181741.v2.0',
+    'HLS.L30.T01FBE.2022035T213835.v2.0',
+    # No product in the bucket
+    'HLS.L30.T01FBE.2022036T213835.v2.0',
+]
+
+PRODUCTS = [
+    'OPERA_L3_DSWx-HLS_T10TEM_20230404T183802Z_20230405T010203Z_L8_30_v1.0',
+    # Reprocessed product of the same granule
+    'OPERA_L3_DSWx-HLS_T10TEM_20230404T183802Z_20230501T000000Z_L8_30_v1.0',
+    'OPERA_L3_DSWx-HLS_T10TEM_20230404T190421Z_20230405T020304Z_S2A_30_v1.0',
+    'OPERA_L3_DSWx-HLS_T10TEM_20230405T183915Z_20230406T000000Z_L8_30_v1.0',
+    'OPERA_L3_DSWx-HLS_T11SKA_20230101T181741Z_20230102T000000Z_S2B_30_v1.0',
+    'OPERA_L3_DSWx-HLS_T01FBE_20220204T213835Z_20220205T000000Z_L8_30_v1.0',
+]
+
+# Same tile and date as requested granules, but not requested
+UNREQUESTED_PRODUCTS = [
+    'OPERA_L3_DSWx-HLS_T10TEM_20230404T200000Z_20230405T000000Z_S2B_30_v1.0',
+    'OPERA_L3_DSWx-HLS_T11SKA_20230101T190000Z_20230102T000000Z_L9_30_v1.0',
+    'OPERA_L3_DSWx-HLS_T11SKA_20230102T181741Z_20230103T000000Z_S2B_30_v1.0',
+]
+
+
+@pytest.fixture
+def s3():
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+
+        for product in PRODUCTS + UNREQUESTED_PRODUCTS:
+            for band in ('B01_WTR', 'B02_BWTR', 'B03_CONF'):
+                client.put_object(Bucket=BUCKET, Key=f'products/{product}/{product}_{band}.tif', Body=b'')
+
+        yield client
+
+
+def test_format_parent_prefix_is_prefix_of_product_prefix():
+    for hls_id in HLS_IDS:
+        assert hls_to_s3_prefix.format_prefix(hls_id).startswith(hls_to_s3_prefix.format_parent_prefix(hls_id))
+
+
+def test_list_products_lists_directories_once(s3):
+    products = hls_to_s3_prefix._list_products(s3, BUCKET, 'products/OPERA_L3_DSWx-HLS_T11SKA_20230101')
+
+    assert sorted(products) == [
+        'OPERA_L3_DSWx-HLS_T11SKA_20230101T181741Z_20230102T000000Z_S2B_30_v1.0',
+        'OPERA_L3_DSWx-HLS_T11SKA_20230101T190000Z_20230102T000000Z_L9_30_v1.0',
+    ]
+
+
+def test_bulk_matches_per_granule(s3):
+    bucket = boto3.resource('s3', region_name='us-east-1').Bucket(BUCKET)
+
+    per_granule = hls_to_s3_prefix.resolve_products(bucket, HLS_IDS)
+    bulk = hls_to_s3_prefix.resolve_products_bulk(s3, HLS_IDS, BUCKET, workers=4)
+
+    assert bulk == per_granule == set(PRODUCTS)
+
+
+def test_bulk_accepts_lines_read_from_file(s3):
+    """The CLI passes input lines with their trailing newline"""
+    lines = [f'{hls_id}\n' for hls_id in HLS_IDS]
+
+    assert hls_to_s3_prefix.resolve_products_bulk(s3, lines, BUCKET) == set(PRODUCTS)
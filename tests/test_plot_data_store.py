@@ -0,0 +1,83 @@
+"""Tests for duplicates/plot_data_store.py against a moto-backed bucket."""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+boto3 = pytest.importorskip('boto3')
+moto = pytest.importorskip('moto')
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'duplicates'))
+import plot_data_store  # noqa: E402
+
+BUCKET = 'test-audit-bucket'
+PREFIX = '/reports'
+
+
+@pytest.fixture
+def s3():
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def _entry(date):
+    return {'date': date, 'product_counts': {}, 'date_maps': {}}
+
+
+def _index(client):
+    body = client.get_object(Bucket=BUCKET, Key='reports/plot_data/index.json')['Body'].read()
+    return json.loads(body)['dates']
+
+
+def test_first_append_writes_index_without_warnings(s3, caplog):
+    with caplog.at_level(logging.WARNING, logger=plot_data_store.__name__):
+        plot_data_store.append(s3, BUCKET, PREFIX, _entry('2026-01-02'))
+
+    assert caplog.records == []
+    assert _index(s3) == ['2026-01-02']
+    assert plot_data_store.read_window(s3, BUCKET, PREFIX, 10) == [_entry('2026-01-02')]
+
+
+def test_append_keeps_index_sorted(s3):
+    for date in ['2026-01-03', '2026-01-01', '2026-01-02']:
+        plot_data_store.append(s3, BUCKET, PREFIX, _entry(date))
+
+    assert _index(s3) == ['2026-01-01', '2026-01-02', '2026-01-03']
+    assert [e['date'] for e in plot_data_store.read_window(s3, BUCKET, PREFIX, 2)] == ['2026-01-02', '2026-01-03']
+
+
+def test_replacement_warns_only_for_listed_date(s3, caplog):
+    plot_data_store.append(s3, BUCKET, PREFIX, _entry('2026-01-02'))
+
+    with caplog.at_level(logging.WARNING, logger=plot_data_store.__name__):
+        plot_data_store.append(s3, BUCKET, PREFIX, {**_entry('2026-01-02'), 'venue': 'PROD'})
+
+    assert [r.getMessage() for r in caplog.records] == ['Replaced existing plot data for 2026-01-02']
+    assert _index(s3) == ['2026-01-02']
+    assert plot_data_store.read_window(s3, BUCKET, PREFIX, 10)[0]['venue'] == 'PROD'
+
+
+def test_missing_index_rebuilt_from_earlier_entries(s3, caplog):
+    plot_data_store.append(s3, BUCKET, PREFIX, _entry('2026-01-01'))
+    s3.delete_object(Bucket=BUCKET, Key='reports/plot_data/index.json')
+
+    with caplog.at_level(logging.WARNING, logger=plot_data_store.__name__):
+        plot_data_store.append(s3, BUCKET, PREFIX, _entry('2026-01-02'))
+
+    assert [r.getMessage() for r in caplog.records] == ['Plot data index is missing, rebuilt it from 1 stored entries']
+    assert _index(s3) == ['2026-01-01', '2026-01-02']
+
+
+def test_migrate_legacy_then_append(s3):
+    legacy = [_entry('2026-01-01'), _entry('2026-01-02')]
+    s3.put_object(Bucket=BUCKET, Key='reports/plot_data.json', Body=json.dumps(legacy).encode('utf-8'))
+
+    plot_data_store.migrate_legacy(s3, BUCKET, PREFIX)
+    plot_data_store.append(s3, BUCKET, PREFIX, _entry('2026-01-03'))
+
+    assert _index(s3) == ['2026-01-01', '2026-01-02', '2026-01-03']
@@ -0,0 +1,87 @@
+"""Tests for duplicates/s3_uploads.py skip-unchanged uploads against a moto-backed bucket."""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import pytest
+
+boto3 = pytest.importorskip('boto3')
+moto = pytest.importorskip('moto')
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'duplicates'))
+from s3_uploads import S3UploadManager  # noqa: E402
+
+BUCKET = 'test-audit-bucket'
+
+
+@pytest.fixture
+def s3():
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def _upload(client, data, key):
+    with S3UploadManager(client, workers=2) as uploads:
+        uploads.upload_bytes(data, BUCKET, key)
+    return uploads
+
+
+def test_first_upload_puts_object_with_sha256(s3):
+    uploads = _upload(s3, b'report v1', 'reports/report.csv')
+
+    assert (uploads.uploaded, uploads.skipped) == (1, 0)
+    head = s3.head_object(Bucket=BUCKET, Key='reports/report.csv')
+    assert head['Metadata']['sha256'] == hashlib.sha256(b'report v1').hexdigest()
+    assert s3.get_object(Bucket=BUCKET, Key='reports/report.csv')['Body'].read() == b'report v1'
+
+
+def test_identical_content_skipped_by_sha256_metadata(s3):
+    _upload(s3, b'report v1', 'reports/report.csv')
+    before = s3.head_object(Bucket=BUCKET, Key='reports/report.csv')['LastModified']
+
+    uploads = _upload(s3, b'report v1', 'reports/report.csv')
+
+    assert (uploads.uploaded, uploads.skipped) == (0, 1)
+    assert s3.head_object(Bucket=BUCKET, Key='reports/report.csv')['LastModified'] == before
+
+
+def test_identical_content_skipped_by_etag_without_metadata(s3):
+    # Uploaded by something else in a single part, so there is no sha256 metadata and the ETag is the MD5
+    s3.put_object(Bucket=BUCKET, Key='reports/legacy.csv', Body=b'legacy report')
+
+    uploads = _upload(s3, b'legacy report', 'reports/legacy.csv')
+
+    assert (uploads.uploaded, uploads.skipped) == (0, 1)
+    assert 'sha256' not in s3.head_object(Bucket=BUCKET, Key='reports/legacy.csv')['Metadata']
+
+
+@pytest.mark.parametrize('seed_with_manager', [True, False], ids=['sha256', 'etag'])
+def test_changed_content_uploaded(s3, seed_with_manager):
+    if seed_with_manager:
+        _upload(s3, b'report v1', 'reports/report.csv')
+    else:
+        s3.put_object(Bucket=BUCKET, Key='reports/report.csv', Body=b'report v1')
+
+    uploads = _upload(s3, b'report v2', 'reports/report.csv')
+
+    assert (uploads.uploaded, uploads.skipped) == (1, 0)
+    assert s3.get_object(Bucket=BUCKET, Key='reports/report.csv')['Body'].read() == b'report v2'
+    assert s3.head_object(Bucket=BUCKET, Key='reports/report.csv')['Metadata']['sha256'] == \
+        hashlib.sha256(b'report v2').hexdigest()
+
+
+def test_upload_file_and_counters_across_batch(s3, tmp_path):
+    path = tmp_path / 'summary.txt'
+    path.write_bytes(b'summary')
+    s3.put_object(Bucket=BUCKET, Key='reports/unchanged.csv', Body=b'unchanged')
+
+    with S3UploadManager(s3, workers=4) as uploads:
+        uploads.upload_file(path, BUCKET, 'reports/summary.txt')
+        uploads.upload_bytes(b'unchanged', BUCKET, 'reports/unchanged.csv')
+        uploads.upload_bytes(b'new', BUCKET, 'reports/new.csv')
+
+    assert (uploads.uploaded, uploads.skipped) == (2, 1)
+    assert s3.get_object(Bucket=BUCKET, Key='reports/summary.txt')['Body'].read() == b'summary'